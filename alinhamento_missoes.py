@@ -0,0 +1,215 @@
+import re
+import argparse
+from functools import partial
+import numpy as np
+import pandas as pd
+from dados_missao import files, carregar_missao, hash_arquivo, colunas_energia
+from execucao_paralela import executar_configuracoes
+from cache_resultados import calcular_chave, versao_codigo, restaurar, armazenar, ler_tabela
+
+# --- ALINHAMENTO DAS MISSÕES EM UMA GRADE COMUM E DIFERENÇAS ENTRE CONFIGURAÇÕES ---
+# Cada missão do SUAVE tem seus próprios instantes (os segmentos duram tempos
+# diferentes em cada configuração), então as saídas só podiam ser sobrepostas
+# nos gráficos. Aqui as saídas das análises energética e exergética de todas as
+# configurações são reamostradas em uma grade comum de tempo ('time', s) ou de
+# distância percorrida ('distance_km', integral de velocity_m_s·cos(γ)):
+#   'absoluto' grade de passo fixo no eixo, de 0 até o fim da missão mais curta;
+#   'fases'    pontos igualmente espaçados no eixo dentro de cada segmento (u de
+#              0 a 1), de modo que cada ponto corresponde à mesma fase do voo em
+#              todas as configurações.
+# A interpolação respeita os limites dos segmentos: nas fronteiras as planilhas
+# repetem o instante com valores diferentes de um segmento e do seguinte, e um
+# ponto da grade só é interpolado com as amostras do segmento que o contém.
+# Cada segmento é interpolado de uma vez para todas as colunas (interpolar_colunas,
+# equivalente a np.interp coluna a coluna), e as diferenças em relação à
+# configuração de referência (híbrida - Convencional) saem de uma única
+# subtração sobre o array (configurações, pontos, colunas).
+
+eixos = ['time', 'distance_km']
+modos = ['fases', 'absoluto']
+
+pontos_por_segmento = 8
+
+# Colunas das diferenças entre configurações (expressões regulares)
+padroes_deltas = [r'^power$', r'^co2_emissions_total$', r'^B_Dest_', r'^eta_ex_']
+
+def distancia_percorrida(df):
+    """Distância horizontal acumulada (km), integrando velocity_m_s·cos(flight_path_angle_rad) no tempo."""
+    time_s = df['time'].to_numpy(dtype=float)
+    velocidade = df['velocity_m_s'].to_numpy(dtype=float)
+    if 'flight_path_angle_rad' in df.columns:
+        velocidade = velocidade * np.cos(df['flight_path_angle_rad'].to_numpy(dtype=float))
+    trechos = np.diff(time_s) * (velocidade[1:] + velocidade[:-1]) / 2
+    return np.concatenate(([0.0], np.cumsum(trechos))) / 1000
+
+def saidas_configuracao(hybrid_degree, file_path):
+    """Saídas numéricas das análises exergética e energética de uma missão (colunas de exergia primeiro), com distance_km."""
+    from analise_exergetica import calcular_exergia, preparar_deltas_bateria
+    from analise_energetica import calcular_energia, output_cols
+    df = carregar_missao(file_path, hybrid_degree)
+    exergia = calcular_exergia(preparar_deltas_bateria(df.copy(), file_path), hybrid_degree)
+    energia = calcular_energia(df[[col for col in colunas_energia if col in df.columns]].copy(), hybrid_degree, file_path)
+    saidas = exergia.select_dtypes('number')
+    extras = [col for col in output_cols if col not in saidas.columns]
+    saidas = pd.concat([exergia[['segment']], saidas, energia[extras].reset_index(drop=True)], axis=1)
+    saidas.insert(2, 'distance_km', distancia_percorrida(df))
+    return saidas
+
+def _saidas_com_cache(hybrid_degree, file_path, usar_cache=True):
+    chave = calcular_chave('saidas_alinhamento', hybrid_degree, hash_arquivo(file_path),
+                           versao_codigo('alinhamento_missoes', 'analise_exergetica', 'analise_energetica', 'dados_missao',
+                                         'propriedades_ar', 'equilibrio_combustor'))
+    if usar_cache and restaurar(chave):
+        return ler_tabela(chave)
+    saidas = saidas_configuracao(hybrid_degree, file_path)
+    if usar_cache:
+        armazenar(chave, tabela=saidas, descricao=f'saídas alinháveis {hybrid_degree}')
+    return saidas
+
+def carregar_saidas(files=files, workers=1, usar_cache=True):
+    """{rótulo: saídas da configuração}, calculadas em paralelo e guardadas no cache de resultados."""
+    from analise_exergetica import preparar_equilibrio
+    preparar_equilibrio()
+    return executar_configuracoes(partial(_saidas_com_cache, usar_cache=usar_cache), files, workers=workers)
+
+def interpolar_colunas(x, Y, xq):
+    """Interpola linearmente todas as colunas de Y (N, C) nos pontos xq de uma vez.
+
+    Equivale a np.interp(xq, x, Y[:, j]) para cada coluna j: x deve ser crescente e os pontos fora
+    de [x[0], x[-1]] recebem o valor da ponta.
+    """
+    x, xq = np.asarray(x, dtype=float), np.asarray(xq, dtype=float)
+    if len(x) == 1:
+        return np.repeat(Y[:1], len(xq), axis=0)
+    i = np.clip(np.searchsorted(x, xq, side='right') - 1, 0, len(x) - 2)
+    dx = x[i + 1] - x[i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.clip(np.where(dx > 0, (xq - x[i]) / dx, 0.0), 0.0, 1.0)[:, None]
+    return Y[i] * (1 - w) + Y[i + 1] * w
+
+def _trechos(df, segmentos):
+    posicoes = df.groupby('segment', sort=False).indices
+    ausentes = [segmento for segmento in segmentos if segmento not in posicoes]
+    if ausentes:
+        raise ValueError(f"Segmentos ausentes da missão: {', '.join(map(str, ausentes))}")
+    return [posicoes[segmento] for segmento in segmentos]
+
+def alinhar_fases(df, segmentos, pontos=pontos_por_segmento, eixo='time'):
+    """Interpola as colunas numéricas de uma missão em pontos igualmente espaçados no eixo dentro de cada segmento.
+
+    Retorna um DataFrame com segment, u (posição no segmento, de 0 a 1) e as colunas, na ordem de segmentos.
+    """
+    u = np.linspace(0, 1, pontos)
+    colunas = [col for col in df.columns if col != 'segment']
+    valores = df[colunas].to_numpy(dtype=float)
+    x = df[eixo].to_numpy(dtype=float)
+    blocos = []
+    for indices in _trechos(df, segmentos):
+        x_trecho = x[indices]
+        extensao = x_trecho[-1] - x_trecho[0]
+        u_trecho = (x_trecho - x_trecho[0]) / extensao if extensao > 0 else np.linspace(0, 1, len(indices))
+        blocos.append(interpolar_colunas(u_trecho, valores[indices], u))
+    tabela = pd.DataFrame(np.concatenate(blocos), columns=colunas)
+    tabela.insert(0, 'u', np.tile(u, len(segmentos)))
+    tabela.insert(0, 'segment', np.repeat(segmentos, pontos))
+    return tabela
+
+def alinhar_absoluto(df, grade, eixo='time'):
+    """Interpola as colunas numéricas de uma missão nos valores grade do eixo, sem cruzar os limites dos segmentos.
+
+    Cada ponto da grade pertence ao último segmento que começa antes dele (ou nele) e é interpolado
+    apenas com as amostras desse segmento. Retorna um DataFrame com segment e as colunas.
+    """
+    segmentos = list(dict.fromkeys(df['segment']))
+    trechos = _trechos(df, segmentos)
+    colunas = [col for col in df.columns if col != 'segment']
+    valores = df[colunas].to_numpy(dtype=float)
+    x = df[eixo].to_numpy(dtype=float)
+    grade = np.asarray(grade, dtype=float)
+    inicios = np.array([x[indices[0]] for indices in trechos])
+    segmento_ponto = np.clip(np.searchsorted(inicios, grade, side='right') - 1, 0, len(trechos) - 1)
+    resultado = np.empty((len(grade), len(colunas)))
+    for s in np.unique(segmento_ponto):
+        pontos = segmento_ponto == s
+        resultado[pontos] = interpolar_colunas(x[trechos[s]], valores[trechos[s]], grade[pontos])
+    tabela = pd.DataFrame(resultado, columns=colunas)
+    # O eixo da grade é exato (as pontas de cada segmento são mantidas na interpolação das demais colunas)
+    tabela[eixo] = grade
+    tabela.insert(0, 'segment', np.array(segmentos, dtype=object)[segmento_ponto])
+    return tabela
+
+def alinhar_configuracoes(saidas, eixo='time', modo='fases', pontos=pontos_por_segmento, passo=None):
+    """Alinha as saídas ({rótulo: DataFrame}) de todas as configurações em uma grade comum.
+
+    modo 'fases' usa pontos por segmento (u de 0 a 1, segmentos na ordem da primeira configuração);
+    modo 'absoluto' usa a grade de 0 ao fim da missão mais curta com o passo dado (padrão: 1/500 dessa
+    extensão). Retorna um DataFrame longo com configuracao, segment, (u,) e as colunas.
+    """
+    if eixo not in eixos:
+        raise ValueError(f"Eixo desconhecido: {eixo}. Opções: {', '.join(eixos)}")
+    if modo == 'fases':
+        segmentos = list(dict.fromkeys(next(iter(saidas.values()))['segment']))
+        alinhadas = {rotulo: alinhar_fases(df, segmentos, pontos, eixo) for rotulo, df in saidas.items()}
+    elif modo == 'absoluto':
+        fim = min(df[eixo].iloc[-1] for df in saidas.values())
+        grade = np.arange(0, fim + 1e-9, passo or fim / 500)
+        alinhadas = {rotulo: alinhar_absoluto(df, grade, eixo) for rotulo, df in saidas.items()}
+    else:
+        raise ValueError(f"Modo desconhecido: {modo}. Opções: {', '.join(modos)}")
+    return pd.concat([tabela.assign(configuracao=rotulo)[['configuracao', *tabela.columns]]
+                      for rotulo, tabela in alinhadas.items()], ignore_index=True)
+
+def colunas_deltas(colunas, padroes=padroes_deltas):
+    return [col for col in colunas if any(re.search(padrao, col) for padrao in padroes)]
+
+def calcular_deltas(alinhadas, referencia='Convencional', colunas=None, eixo='time'):
+    """Diferenças (configuração - referência) das colunas em cada ponto da grade comum, de uma vez para todas.
+
+    alinhadas é a saída de alinhar_configuracoes; colunas padrão: power, co2_emissions_total, B_Dest_* e eta_ex_*.
+    Retorna um DataFrame longo com configuracao, a grade (segment, u e/ou o eixo da referência) e delta_<coluna>.
+    """
+    rotulos = list(dict.fromkeys(alinhadas['configuracao']))
+    if referencia not in rotulos:
+        raise ValueError(f"Configuração de referência ausente: {referencia}")
+    colunas = colunas or colunas_deltas(alinhadas.columns)
+    blocos = {rotulo: tabela for rotulo, tabela in alinhadas.groupby('configuracao', sort=False)}
+    comparadas = [rotulo for rotulo in rotulos if rotulo != referencia]
+    valores = np.stack([blocos[rotulo][colunas].to_numpy(dtype=float) for rotulo in comparadas])
+    deltas = valores - blocos[referencia][colunas].to_numpy(dtype=float)[None]
+    n_pontos = valores.shape[1]
+    grade = blocos[referencia][[col for col in ('segment', 'u', eixo) if col in alinhadas.columns]].reset_index(drop=True)
+    tabela = pd.DataFrame(deltas.reshape(-1, len(colunas)), columns=[f'delta_{col}' for col in colunas])
+    for col in reversed(grade.columns):
+        tabela.insert(0, col, np.tile(grade[col].to_numpy(), len(comparadas)))
+    tabela.insert(0, 'configuracao', np.repeat(comparadas, n_pontos))
+    return tabela
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Alinha as missões em uma grade comum de tempo ou distância e calcula '
+                                                 'as diferenças de cada configuração em relação à referência.')
+    parser.add_argument('--eixo', choices=eixos, default='time', help='Eixo da grade comum (padrão: time).')
+    parser.add_argument('--modo', choices=modos, default='fases',
+                        help='fases: mesmos pontos relativos em cada segmento (padrão); absoluto: passo fixo no eixo.')
+    parser.add_argument('--pontos', type=int, default=pontos_por_segmento,
+                        help=f'Com --modo fases, pontos por segmento (padrão: {pontos_por_segmento}).')
+    parser.add_argument('--passo', type=float, default=None,
+                        help='Com --modo absoluto, passo da grade (s ou km; padrão: 1/500 da missão mais curta).')
+    parser.add_argument('--referencia', default='Convencional', help='Configuração subtraída das demais (padrão: Convencional).')
+    parser.add_argument('--colunas', nargs='*', default=None,
+                        help='Colunas das diferenças (padrão: power, co2_emissions_total, B_Dest_* e eta_ex_*).')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos (padrão: 1; 0 = todos os núcleos).')
+    parser.add_argument('--sem-cache', action='store_true', help='Recalcula as saídas das configurações.')
+    args = parser.parse_args()
+
+    saidas = carregar_saidas(files, args.workers, usar_cache=not args.sem_cache)
+    alinhadas = alinhar_configuracoes(saidas, args.eixo, args.modo, args.pontos, args.passo)
+    deltas = calcular_deltas(alinhadas, args.referencia, args.colunas, args.eixo)
+    sufixo = f"{args.eixo.split('_')[0]}_{args.modo}"
+    alinhadas.to_csv(f"alinhamento_{sufixo}.csv", sep=";", decimal=",", index=False)
+    deltas.to_csv(f"deltas_{sufixo}.csv", sep=";", decimal=",", index=False)
+
+    destaques = [col for col in ('delta_power', 'delta_co2_emissions_total', 'delta_eta_ex_total') if col in deltas.columns]
+    print(f"Diferenças médias em relação a {args.referencia} ({len(deltas) // max(len(saidas) - 1, 1)} pontos por configuração):")
+    print(deltas.groupby('configuracao', sort=False)[destaques].mean().to_string(float_format=lambda v: f"{v:.4g}"))
+    print(f"Resultados salvos em alinhamento_{sufixo}.csv e deltas_{sufixo}.csv")
@@ -1,8 +1,16 @@
 import pandas as pd
 import numpy as np
-import cantera as ct
 import warnings
-import math
+import argparse
+from functools import partial
+from dados_missao import files, carregar_missao, ler_missao_em_blocos, hash_arquivo, colunas_exergia, compactar_missao
+from execucao_paralela import executar_configuracoes
+from cache_resultados import executar_com_cache, calcular_chave, versao_codigo
+from arquivos_resultados import formatos, gravar_resultados, caminho_resultados, verificar_formato, opcoes_csv_exergia
+from propriedades_ar import exergia_fisica_especifica_J_kg, entalpia_J_kg
+from equilibrio_combustor import interpolar_equilibrio, carregar_grade
+from resumo_exergia import integrar_por_segmento, somar_integrais, montar_resumo, resumir_destruicao, resumir_configuracoes
+import perfil_execucao
 
 # ANÁLISE EXERGÉTICA #
 
@@ -15,6 +23,17 @@ b_fuel_kJ_kg = 45673  # kJ/kg (Exergia química específica do combustível Jet-
 eficiencia_combustao = 0.98 # Eficiência da combustão
 cp_air_J_kgK = 1005 # J/kg.K (Calor específico à pressão constante para o ar)
 
+# Exergia física do ar (B_Air_kW e B_Bleed_kW): 'tabelado' (cp variável, tabela gerada dos polinômios
+# NASA do mecanismo, ver propriedades_ar.py) ou 'cp_constante' (cp_air_J_kgK e R_air_J_kgK)
+modelo_exergia_ar = 'tabelado'
+
+# Separa B_Perda_Dest_Engine_kW em combustão (equilíbrio químico, ver equilibrio_combustor.py),
+# exaustão e demais perdas. Com False as colunas de colunas_perdas_motor não são geradas
+separar_perdas_motor = True
+
+# gas_turbine_p3 do SUAVE está em bar (gas_turbine_t3 já está em K)
+unidade_p3_Pa = 1e5
+
 # Estado morto de referência (constantes)
 T0_ref_K = 298.15  # K
 P0_ref_Pa = 101325 # Pa
@@ -22,8 +41,33 @@ P0_ref_Pa = 101325 # Pa
 # Temperaturas de operação assumidas para componentes elétricos
 T_battery_op_K = 313.15 # 40 C
 T_inverter_op_K = 343.15 # 70 C
-
-# Composição molar do ar seco (estado de referência) - Usada por Cantera
+T_motor_op_K = (100+150)/2 + 273.15 # Temperatura média de operação dos motores elétricos (MTRB e WTP)
+
+# Parâmetros dos componentes (dados fornecidos pelo SUAVE ou assumidos)
+W_Mec_Hydraulic_kW = 14.914 # kW, dado fornecido pelo SUAVE
+W_Electric_kW_aux_engine = 14.914 # kW, dado fornecido pelo SUAVE
+mdot_bleed_kg_s = 0.10394825 # kg/s, dado fornecido pelo SUAVE
+P_bleed_Pa = 172369.7 # Pa, dado fornecido pelo SUAVE
+eta_gearbox = 0.98
+eta_emotor_MTRB_padrao = 0.9
+assumed_inverter_efficiency = 0.95 # Typical exergy efficiency for inverters/rectifiers
+
+# Constantes do modelo que podem ser substituídas em calcular_balancos_exergeticos (varreduras paramétricas)
+nomes_parametros = [
+    'b_fuel_kJ_kg', 'eficiencia_combustao', 'T_battery_op_K', 'T_inverter_op_K', 'T_motor_op_K',
+    'W_Mec_Hydraulic_kW', 'W_Electric_kW_aux_engine', 'mdot_bleed_kg_s', 'P_bleed_Pa',
+    'eta_gearbox', 'assumed_inverter_efficiency',
+]
+
+# Opções do modelo: também podem ser passadas em parametros, mas apenas como valor único (não são
+# variadas em varreduras nem sorteadas no Monte Carlo)
+nomes_opcoes = ['modelo_exergia_ar', 'separar_perdas_motor']
+
+# Colunas da separação das perdas do motor térmico (ausentes dos resultados com separar_perdas_motor = False)
+colunas_perdas_motor = ['T_ad_combustor_K', 'B_Dest_Combustao_kW', 'T_exaustao_K', 'B_Perda_Exaustao_kW',
+                        'B_Dest_Engine_Outros_kW', 'B_Desbalanco_Engine_kW']
+
+# Composição molar do ar seco (estado de referência) - Usada por Cantera (ver mecanismo.py)
 composicao_ar_seco_cantera = {
     'O2': 0.2095,
     'N2': 0.7809,
@@ -44,7 +88,8 @@ massas_molares = {
 # Composição do combustível para Cantera
 fuel_comp_cantera = {"POSF10325": 1.0}
 
-# Funções auxiliares (mantidas como no original, pois a vazão de ar está correta)
+
+# Funções auxiliares (vetorizadas: aceitam escalares ou arrays NumPy)
 def massa_molar_ar():
     temp_comp = {'O2': 0.2095, 'N2': 0.7809, 'Ar': 0.0093, 'CO2': 0.0004}
     return sum(temp_comp[gas] * massas_molares[gas] for gas in temp_comp)
@@ -54,496 +99,657 @@ def fracao_massica_O2():
     temp_comp = {'O2': 0.2095, 'N2': 0.7809, 'Ar': 0.0093, 'CO2': 0.0004}
     return (temp_comp['O2'] * massas_molares['O2']) / M_ar
 
-def calcular_vazao_ar(vazao_combustivel_kg_s, gas_turbine_far):
+def calcular_vazao_ar(vazao_combustivel_kg_s, gas_turbine_far, eficiencia=None):
+    if eficiencia is None:
+        eficiencia = eficiencia_combustao
     mols_O2_por_mol_comb = 16.5
     M_comb = massas_molares['POSF10325'] / 1000
     M_O2 = massas_molares['O2'] / 1000
     frac_mass_O2_ar = fracao_massica_O2()
     AFR_esteq = (mols_O2_por_mol_comb * M_O2) / (M_comb * frac_mass_O2_ar)
-    if gas_turbine_far == 0 or vazao_combustivel_kg_s == 0:
-        return 0, AFR_esteq, 0, 0, 0
-    AFR_real = 1 / gas_turbine_far
-    phi = AFR_esteq / AFR_real
-    AFR_real_adjusted = AFR_real / eficiencia_combustao
-    excesso_ar = (AFR_real_adjusted / AFR_esteq) - 1
-    vazao_ar = vazao_combustivel_kg_s * AFR_real_adjusted
+    vazao_combustivel_kg_s = np.asarray(vazao_combustivel_kg_s, dtype=float)
+    gas_turbine_far = np.asarray(gas_turbine_far, dtype=float)
+    ativo = (gas_turbine_far != 0) & (vazao_combustivel_kg_s != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        AFR_real = 1 / gas_turbine_far
+        phi = np.where(ativo, AFR_esteq / AFR_real, 0)
+        AFR_real_adjusted = np.where(ativo, AFR_real / eficiencia, 0)
+        excesso_ar = np.where(ativo, (AFR_real_adjusted / AFR_esteq) - 1, 0)
+        vazao_ar = np.where(ativo, vazao_combustivel_kg_s * AFR_real_adjusted, 0)
     return vazao_ar, AFR_esteq, AFR_real_adjusted, excesso_ar, phi
 
-def exergy_physical_specific_J_kg_latex(T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s=0):
-    """Calcula a exergia física específica em J/kg usando a fórmula do LaTeX."""
-    # A fórmula do LaTeX é: cp(T - T0) - T0(cp * ln(T/T0) - R * ln(P/P0))
+def exergy_physical_specific_J_kg_latex(T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s=0, modelo=None):
+    """Calcula a exergia física específica em J/kg usando a fórmula do LaTeX.
+
+    modelo: 'cp_constante' ou 'tabelado' (cp variável); None usa modelo_exergia_ar.
+    """
+    modelo = modelo or modelo_exergia_ar
+    if modelo == 'tabelado':
+        e_fis_especifica_J_kg = exergia_fisica_especifica_J_kg(T_K, P_Pa, T0_K_ref, P0_Pa_ref, composicao_ar_seco_cantera)
+    elif modelo == 'cp_constante':
+        # A fórmula do LaTeX é: cp(T - T0) - T0(cp * ln(T/T0) - R * ln(P/P0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            term_enthalpy = cp_air_J_kgK * (T_K - T0_K_ref)
+            term_entropy = T0_K_ref * (cp_air_J_kgK * np.log(T_K / T0_K_ref) - R_air_J_kgK * np.log(P_Pa / P0_Pa_ref))
+        e_fis_especifica_J_kg = term_enthalpy - term_entropy
+    else:
+        raise ValueError(f"Modelo de exergia do ar desconhecido: {modelo}. Opções: tabelado, cp_constante")
+
     # Adicionando o termo de exergia cinética (velocity_m_s**2) / 2
-    
-    term_enthalpy = cp_air_J_kgK * (T_K - T0_K_ref)
-    term_entropy = T0_K_ref * (cp_air_J_kgK * math.log(T_K / T0_K_ref) - R_air_J_kgK * math.log(P_Pa / P0_Pa_ref))
-    
-    e_fis_especifica_J_kg = term_enthalpy - term_entropy
-    
-    if velocity_m_s > 0:
-        e_fis_especifica_J_kg += (velocity_m_s**2) / 2
-        
+    e_fis_especifica_J_kg = e_fis_especifica_J_kg + np.where(velocity_m_s > 0, np.square(velocity_m_s) / 2, 0)
+
     return e_fis_especifica_J_kg
 
-def поток_exergy_physical_kW_latex(mdot_kg_s, T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s=0):
+def поток_exergy_physical_kW_latex(mdot_kg_s, T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s=0, modelo=None):
     """Calcula o fluxo de exergia física em kW usando a fórmula do LaTeX."""
-    if mdot_kg_s == 0:
-        return 0
-    e_fis_especifica_J_kg = exergy_physical_specific_J_kg_latex(T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s)
-    return mdot_kg_s * e_fis_especifica_J_kg / 1000
+    e_fis_especifica_J_kg = exergy_physical_specific_J_kg_latex(T_K, P_Pa, T0_K_ref, P0_Pa_ref, velocity_m_s, modelo)
+    with np.errstate(invalid='ignore'):
+        return np.where(mdot_kg_s == 0, 0, mdot_kg_s * e_fis_especifica_J_kg / 1000)
+
+def variacao_entalpia_ar_J_kg(T_K, T_ref_K, modelo=None):
+    """h(T) - h(T_ref) do ar em J/kg, com o mesmo modelo da exergia física ('tabelado' ou 'cp_constante')."""
+    if (modelo or modelo_exergia_ar) == 'tabelado':
+        return entalpia_J_kg(T_K, composicao_ar_seco_cantera) - entalpia_J_kg(T_ref_K, composicao_ar_seco_cantera)
+    return cp_air_J_kgK * (np.asarray(T_K, dtype=float) - T_ref_K)
 
 def поток_exergy_heat_kW(Q_heat_kW, T_source_K, T0_K_ref):
     """Calcula o fluxo de exergia associado ao calor em kW."""
-    if T_source_K <= T0_K_ref or T_source_K == 0 or Q_heat_kW == 0:
-        return 0
-    factor_carnot = 1 - (T0_K_ref / T_source_K)
-    return Q_heat_kW * factor_carnot
-
-files = {
-    '15%': 'resultados_suave_15.csv',
-    '20%': 'resultados_suave_20.csv',
-    '30%': 'resultados_suave_30.csv',
-    'Convencional': 'resultados_suave_convencional.csv'
-}
+    inativo = (T_source_K <= T0_K_ref) | (T_source_K == 0) | (Q_heat_kW == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor_carnot = 1 - (T0_K_ref / T_source_K)
+        return np.where(inativo, 0, Q_heat_kW * factor_carnot)
+
+def _positivo(valor):
+    """Equivalente vetorizado de max(0, valor) (NaN resulta em 0, como no max do Python)."""
+    return np.where(valor > 0, valor, 0)
+
+def _dividir(numerador, denominador, condicao):
+    """Divisão elemento a elemento que retorna 0 onde a condição não é satisfeita."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(condicao, numerador / denominador, 0)
+
+def _coluna(df_input, nome, padrao=None):
+    """Retorna a coluna como array float; usa o valor padrão se ela não existir na planilha."""
+    if nome in df_input.columns:
+        return df_input[nome].to_numpy(dtype=float)
+    if padrao is None:
+        raise KeyError(f"Coluna '{nome}' não encontrada")
+    return np.full(len(df_input), padrao, dtype=float)
+
+def _delta_preenchido(valores, valor_anterior=np.nan, ultimo_delta=np.nan):
+    """Diferença entre linhas com zeros/NaN preenchidos pelo último valor válido (forward fill).
+
+    valor_anterior e ultimo_delta são o último valor da coluna e o último delta válido do bloco
+    anterior, permitindo processar a missão em blocos com o mesmo resultado da leitura completa.
+    Retorna o array de deltas (NaN iniciais viram 1.0) e o último delta válido, para o próximo bloco.
+    """
+    delta = np.diff(valores, prepend=valor_anterior)
+    # Tratar NaNs e zeros como valores ausentes e aplicar forward fill
+    delta[np.isnan(delta) | (delta == 0)] = np.nan
+    if len(delta) and np.isnan(delta[0]):
+        delta[0] = ultimo_delta
+    indices = np.where(np.isnan(delta), 0, np.arange(len(delta)))
+    np.maximum.accumulate(indices, out=indices)
+    delta = delta[indices]
+    ultimo_delta = delta[-1] if len(delta) else ultimo_delta
+    # Se o primeiro valor ainda for nulo, define como 1.0
+    delta[np.isnan(delta)] = 1.0
+    return delta, ultimo_delta
+
+def integrar_no_tempo(valores_kW, time_s):
+    """Integra taxas em kW ao longo do tempo (regra do trapézio, último eixo) e retorna a energia em MJ."""
+    valores_kW = np.asarray(valores_kW, dtype=float)
+    time_s = np.asarray(time_s, dtype=float)
+    if time_s.size < 2:
+        return np.zeros(valores_kW.shape[:-1])
+    medias = 0.5 * (valores_kW[..., 1:] + valores_kW[..., :-1])
+    return np.sum(medias * np.diff(time_s), axis=-1) / 1000
+
+def preparar_deltas_bateria(df_input, file_path='', estado=None):
+    """Adiciona as colunas delta_battery_energy_J e delta_time_s usadas em B_Quim_Bat.
+
+    Para processamento em blocos, passe o mesmo dicionário estado a cada chamada: ele guarda
+    o último valor de battery_energy/time e o último delta válido entre um bloco e o seguinte.
+    """
+    if estado is None:
+        estado = {}
+    if 'battery_energy' in df_input.columns and 'time' in df_input.columns:
+        for coluna, coluna_delta in (('battery_energy', 'delta_battery_energy_J'), ('time', 'delta_time_s')):
+            valores = df_input[coluna].to_numpy(dtype=float)
+            df_input[coluna_delta], estado[coluna_delta] = _delta_preenchido(
+                valores, estado.get(coluna, np.nan), estado.get(coluna_delta, np.nan))
+            if len(valores):
+                estado[coluna] = valores[-1]
+    else:
+        print(f"AVISO: Colunas 'battery_energy' e/ou 'time' não encontradas em {file_path}. B_Quim_Bat será 0.")
+        df_input['delta_battery_energy_J'] = 0
+        df_input['delta_time_s'] = 1.0
+    return df_input
+
+def parametros_modelo(parametros=None):
+    """Retorna o dicionário das constantes (nomes_parametros) e opções (nomes_opcoes) do modelo, com os valores de parametros substituídos."""
+    valores = {nome: globals()[nome] for nome in nomes_parametros + nomes_opcoes}
+    for nome, valor in (parametros or {}).items():
+        if nome not in valores:
+            raise ValueError(f"Parâmetro desconhecido: {nome}. Opções: {', '.join(nomes_parametros + nomes_opcoes)}")
+        if nome in nomes_opcoes and np.ndim(valor) != 0:
+            raise ValueError(f"{nome} é uma opção do modelo e aceita apenas um valor (recebido um array de forma {np.shape(valor)}).")
+        valores[nome] = valor
+    return valores
+
+def preparar_equilibrio(parametros=None, workers=0):
+    """Constrói (ou lê do cache) a grade de equilíbrio do combustor no processo principal.
+
+    Chamada antes de distribuir as configurações em processos, para que a grade seja calculada uma
+    única vez (com todos os núcleos) em vez de uma vez por processo. Não faz nada sem separar_perdas_motor.
+    """
+    if parametros_modelo(parametros)['separar_perdas_motor']:
+        carregar_grade(fuel_comp_cantera, composicao_ar_seco_cantera, T0_ref_K, P0_ref_Pa, workers=workers)
+
+def calcular_balancos_exergeticos(df_input, hybrid_degree, parametros=None):
+    """Calcula os balanços de exergia de todos os componentes sobre as colunas inteiras da missão.
+
+    parametros substitui as constantes do modelo (ver nomes_parametros). Os valores podem ser
+    arrays de forma (S, 1): os balanços são então avaliados por broadcasting para os S conjuntos
+    de parâmetros de uma só vez e os resultados têm forma (S, N) em vez de (N,).
+
+    Retorna um dicionário {nome da coluna de resultado: array}, na ordem das planilhas resultados_exergia_*.csv.
+    """
+    p = parametros_modelo(parametros)
+    b_fuel_kJ_kg, eficiencia_combustao = p['b_fuel_kJ_kg'], p['eficiencia_combustao']
+    T_battery_op_K, T_inverter_op_K, T_motor_op_K = p['T_battery_op_K'], p['T_inverter_op_K'], p['T_motor_op_K']
+    W_Mec_Hydraulic_kW, W_Electric_kW_aux_engine = p['W_Mec_Hydraulic_kW'], p['W_Electric_kW_aux_engine']
+    mdot_bleed_kg_s, P_bleed_Pa = p['mdot_bleed_kg_s'], p['P_bleed_Pa']
+    eta_gearbox, assumed_inverter_efficiency = p['eta_gearbox'], p['assumed_inverter_efficiency']
+    modelo_ar, separar_perdas = p['modelo_exergia_ar'], p['separar_perdas_motor']
+
+    n = len(df_input)
+    forma = np.broadcast_shapes((n,), *(np.shape(valor) for valor in p.values()))
+    is_conventional = (hybrid_degree == 'Convencional')
+    zeros = np.zeros(n)
+
+    T_ambient_K = _coluna(df_input, "temperature_C") # Coluna já em Kelvin
+    P_ambient_Pa = _coluna(df_input, "pressure_Pa")
+    velocity_m_s = _coluna(df_input, "velocity_m_s")
+    mach_flight = _coluna(df_input, "mach_number")
+
+    mdot_fuel_kg_s = _coluna(df_input, "mass_flow_kg_s", 0)
+    gas_turbine_far_val = _coluna(df_input, "gas_turbine_far", 0)
+    mdot_air_kg_s, AFR_esteq_val, AFR_real_adjusted_val, excesso_ar, phi_val = calcular_vazao_ar(mdot_fuel_kg_s, gas_turbine_far_val, eficiencia_combustao)
+
+    # --- SISTEMA PROPULSIVO TÉRMICO ---
+
+    # 1. MOTOR TÉRMICO
+
+    # 1.1 Taxa de exergia do combustível
+
+    B_Fuel_kW = mdot_fuel_kg_s * b_fuel_kJ_kg
+
+    # 1.2 Taxa de exergia do ar
+
+    T_estag_air = T_ambient_K * ( 1 + ((gamma_air - 1)/2)*mach_flight**2)
+    p_estag_air = P_ambient_Pa * ( 1 + ((gamma_air - 1)/2)*mach_flight**2)**(gamma_air/(gamma_air - 1))
+
+    B_Air_kW = np.abs(поток_exergy_physical_kW_latex(mdot_air_kg_s, T_estag_air, p_estag_air, T0_ref_K, P0_ref_Pa, velocity_m_s, modelo_ar))
+
+    # 1.3 Potência de eixo do motor térmico
+
+    W_Mec_Engine_kW = _coluna(df_input, "power_turboshaft") / 1000
+
+    # 1.4 Extrações úteis de potência (sist. hidráulico e elétrico)
+
+    W_Aux_Engine_kW = W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine
+
+    # 1.5 Extração de ar
+
+    # Cálculo de T_bleed_K conforme LaTeX (estagnação na saída do compressor: T3 em K, P3 em bar)
+    T_estag_bleed_K = _coluna(df_input, "gas_turbine_t3")
+    P_estag_bleed_Pa = _coluna(df_input, "gas_turbine_p3") * unidade_p3_Pa
+
+    estagnacao_valida = (P_estag_bleed_Pa > 0) & (T_estag_bleed_K > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T_bleed_K = np.where(estagnacao_valida,
+                             T_estag_bleed_K * (P_bleed_Pa / P_estag_bleed_Pa)**((gamma_air - 1) / gamma_air),
+                             T_estag_air) # Fallback (temperatura de estagnação na entrada de ar) se os dados de estagnação não forem válidos
+
+    B_Bleed_kW = поток_exergy_physical_kW_latex(mdot_bleed_kg_s, T_bleed_K, P_bleed_Pa, T0_ref_K, P0_ref_Pa, 0, modelo_ar)
+
+    # Balanço exergético - obtenção da parcela de destruição e perdas
+
+    B_Perda_Dest_Engine_kW = _positivo((B_Fuel_kW + B_Air_kW) - (W_Mec_Engine_kW + B_Bleed_kW + W_Aux_Engine_kW))
+
+    # 1.6 Separação das perdas do motor térmico
+
+    if separar_perdas:
+        # Combustão: equilíbrio HP dos reagentes a (phi, T3, P3); destruição = T0 * entropia gerada
+        equilibrio = interpolar_equilibrio(phi_val, _coluna(df_input, "gas_turbine_t3"),
+                                           _coluna(df_input, "gas_turbine_p3") * unidade_p3_Pa,
+                                           fuel_comp_cantera, composicao_ar_seco_cantera, T0_ref_K, P0_ref_Pa)
+        T_ad_combustor_K = equilibrio['T_ad_K']
+        mdot_gases_kg_s = mdot_air_kg_s + mdot_fuel_kg_s
+        B_Dest_Combustao_kW = T0_ref_K * mdot_gases_kg_s * equilibrio['s_ger_J_kgK'] / 1000
+
+        # Exaustão: entalpia sensível dos produtos menos o trabalho das turbinas (eixo, auxiliares e
+        # compressor), com o cp médio dos produtos; exergia física dos gases a T_exaustao e P0
+        W_Compressor_kW = mdot_air_kg_s * variacao_entalpia_ar_J_kg(_coluna(df_input, "gas_turbine_t3"), T_estag_air, modelo_ar) / 1000
+        capacidade_kW_K = mdot_gases_kg_s * equilibrio['cp_produtos_J_kgK'] / 1000
+        H_exaustao_kW = capacidade_kW_K * (T_ad_combustor_K - T0_ref_K) - (W_Mec_Engine_kW + W_Aux_Engine_kW + W_Compressor_kW)
+        T_exaustao_K = T0_ref_K + _dividir(_positivo(H_exaustao_kW), capacidade_kW_K, capacidade_kW_K > 0)
+        B_Perda_Exaustao_kW = capacidade_kW_K * ((T_exaustao_K - T0_ref_K) - T0_ref_K * np.log(T_exaustao_K / T0_ref_K))
+
+        # Demais perdas (compressor, turbinas, trocas de calor): resíduo do balanço do motor. Quando
+        # combustão e exaustão superam a perda total, o resíduo é zerado e o excesso vai para o desbalanço
+        residuo_engine_kW = B_Perda_Dest_Engine_kW - B_Dest_Combustao_kW - B_Perda_Exaustao_kW
+        B_Dest_Engine_Outros_kW = _positivo(residuo_engine_kW)
+        B_Desbalanco_Engine_kW = _positivo(-residuo_engine_kW)
+    else:
+        # Colunas descartadas no final (colunas_perdas_motor)
+        T_ad_combustor_K = B_Dest_Combustao_kW = T_exaustao_K = B_Perda_Exaustao_kW = None
+        B_Dest_Engine_Outros_kW = B_Desbalanco_Engine_kW = None
+
+    # 2. CAIXA DE TRANSMISSÃO (Gearbox)
+    combustion_engine_throttle = _coluna(df_input, "combustion_engine_throttle", 0)
+    electric_throttle_MTRB = _coluna(df_input, "electric_throttle", np.nan)
+
+    mtrb_ativo = (electric_throttle_MTRB == -1) & (not is_conventional)
+    if is_conventional:
+        P_mec_MTRB_kW = zeros
+        eta_emotor_MTRB = np.full(n, eta_emotor_MTRB_padrao)
+    else:
+        P_mec_MTRB_kW = np.where(mtrb_ativo, _coluna(df_input, "power_motor_turboprop") / 1000, 0)
+        eta_emotor_MTRB = np.where(mtrb_ativo, _coluna(df_input, "emotor_efficiency"), eta_emotor_MTRB_padrao)
+
+    # 2.1 Potência recebida na caixa de transmissão (depende da associação de motores)
+
+    # Se P_mec_MTRB_kW é positivo, MTRB é motor (soma à entrada da CT).
+    # Se negativo, MTRB é gerador e subtrai da entrada da CT (energia vai para o inversor).
+    W_Entrada_CT_kW = np.select(
+        [(combustion_engine_throttle > 0) & (electric_throttle_MTRB == 0), # Operação apenas do motor térmico
+         (combustion_engine_throttle > 0) & (electric_throttle_MTRB == -1), # Operação simultânea de motores térmico e elétrico
+         (combustion_engine_throttle == 0) & (electric_throttle_MTRB == -1)], # Operação apenas do motor elétrico
+        [W_Mec_Engine_kW, W_Mec_Engine_kW + P_mec_MTRB_kW, P_mec_MTRB_kW],
+        default=0)
+
+    # 2.2 Potência útil resultante da caixa de transmissão
+
+    W_Gearbox_out_kW = W_Entrada_CT_kW * eta_gearbox
+
+    # Balanço exergético - obtenção da parcela de destruição e perdas
+
+    B_Perda_Dest_Gearbox_kW = _positivo(W_Entrada_CT_kW - W_Gearbox_out_kW)
+
+    # 3. HÉLICE (do sistema térmico)
+
+    # 3.1 Potência recebida na hélice
+
+    W_Prop_SysTermico_in_kW = W_Gearbox_out_kW
+    thrust_turboprop_N = _coluna(df_input, "thrust_propeller")
+
+    # 3.2 Taxa de exergia da tração da hélice
 
-dfs_results_exergy = {}
+    B_Thrust_Engine_kW = (thrust_turboprop_N * velocity_m_s) / 1000
 
-for hybrid_degree, file_path in files.items():
+    # Balanço exergético - obtenção da parcela de destruição e perdas
+
+    B_Perda_Dest_Prop_SysTermico_kW = _positivo(W_Prop_SysTermico_in_kW - B_Thrust_Engine_kW)
+
+    # --- SISTEMA PROPULSIVO ELÉTRICO ---
+    # Na configuração convencional todos os termos elétricos são nulos.
+    B_Quim_Bat_kW = W_Bat_Power_kW = Q_Bat_Heat_kW = B_Bat_Heat_kW = B_Dest_Bat_kW = zeros
+    Ex_inverter_in_kW = Ex_inverter_out_kW = Q_heat_inverter_kW = B_Inverter_Heat_kW = B_Dest_Inverter_kW = eta_ex_inverter = zeros
+    W_El_MTRB_in_kW = W_El_MTRB_out_kW = P_loss_Motor_MTRB_kW = B_Motor_MTRB_Heat_kW = B_Dest_Motor_MTRB_kW = zeros
+    W_El_WTP_in_kW = P_mec_WTPmotor_kW = P_loss_Motor_WTP_kW = B_Motor_WTP_Heat_kW = B_Dest_Motor_WTP_kW = zeros
+    B_Thrust_Motor_WTP_kW = B_Perda_Dest_WTP_kW = zeros
+
+    if not is_conventional:
+
+        # 4. BATERIAS
+
+        delta_bat_energy_J_val = _coluna(df_input, 'delta_battery_energy_J')
+        delta_time_s_val = _coluna(df_input, 'delta_time_s')
+        delta_time_s_val = np.where(delta_time_s_val == 0, 1.0, delta_time_s_val)
+
+        # 4.1 Taxa de exergia química das baterias (depleção de carga armazenada)
+
+        B_Quim_Bat_kW = _dividir(-delta_bat_energy_J_val, delta_time_s_val * 1000, delta_time_s_val > 0)
+
+        # 4.2 Potência útil das baterias
+
+        battery_draw_W = _coluna(df_input, "battery_draw")
+        W_Bat_Power_kW = np.abs(battery_draw_W)/1000
+
+        # 4.3 Taxa de exergia relacionada às perdas por transferência de calor
+        Q_Bat_Heat_kW = _coluna(df_input, "battery_resistive_losses")/1000
+        B_Bat_Heat_kW = поток_exergy_heat_kW(Q_Bat_Heat_kW, T_battery_op_K, T0_ref_K)
+
+        # Balanço exergético - obtenção da taxa de exergia destruída dentro do volume de controle
+
+        B_Dest_Bat_kW = _positivo(B_Quim_Bat_kW - W_Bat_Power_kW - B_Bat_Heat_kW)
+
+        # 5. INVERSOR DC/AC
+
+        # Variáveis WTP
+        electric_throttle_WTP = _coluna(df_input, "electric_throttle_WTP")
+        power_propeller_WTP_kW = _coluna(df_input, "power_propeller_WTP") / 1000
+        eta_propeller_WTP = _coluna(df_input, "eta_propellerWTP")
+        eta_emotor_WTP = _coluna(df_input, "emotorWTP_efficiency")
+        wtp_ativo = electric_throttle_WTP > 0
+        P_mec_WTPmotor_kW = _dividir(power_propeller_WTP_kW, eta_propeller_WTP, wtp_ativo)
+        B_Thrust_Motor_WTP_kW = (_coluna(df_input, "thrust_WTP") * velocity_m_s) / 1000 # Exergia da tração WTP
+
+        # Electrical power to/from MTRB
+        mtrb_eletrico = mtrb_ativo & (_coluna(df_input, "power_motor_turboprop") != 0)
+        mtrb_motor = P_mec_MTRB_kW > 0 # MTRB é motor, consome energia elétrica; caso contrário é gerador
+        W_El_MTRB_in_kW = _dividir(P_mec_MTRB_kW, eta_emotor_MTRB, mtrb_eletrico & mtrb_motor)
+        W_El_MTRB_out_kW = np.where(mtrb_eletrico & ~mtrb_motor, np.abs(P_mec_MTRB_kW) * eta_emotor_MTRB, 0)
+
+        # Electrical power to WTP (always motor)
+        W_El_WTP_in_kW = _dividir(P_mec_WTPmotor_kW, eta_emotor_WTP, wtp_ativo & (power_propeller_WTP_kW > 0))
+
+        P_battery_draw_kW = battery_draw_W / 1000 # Sinal mantido para evidenciar o funcionamento motor / gerador
+        total_electrical_output_to_motors_kW = W_El_MTRB_in_kW + W_El_WTP_in_kW
+
+        descarga = P_battery_draw_kW > 0 # Battery discharging (Inverter: DC to AC)
+        carga = P_battery_draw_kW < 0 # Battery charging (Rectifier: AC to DC)
+        motores_diretos = ~descarga & ~carga & (total_electrical_output_to_motors_kW > 0) # Motors are active, power comes from thermal engine directly
+
+        Ex_inverter_out_kW = np.select([descarga, carga, motores_diretos],
+                                       [total_electrical_output_to_motors_kW, np.abs(P_battery_draw_kW), total_electrical_output_to_motors_kW],
+                                       default=0)
+        Ex_inverter_in_kW = np.where(descarga, P_battery_draw_kW,
+                                     np.where(carga | motores_diretos, Ex_inverter_out_kW / assumed_inverter_efficiency, 0)) # Assuming same efficiency for rectifier
+
+        # Calculate power loss in inverter
+        inversor_ativo = Ex_inverter_in_kW > 0 # Only calculate if there's a valid input
+        Q_heat_inverter_kW = np.where(inversor_ativo, Ex_inverter_in_kW - Ex_inverter_out_kW, 0)
+
+        # Normal operation: input >= output, positive or zero losses.
+        # Inconsistent data (input < output) falls back to abs(losses) and the assumed efficiency.
+        operacao_normal = Q_heat_inverter_kW >= 0
+        Q_heat_abs_inverter_kW = np.where(operacao_normal, Q_heat_inverter_kW, np.abs(Q_heat_inverter_kW))
+        B_Inverter_Heat_kW = np.where(inversor_ativo, поток_exergy_heat_kW(Q_heat_abs_inverter_kW, T_inverter_op_K, T0_ref_K), 0)
+        B_Dest_Inverter_kW = np.where(inversor_ativo, _positivo(Q_heat_abs_inverter_kW - B_Inverter_Heat_kW), 0) # Ensure non-negative destruction
+        eta_ex_inverter = np.where(inversor_ativo & operacao_normal, _dividir(Ex_inverter_out_kW, Ex_inverter_in_kW, inversor_ativo),
+                                   np.where(inversor_ativo, assumed_inverter_efficiency, 0))
+
+        # 6. MOTOR ELÉTRICO MTRB
+
+        # Se P_mec_MTRB_kW > 0, MTRB é motor, então W_El_MTRB_in_kW é a entrada elétrica.
+        # Se P_mec_MTRB_kW < 0, MTRB é gerador, então W_El_MTRB_out_kW é a saída elétrica.
+
+        mtrb_balanco = mtrb_ativo & (P_mec_MTRB_kW != 0)
+        T_motor_MTRB_op_K = _coluna(df_input, "T_motor_MTRB_op_K") if "T_motor_MTRB_op_K" in df_input.columns else T_motor_op_K
+        P_loss_Motor_MTRB_kW = np.where(mtrb_motor,
+                                        W_El_MTRB_in_kW - P_mec_MTRB_kW,
+                                        np.abs(P_mec_MTRB_kW) - np.abs(W_El_MTRB_out_kW)) # Perda de energia no gerador
+        P_loss_Motor_MTRB_kW = np.where(mtrb_balanco, _positivo(P_loss_Motor_MTRB_kW), 0)
+        B_Motor_MTRB_Heat_kW = np.where(mtrb_balanco, поток_exergy_heat_kW(P_loss_Motor_MTRB_kW, T_motor_MTRB_op_K, T0_ref_K), 0)
+
+        # Balanço exergético para o MTRB
+        B_Dest_Motor_MTRB_kW = np.where(mtrb_motor,
+                                        W_El_MTRB_in_kW - P_mec_MTRB_kW - B_Motor_MTRB_Heat_kW,
+                                        np.abs(P_mec_MTRB_kW) - np.abs(W_El_MTRB_out_kW) - B_Motor_MTRB_Heat_kW)
+        B_Dest_Motor_MTRB_kW = np.where(mtrb_balanco, _positivo(B_Dest_Motor_MTRB_kW), 0)
+
+        # 7. MOTOR ELÉTRICO WTP
+
+        wtp_balanco = wtp_ativo & (P_mec_WTPmotor_kW > 0)
+        T_motor_WTP_op_K = _coluna(df_input, "T_motor_WTP_op_K") if "T_motor_WTP_op_K" in df_input.columns else T_motor_op_K
+        P_loss_Motor_WTP_kW = np.where(wtp_balanco, _positivo(W_El_WTP_in_kW - P_mec_WTPmotor_kW), 0)
+        B_Motor_WTP_Heat_kW = np.where(wtp_balanco, поток_exergy_heat_kW(P_loss_Motor_WTP_kW, T_motor_WTP_op_K, T0_ref_K), 0)
+        B_Dest_Motor_WTP_kW = np.where(wtp_balanco, _positivo(W_El_WTP_in_kW - P_mec_WTPmotor_kW - B_Motor_WTP_Heat_kW), 0)
+
+        # 8. HÉLICE WTP
+
+        # Conforme LaTeX, B_Perda/Dest_WTP é a diferença entre a potência mecânica de entrada e a exergia de tração
+        # (representa a soma de B_Dest_WTP e B_WTP_Air, que não são separados no balanço principal)
+        B_Perda_Dest_WTP_kW = np.where(wtp_balanco, _positivo(P_mec_WTPmotor_kW - B_Thrust_Motor_WTP_kW), 0)
+
+    B_Thrust_Total_kW = B_Thrust_Engine_kW + B_Thrust_Motor_WTP_kW
+
+    # Eficiências exergéticas
+
+    eta_ex_prop_SysTermico = _dividir(B_Thrust_Engine_kW, W_Prop_SysTermico_in_kW, W_Prop_SysTermico_in_kW > 0)
+    eta_ex_bat = _dividir(W_Bat_Power_kW, B_Quim_Bat_kW, B_Quim_Bat_kW > 0)
+    # eta_ex_inverter já calculado no bloco do inversor
+
+    # Eficiência exergética do motor MTRB
+    eta_ex_motor_MTRB = np.where(P_mec_MTRB_kW > 0,
+                                 _dividir(P_mec_MTRB_kW, W_El_MTRB_in_kW, W_El_MTRB_in_kW > 0), # MTRB é motor
+                                 _dividir(np.abs(W_El_MTRB_out_kW), np.abs(P_mec_MTRB_kW), P_mec_MTRB_kW != 0)) # MTRB é gerador
+
+    eta_ex_motor_WTP = _dividir(P_mec_WTPmotor_kW, W_El_WTP_in_kW, W_El_WTP_in_kW > 0)
+    eta_ex_prop_WTP = _dividir(B_Thrust_Motor_WTP_kW, P_mec_WTPmotor_kW, P_mec_WTPmotor_kW > 0)
+
+    # Eficiência exergética do motor térmico
+    B_Entrada_Engine_kW = B_Fuel_kW + B_Air_kW
+    eta_ex_engine = _dividir(W_Mec_Engine_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW, B_Entrada_Engine_kW, B_Entrada_Engine_kW > 0)
+
+    eta_ex_gearbox = _dividir(W_Gearbox_out_kW, W_Entrada_CT_kW, W_Entrada_CT_kW > 0)
+
+    # Eficiência exergética total do sistema
+    # A eficiência exergética total é a exergia útil (tração total) dividida pela exergia de entrada (combustível + química da bateria)
+    # Se o sistema for convencional, a entrada da bateria é zero.
+    total_exergy_input_kW = B_Fuel_kW + B_Air_kW + B_Quim_Bat_kW
+    eta_ex_total = _dividir(B_Thrust_Total_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW, total_exergy_input_kW, total_exergy_input_kW > 0)
+
+    constante = lambda valor: np.broadcast_to(np.asarray(valor, dtype=float), forma)
+
+    resultados = {
+        'segment': df_input['segment'].to_numpy() if 'segment' in df_input.columns else np.full(n, None),
+        'time': _coluna(df_input, 'time'),
+        'altitude_m': _coluna(df_input, 'altitude_m'),
+        'mach_number': mach_flight,
+        'velocity_m_s': velocity_m_s,
+        'pressure_Pa': P_ambient_Pa,
+        'temperature_C': T_ambient_K,
+        'mdot_fuel_kg_s': mdot_fuel_kg_s,
+        'mdot_air_kg_s': mdot_air_kg_s,
+        'AFR_esteq': constante(AFR_esteq_val),
+        'AFR_real_adjusted': AFR_real_adjusted_val,
+        'excesso_ar': excesso_ar,
+        'phi': phi_val,
+        'B_Fuel_kW': B_Fuel_kW,
+        'B_Air_kW': B_Air_kW,
+        'W_Mec_Engine_kW': W_Mec_Engine_kW,
+        'W_Mec_Hydraulic_kW': constante(W_Mec_Hydraulic_kW),
+        'W_Electric_kW_aux_engine': constante(W_Electric_kW_aux_engine),
+        'W_Aux_Engine_kW': constante(W_Aux_Engine_kW),
+        'mdot_bleed_kg_s': constante(mdot_bleed_kg_s),
+        'P_bleed_Pa': constante(P_bleed_Pa),
+        'T_estag_bleed_K': T_estag_bleed_K,
+        'P_estag_bleed_Pa': P_estag_bleed_Pa,
+        'T_bleed_K': T_bleed_K,
+        'B_Bleed_kW': B_Bleed_kW,
+        'B_Perda_Dest_Engine_kW': B_Perda_Dest_Engine_kW,
+        'T_ad_combustor_K': T_ad_combustor_K,
+        'B_Dest_Combustao_kW': B_Dest_Combustao_kW,
+        'T_exaustao_K': T_exaustao_K,
+        'B_Perda_Exaustao_kW': B_Perda_Exaustao_kW,
+        'B_Dest_Engine_Outros_kW': B_Dest_Engine_Outros_kW,
+        'B_Desbalanco_Engine_kW': B_Desbalanco_Engine_kW,
+        'P_mec_MTRB_kW': P_mec_MTRB_kW,
+        'eta_emotor_MTRB': eta_emotor_MTRB,
+        'W_Entrada_CT_kW': W_Entrada_CT_kW,
+        'W_Gearbox_out_kW': W_Gearbox_out_kW,
+        'B_Perda_Dest_Gearbox_kW': B_Perda_Dest_Gearbox_kW,
+        'W_Prop_SysTermico_in_kW': W_Prop_SysTermico_in_kW,
+        'thrust_turboprop_N': thrust_turboprop_N,
+        'B_Thrust_Engine_kW': B_Thrust_Engine_kW,
+        'B_Perda_Dest_Prop_SysTermico_kW': B_Perda_Dest_Prop_SysTermico_kW,
+        'B_Quim_Bat_kW': B_Quim_Bat_kW,
+        'W_Bat_Power_kW': W_Bat_Power_kW,
+        'Q_Bat_Heat_kW': Q_Bat_Heat_kW,
+        'B_Bat_Heat_kW': B_Bat_Heat_kW,
+        'B_Dest_Bat_kW': B_Dest_Bat_kW,
+        'Ex_inverter_in_kW': Ex_inverter_in_kW,
+        'Ex_inverter_out_kW': Ex_inverter_out_kW,
+        'Q_heat_inverter_kW': Q_heat_inverter_kW,
+        'B_Inverter_Heat_kW': B_Inverter_Heat_kW,
+        'B_Dest_Inverter_kW': B_Dest_Inverter_kW,
+        'eta_ex_inverter': eta_ex_inverter,
+        'W_El_MTRB_in_kW': W_El_MTRB_in_kW,
+        'W_El_MTRB_out_kW': W_El_MTRB_out_kW,
+        'P_loss_Motor_MTRB_kW': P_loss_Motor_MTRB_kW,
+        'B_Motor_MTRB_Heat_kW': B_Motor_MTRB_Heat_kW,
+        'B_Dest_Motor_MTRB_kW': B_Dest_Motor_MTRB_kW,
+        'W_El_WTP_in_kW': W_El_WTP_in_kW,
+        'P_mec_WTPmotor_kW': P_mec_WTPmotor_kW,
+        'P_loss_Motor_WTP_kW': P_loss_Motor_WTP_kW,
+        'B_Motor_WTP_Heat_kW': B_Motor_WTP_Heat_kW,
+        'B_Dest_Motor_WTP_kW': B_Dest_Motor_WTP_kW,
+        'B_Thrust_Motor_WTP_kW': B_Thrust_Motor_WTP_kW,
+        'B_Perda_Dest_WTP_kW': B_Perda_Dest_WTP_kW, # Representa a soma de B_Dest_WTP e B_WTP_Air
+        'B_Thrust_Total_kW': B_Thrust_Total_kW,
+        'eta_ex_engine': eta_ex_engine,
+        'eta_ex_gearbox': eta_ex_gearbox,
+        'eta_ex_prop_SysTermico': eta_ex_prop_SysTermico,
+        'eta_ex_bat': eta_ex_bat,
+        'eta_ex_motor_MTRB': eta_ex_motor_MTRB,
+        'eta_ex_motor_WTP': eta_ex_motor_WTP,
+        'eta_ex_prop_WTP': eta_ex_prop_WTP,
+        'eta_ex_total': eta_ex_total
+    }
+    if not separar_perdas:
+        for nome in colunas_perdas_motor:
+            del resultados[nome]
+    return resultados
+
+def calcular_exergia(df_input, hybrid_degree, parametros=None):
+    """Executa a análise exergética vetorizada de uma missão e retorna o DataFrame de resultados."""
+    with perfil_execucao.etapa('exergia_calculo', hybrid_degree, len(df_input), perfilar=True):
+        return pd.DataFrame(calcular_balancos_exergeticos(df_input, hybrid_degree, parametros))
+
+def base_resultados(hybrid_degree):
+    return f"resultados_exergia_{hybrid_degree.replace('%', '')}"
+
+def arquivo_resultados(hybrid_degree, formato='csv'):
+    return caminho_resultados(base_resultados(hybrid_degree), formato)
+
+def arquivos_saida(hybrid_degree, formato='csv', exportar_csv=False):
+    """Arquivos gravados por processar_configuracao para uma configuração."""
+    arquivos = [arquivo_resultados(hybrid_degree, formato)]
+    if exportar_csv and formato != 'csv':
+        arquivos.append(arquivo_resultados(hybrid_degree))
+    return arquivos
+
+def chave_configuracao(hybrid_degree, file_path, parametros=None, float32=False):
+    """Chave do cache de resultados: conteúdo da planilha, constantes do modelo e versão do código."""
+    return calcular_chave('exergia', hybrid_degree, hash_arquivo(file_path), parametros_modelo(parametros), float32,
+                          versao_codigo('analise_exergetica', 'dados_missao', 'propriedades_ar', 'equilibrio_combustor'))
+
+def processar_configuracao(hybrid_degree, file_path, formato='csv', exportar_csv=False, compacto=False, float32=False):
+    """Executa a análise exergética de uma planilha e salva resultados_exergia_*.<formato>; retorna None em caso de erro.
+
+    Com formato diferente de 'csv', exportar_csv=True também grava o CSV (separador ';' e decimal ',').
+    Com compacto=True apenas as colunas de colunas_exergia são carregadas (em float32, se pedido; os
+    cálculos continuam em float64) e o DataFrame retornado está na representação compacta.
+    """
     try:
-        df_input = pd.read_csv(file_path, delimiter=";", decimal=",", skip_blank_lines=True)
+        df_input = carregar_missao(file_path, hybrid_degree, compacto=compacto, colunas=colunas_exergia, float32=float32)
         if df_input.empty:
             print(f"Aviso: Arquivo {file_path} está vazio. Pulando...")
-            continue
-
-        if 'battery_energy' in df_input.columns and 'time' in df_input.columns:
-            df_input['delta_battery_energy_J'] = df_input['battery_energy'].diff()
-            df_input['delta_time_s'] = df_input['time'].diff()
-
-            # Tratar NaNs e zeros como valores ausentes
-            df_input['delta_battery_energy_J'] = df_input['delta_battery_energy_J'].fillna(0)
-            df_input['delta_time_s'] = df_input['delta_time_s'].fillna(0)
-    
-            # Substitui 0 por pd.NA e aplica forward fill
-            df_input['delta_battery_energy_J'] = df_input['delta_battery_energy_J'].replace(0, pd.NA).ffill()
-            df_input['delta_time_s'] = df_input['delta_time_s'].replace(0, pd.NA).ffill()
-
-            # Se o primeiro valor ainda for nulo, define como 1.0
-            df_input['delta_battery_energy_J'] = df_input['delta_battery_energy_J'].fillna(1.0)
-            df_input['delta_time_s'] = df_input['delta_time_s'].fillna(1.0)
-        else:
-            print(f"AVISO: Colunas 'battery_energy' e/ou 'time' não encontradas em {file_path}. B_Quim_Bat será 0.")
-            df_input['delta_battery_energy_J'] = 0
-            df_input['delta_time_s'] = 1.0
-
-        results_list_exergy = []
-
-        for idx in range(len(df_input)):
-            row = df_input.iloc[idx]
-
-            T_ambient_K = row.get("temperature_C") # Coluna já em Kelvin
-            P_ambient_Pa = row.get("pressure_Pa")
-            velocity_m_s = row.get("velocity_m_s")
-            mach_flight = row.get("mach_number")
-
-            mdot_fuel_kg_s = row.get("mass_flow_kg_s", 0)
-            gas_turbine_far_val = row.get("gas_turbine_far", 0)
-            mdot_air_kg_s, AFR_esteq_val, AFR_real_adjusted_val, excesso_ar, phi_val = calcular_vazao_ar(mdot_fuel_kg_s, gas_turbine_far_val)
-
-            # --- SISTEMA PROPULSIVO TÉRMICO ---
-
-            # 1. MOTOR TÉRMICO
-
-            # 1.1 Taxa de exergia do combustível
-            
-            B_Fuel_kW = mdot_fuel_kg_s * b_fuel_kJ_kg
-
-            # 1.2 Taxa de exergia do ar
-
-            T_estag_air = T_ambient_K * ( 1 + ((gamma_air - 1)/2)*mach_flight**2)
-            p_estag_air = P_ambient_Pa * ( 1 + ((gamma_air - 1)/2)*mach_flight**2)**(gamma_air/(gamma_air - 1))
-            
-            B_Air_kW = abs(поток_exergy_physical_kW_latex(mdot_air_kg_s, T_estag_air, p_estag_air, T0_ref_K, P0_ref_Pa, velocity_m_s))
-
-            # 1.3 Potência de eixo do motor térmico
-
-            W_Mec_Engine_kW = row.get("power_turboshaft") / 1000
-
-            # 1.4 Extrações úteis de potência (sist. hidráulico e elétrico)
-            
-            W_Mec_Hydraulic_kW = 14.914 # kW, dado fornecido pelo SUAVE
-            W_Electric_kW_aux_engine = 14.914 # kW, dado fornecido pelo SUAVE
-            W_Aux_Engine_kW = W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine
-
-            # 1.5 Extração de ar
-            
-            mdot_bleed_kg_s = 0.10394825 # kg/s, dado fornecido pelo SUAVE
-            P_bleed_Pa = 172369.7 # Pa, dado fornecido pelo SUAVE
-            
-            # Cálculo de T_bleed_K conforme LaTeX
-            T_estag_bleed_K = row.get("gas_turbine_t3") + 273.15 # Convertendo para Kelvin
-            P_estag_bleed_Pa = row.get("gas_turbine_p3")
-            
-            if P_estag_bleed_Pa > 0 and T_estag_bleed_K > 0:
-                T_bleed_K = T_estag_bleed_K * (P_bleed_Pa / P_estag_bleed_Pa)**((gamma_air - 1) / gamma_air)
-            else:
-                T_bleed_K = T_air_inlet_K # Fallback se os dados de estagnação não forem válidos
-
-            B_Bleed_kW = поток_exergy_physical_kW_latex(mdot_bleed_kg_s, T_bleed_K, P_bleed_Pa, T0_ref_K, P0_ref_Pa, 0)
-
-            # Balanço exergético - obtenção da parcela de destruição e perdas
-
-            B_Perda_Dest_Engine_kW = (B_Fuel_kW + B_Air_kW) - (W_Mec_Engine_kW + B_Bleed_kW + W_Aux_Engine_kW)
-            B_Perda_Dest_Engine_kW = max(0, B_Perda_Dest_Engine_kW)
-
-            # 2. CAIXA DE TRANSMISSÃO (Gearbox)
-            P_mec_MTRB_kW = 0
-            eta_emotor_MTRB = 0.9
-            combustion_engine_throttle = row.get("combustion_engine_throttle", 0)
-            electric_throttle_MTRB = row.get("electric_throttle")
-
-            if not (hybrid_degree == 'Convencional') and electric_throttle_MTRB == -1:
-                P_mec_MTRB_kW = row.get("power_motor_turboprop") / 1000
-                eta_emotor_MTRB = row.get("emotor_efficiency")
-
-            # 2.1 Potência recebida na caixa de transmissão (depende da associação de motores)
-
-            W_Entrada_CT_kW = 0
-            if combustion_engine_throttle > 0 and electric_throttle_MTRB == 0: # Operação apenas do motor térmico
-                W_Entrada_CT_kW = W_Mec_Engine_kW
-            elif combustion_engine_throttle > 0 and electric_throttle_MTRB == -1: # Operação simultânea de motores térmico e elétrico
-                # Se P_mec_MTRB_kW é positivo, MTRB é motor. Se negativo, MTRB é gerador.
-                # Se MTRB é gerador, ele subtrai da entrada da CT (energia vai para o inversor).
-                # Se MTRB é motor, ele soma à entrada da CT.
-                W_Entrada_CT_kW = W_Mec_Engine_kW + P_mec_MTRB_kW
-            elif combustion_engine_throttle == 0 and electric_throttle_MTRB == -1: # Operação apenas do motor elétrico
-                W_Entrada_CT_kW = P_mec_MTRB_kW
-            
-            eta_gearbox = 0.98
-
-            # 2.2 Potência útil resultante da caixa de transmissão
-            
-            W_Gearbox_out_kW = W_Entrada_CT_kW * eta_gearbox
-
-            # Balanço exergético - obtenção da parcela de destruição e perdas
-
-            B_Perda_Dest_Gearbox_kW = W_Entrada_CT_kW - W_Gearbox_out_kW
-            B_Perda_Dest_Gearbox_kW = max(0, B_Perda_Dest_Gearbox_kW)
-
-            # 3. HÉLICE (do sistema térmico)
-
-            # 3.1 Potência recebida na hélice
-            
-            W_Prop_SysTermico_in_kW = W_Gearbox_out_kW
-            thrust_turboprop_N = row.get("thrust_propeller")
-
-            # 3.2 Taxa de exergia da tração da hélice
-            
-            B_Thrust_Engine_kW = (thrust_turboprop_N * velocity_m_s) / 1000
-
-            # Balanço exergético - obtenção da parcela de destruição e perdas
-
-            B_Perda_Dest_Prop_SysTermico_kW = W_Prop_SysTermico_in_kW - B_Thrust_Engine_kW
-            B_Perda_Dest_Prop_SysTermico_kW = max(0, B_Perda_Dest_Prop_SysTermico_kW)
-
-            # --- SISTEMA PROPULSIVO ELÉTRICO ---
-            is_conventional = (hybrid_degree == 'Convencional')
-            if not is_conventional:
-
-                # 4. BATERIAS
-            
-                B_Quim_Bat_kW = 0
-                W_Bat_Power_kW = 0
-                B_Bat_Heat_kW = 0
-                B_Dest_Bat_kW = 0
-
-                #if not is_conventional:
-                delta_bat_energy_J_val = row.get('delta_battery_energy_J')
-                delta_time_s_val = row.get('delta_time_s')
-                if delta_time_s_val == 0: delta_time_s_val = 1.0
-                    
-                # 4.1 Taxa de exergia química das baterias (depleção de carga armazenada)
-
-                B_Quim_Bat_kW = -delta_bat_energy_J_val / (delta_time_s_val * 1000) if delta_time_s_val > 0 else 0
-
-                # 4.2 Potência útil das baterias
-
-                W_Bat_Power_kW = abs(row.get("battery_draw"))/1000
-
-                # 4.3 Taxa de exergia relacionada às perdas por transferência de calor
-                Q_Bat_Heat_kW = row.get("battery_resistive_losses")/1000
-                B_Bat_Heat_kW = поток_exergy_heat_kW(Q_Bat_Heat_kW, T_battery_op_K, T0_ref_K)
-
-                # Balanço exergético - obtenção da taxa de exergia destruída dentro do volume de controle
-
-                B_Dest_Bat_kW = B_Quim_Bat_kW - W_Bat_Power_kW - B_Bat_Heat_kW
-                B_Dest_Bat_kW = max(0, B_Dest_Bat_kW)
-
-                # 5. INVERSOR DC/AC
-                Ex_inverter_in_kW = 0
-                Ex_inverter_out_kW = 0
-                B_Inverter_Heat_kW = 0
-                B_Dest_Inverter_kW = 0
-                eta_ex_inverter = 0 
-
-                # Inicializando variáveis WTP
-                electric_throttle_WTP = row.get("electric_throttle_WTP")
-                power_propeller_WTP_kW = row.get("power_propeller_WTP") / 1000
-                eta_propeller_WTP = row.get("eta_propellerWTP") 
-                eta_emotor_WTP = row.get("emotorWTP_efficiency") 
-                P_mec_WTPmotor_kW = 0
-                if electric_throttle_WTP > 0:
-                    P_mec_WTPmotor_kW = power_propeller_WTP_kW / eta_propeller_WTP
-                B_Thrust_Motor_WTP_kW = (row.get("thrust_WTP") * velocity_m_s) / 1000 # Exergia da tração WTP
-
-                if not is_conventional:
-                    # Electrical power to/from MTRB
-                    W_El_MTRB_in_kW = 0
-                    W_El_MTRB_out_kW = 0
-                    if electric_throttle_MTRB == -1 and row.get("power_motor_turboprop") != 0:
-                        if P_mec_MTRB_kW > 0: # MTRB é motor, consome energia elétrica
-                            W_El_MTRB_in_kW = P_mec_MTRB_kW / eta_emotor_MTRB
-                        else: # MTRB é gerador, produz energia elétrica
-                            W_El_MTRB_out_kW = abs(P_mec_MTRB_kW) * eta_emotor_MTRB
-                
-                    # Electrical power to WTP (always motor)
-                    W_El_WTP_in_kW = 0
-                    if electric_throttle_WTP > 0 and power_propeller_WTP_kW > 0:
-                        W_El_WTP_in_kW = (power_propeller_WTP_kW / eta_propeller_WTP) / eta_emotor_WTP
-
-                    P_battery_draw_kW = row.get("battery_draw") / 1000 # Sinal mantido para evidenciar o funcionamento motor / gerador
-                    total_electrical_output_to_motors_kW = W_El_MTRB_in_kW + W_El_WTP_in_kW
-
-                    # Initialize inverter variables
-                    Ex_inverter_in_kW = 0
-                    Ex_inverter_out_kW = 0
-                    Q_heat_inverter_kW = 0
-                    B_Inverter_Heat_kW = 0
-                    B_Dest_Inverter_kW = 0
-                    eta_ex_inverter = 0
-
-                    assumed_inverter_efficiency = 0.95 # Typical exergy efficiency for inverters/rectifiers
-
-                    if P_battery_draw_kW > 0: # Battery discharging (Inverter: DC to AC)
-                        Ex_inverter_in_kW = P_battery_draw_kW
-                        Ex_inverter_out_kW = total_electrical_output_to_motors_kW
-                    elif P_battery_draw_kW < 0: # Battery charging (Rectifier: AC to DC)
-                        Ex_inverter_out_kW = abs(P_battery_draw_kW) # Power delivered to battery
-                        Ex_inverter_in_kW = Ex_inverter_out_kW / assumed_inverter_efficiency # Assuming same efficiency for rectifier
-                    else: # No net battery power flow (P_battery_draw_kW == 0)
-                        if total_electrical_output_to_motors_kW > 0: # Motors are active, power comes from thermal engine directly
-                            Ex_inverter_out_kW = total_electrical_output_to_motors_kW
-                            Ex_inverter_in_kW = Ex_inverter_out_kW / assumed_inverter_efficiency
-                        else: # Inverter is truly inactive
-                            Ex_inverter_in_kW = 0
-                            Ex_inverter_out_kW = 0
-
-                    # Calculate power loss in inverter
-                    Q_heat_inverter_kW = Ex_inverter_in_kW - Ex_inverter_out_kW
-                
-                    if Ex_inverter_in_kW > 0: # Only calculate if there\'s a valid input
-                        if Q_heat_inverter_kW >= 0: # Normal operation: input >= output, positive or zero losses
-                            B_Inverter_Heat_kW = поток_exergy_heat_kW(Q_heat_inverter_kW, T_inverter_op_K, T0_ref_K)
-                            B_Dest_Inverter_kW = Q_heat_inverter_kW - B_Inverter_Heat_kW
-                            B_Dest_Inverter_kW = max(0, B_Dest_Inverter_kW) # Ensure non-negative destruction
-                            if Ex_inverter_in_kW > 0: # Avoid division by zero
-                                eta_ex_inverter = Ex_inverter_out_kW / Ex_inverter_in_kW
-                            else:
-                                eta_ex_inverter = 0
-                        else: # Inconsistent data: input < output, implies negative losses (should be handled by assumed_inverter_efficiency now)
-                            # This block should ideally not be hit if assumed_inverter_efficiency is correctly applied.
-                            # If it is, it means there\'s still an issue with the input data or power balance.
-                            # For robustness, we can fall back to the assumed efficiency.
-                            B_Inverter_Heat_kW = поток_exergy_heat_kW(abs(Q_heat_inverter_kW), T_inverter_op_K, T0_ref_K) # Use abs for heat
-                            B_Dest_Inverter_kW = abs(Q_heat_inverter_kW) - B_Inverter_Heat_kW # Use abs for destruction calculation
-                            B_Dest_Inverter_kW = max(0, B_Dest_Inverter_kW)
-                            eta_ex_inverter = assumed_inverter_efficiency # Fallback to assumed efficiency
-                    else: # Ex_inverter_in_kW is 0 (inverter inactive)
-                        Q_heat_inverter_kW = 0
-                        B_Inverter_Heat_kW = 0
-                        B_Dest_Inverter_kW = 0
-                        eta_ex_inverter = 0
-
-
-                # 6. MOTOR ELÉTRICO MTRB
-            
-                B_Motor_MTRB_Heat_kW = 0
-                B_Dest_Motor_MTRB_kW = 0
-                P_loss_Motor_MTRB_kW = 0
-            
-                # A potência elétrica de entrada no MTRB (W_El_MTRB_in_kW) já foi calculada no bloco do inversor
-                # Se P_mec_MTRB_kW > 0, MTRB é motor, então W_El_MTRB_in_kW é a entrada elétrica.
-                # Se P_mec_MTRB_kW < 0, MTRB é gerador, então W_El_MTRB_out_kW é a saída elétrica.
-            
-                if not is_conventional and electric_throttle_MTRB == -1 and P_mec_MTRB_kW != 0:
-                    if P_mec_MTRB_kW > 0: # MTRB é motor
-                        P_loss_Motor_MTRB_kW = W_El_MTRB_in_kW - P_mec_MTRB_kW
-                    else: # MTRB é gerador
-                        P_loss_Motor_MTRB_kW = abs(P_mec_MTRB_kW) - abs(W_El_MTRB_out_kW) # Perda de energia no gerador
-
-                    P_loss_Motor_MTRB_kW = max(0, P_loss_Motor_MTRB_kW)
-                    T_motor_MTRB_op_K = row.get("T_motor_MTRB_op_K", (100+150)/2 + 273.15)
-                    B_Motor_MTRB_Heat_kW = поток_exergy_heat_kW(P_loss_Motor_MTRB_kW, T_motor_MTRB_op_K, T0_ref_K)
-                
-                    # Balanço exergético para o MTRB
-                    if P_mec_MTRB_kW > 0: # MTRB é motor
-                        B_Dest_Motor_MTRB_kW = W_El_MTRB_in_kW - P_mec_MTRB_kW - B_Motor_MTRB_Heat_kW
-                    else: # MTRB é gerador
-                        B_Dest_Motor_MTRB_kW = abs(P_mec_MTRB_kW) - abs(W_El_MTRB_out_kW) - B_Motor_MTRB_Heat_kW
-                    B_Dest_Motor_MTRB_kW = max(0, B_Dest_Motor_MTRB_kW)
-            
-                # 7. MOTOR ELÉTRICO WTP
-            
-                B_Motor_WTP_Heat_kW = 0
-                B_Dest_Motor_WTP_kW = 0
-                P_loss_Motor_WTP_kW = 0
-            
-                if not is_conventional and electric_throttle_WTP > 0 and P_mec_WTPmotor_kW > 0:
-                    P_loss_Motor_WTP_kW = W_El_WTP_in_kW - P_mec_WTPmotor_kW
-                    P_loss_Motor_WTP_kW = max(0, P_loss_Motor_WTP_kW)
-                    T_motor_WTP_op_K = row.get("T_motor_WTP_op_K", (100+150)/2 + 273.15)
-                    B_Motor_WTP_Heat_kW = поток_exergy_heat_kW(P_loss_Motor_WTP_kW, T_motor_WTP_op_K, T0_ref_K)
-                    B_Dest_Motor_WTP_kW = W_El_WTP_in_kW - P_mec_WTPmotor_kW - B_Motor_WTP_Heat_kW
-                    B_Dest_Motor_WTP_kW = max(0, B_Dest_Motor_WTP_kW)
-
-                # 8. HÉLICE WTP
-            
-                B_Prop_Air_WTP_kW = 0
-                B_Dest_Prop_WTP_kW = 0
-                B_Perda_Dest_WTP_kW = 0 # Inicializa para garantir que sempre tenha um valor
-            
-                if not is_conventional and electric_throttle_WTP > 0 and P_mec_WTPmotor_kW > 0:
-                    # Conforme LaTeX, B_Perda/Dest_WTP é a diferença entre a potência mecânica de entrada e a exergia de tração
-                    B_Perda_Dest_WTP_kW = P_mec_WTPmotor_kW - B_Thrust_Motor_WTP_kW
-                    B_Perda_Dest_WTP_kW = max(0, B_Perda_Dest_WTP_kW)
-                    # Os termos B_Prop_Air_WTP_kW e B_Dest_Prop_WTP_kW não são explicitamente separados no LaTeX para o balanço final
-                    # Portanto, B_Perda_Dest_WTP_kW representa a soma de B_Dest_WTP e B_WTP_Air.
-                    # Para simplificar e seguir o balanço principal do LaTeX:
-                    B_Dest_Prop_WTP_kW = B_Perda_Dest_WTP_kW # Representa a soma de B_Dest_WTP e B_WTP_Air
-                    B_Prop_Air_WTP_kW = 0 # Não é calculado separadamente no balanço principal
-                else:
-                    B_Perda_Dest_WTP_kW = 0
-                    B_Dest_Prop_WTP_kW = 0
-                    B_Prop_Air_WTP_kW = 0
-
-                B_Thrust_Total_kW = B_Thrust_Engine_kW + B_Thrust_Motor_WTP_kW
-
-            # Eficiências exergéticas
-            
-            # Eficiência exergética do motor térmico
-
-            if not is_conventional:
-                eta_ex_prop_SysTermico = B_Thrust_Engine_kW / W_Prop_SysTermico_in_kW if W_Prop_SysTermico_in_kW > 0 else 0
-                eta_ex_bat = W_Bat_Power_kW / B_Quim_Bat_kW if B_Quim_Bat_kW > 0 else 0
-                # eta_ex_inverter já calculado no bloco do inversor
-            
-                # Eficiência exergética do motor MTRB
-                if P_mec_MTRB_kW > 0: # MTRB é motor
-                    eta_ex_motor_MTRB = P_mec_MTRB_kW / W_El_MTRB_in_kW if W_El_MTRB_in_kW > 0 else 0
-                else: # MTRB é gerador
-                    eta_ex_motor_MTRB = abs(W_El_MTRB_out_kW) / abs(P_mec_MTRB_kW) if P_mec_MTRB_kW != 0 else 0
-
-                eta_ex_motor_WTP = P_mec_WTPmotor_kW / W_El_WTP_in_kW if W_El_WTP_in_kW > 0 else 0
-                eta_ex_prop_WTP = B_Thrust_Motor_WTP_kW / P_mec_WTPmotor_kW if P_mec_WTPmotor_kW > 0 else 0
-
-                # Eficiência exergética total do sistema
-                # A eficiência exergética total é a exergia útil (tração total) dividida pela exergia de entrada (combustível + química da bateria)
-                # Se o sistema for convencional, a entrada da bateria é zero.
-                eta_ex_engine = (W_Mec_Engine_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW) / (B_Fuel_kW + B_Air_kW) if (B_Fuel_kW + B_Air_kW) > 0 else 0
-            
-                eta_ex_gearbox = W_Gearbox_out_kW / W_Entrada_CT_kW if W_Entrada_CT_kW > 0 else 0
-                
-                total_exergy_input_kW = B_Fuel_kW + B_Air_kW + B_Quim_Bat_kW 
-                B_Thrust_Total_kW = B_Thrust_Engine_kW + B_Thrust_Motor_WTP_kW 
-                eta_ex_total = (B_Thrust_Total_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW) / total_exergy_input_kW if total_exergy_input_kW > 0 else 0
-            else:
-                eta_ex_engine = (W_Mec_Engine_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW) / (B_Fuel_kW + B_Air_kW) if (B_Fuel_kW + B_Air_kW) > 0 else 0
-            
-                eta_ex_gearbox = W_Gearbox_out_kW / W_Entrada_CT_kW if W_Entrada_CT_kW > 0 else 0
-                
-                total_exergy_input_kW = B_Fuel_kW + B_Air_kW
-                B_Thrust_Total_kW = B_Thrust_Engine_kW
-                eta_ex_total = (B_Thrust_Total_kW + W_Mec_Hydraulic_kW + W_Electric_kW_aux_engine + B_Bleed_kW) / total_exergy_input_kW if total_exergy_input_kW > 0 else 0
-
-            results_row = {
-                'segment': row.get('segment'),
-                'time': row.get('time'),
-                'altitude_m': row.get('altitude_m'),
-                'mach_number': row.get('mach_number'),
-                'velocity_m_s': row.get('velocity_m_s'),
-                'pressure_Pa': row.get('pressure_Pa'),
-                'temperature_C': row.get('temperature_C'),
-                'mdot_fuel_kg_s': mdot_fuel_kg_s,
-                'mdot_air_kg_s': mdot_air_kg_s,
-                'AFR_esteq': AFR_esteq_val,
-                'AFR_real_adjusted': AFR_real_adjusted_val,
-                'excesso_ar': excesso_ar,
-                'phi': phi_val,
-                'B_Fuel_kW': B_Fuel_kW,
-                'B_Air_kW': B_Air_kW,
-                'W_Mec_Engine_kW': W_Mec_Engine_kW,
-                'W_Mec_Hydraulic_kW': W_Mec_Hydraulic_kW,
-                'W_Electric_kW_aux_engine': W_Electric_kW_aux_engine,
-                'W_Aux_Engine_kW': W_Aux_Engine_kW,
-                'mdot_bleed_kg_s': mdot_bleed_kg_s,
-                'P_bleed_Pa': P_bleed_Pa,
-                'T_estag_bleed_K': T_estag_bleed_K,
-                'P_estag_bleed_Pa': P_estag_bleed_Pa,
-                'T_bleed_K': T_bleed_K,
-                'B_Bleed_kW': B_Bleed_kW,
-                'B_Perda_Dest_Engine_kW': B_Perda_Dest_Engine_kW,
-                'P_mec_MTRB_kW': P_mec_MTRB_kW,
-                'eta_emotor_MTRB': eta_emotor_MTRB,
-                'W_Entrada_CT_kW': W_Entrada_CT_kW,
-                'W_Gearbox_out_kW': W_Gearbox_out_kW,
-                'B_Perda_Dest_Gearbox_kW': B_Perda_Dest_Gearbox_kW,
-                'W_Prop_SysTermico_in_kW': W_Prop_SysTermico_in_kW,
-                'thrust_turboprop_N': thrust_turboprop_N,
-                'B_Thrust_Engine_kW': B_Thrust_Engine_kW,
-                'B_Perda_Dest_Prop_SysTermico_kW': B_Perda_Dest_Prop_SysTermico_kW,
-                'B_Quim_Bat_kW': B_Quim_Bat_kW,
-                'W_Bat_Power_kW': W_Bat_Power_kW,
-                'Q_Bat_Heat_kW': Q_Bat_Heat_kW,
-                'B_Bat_Heat_kW': B_Bat_Heat_kW,
-                'B_Dest_Bat_kW': B_Dest_Bat_kW,
-                'Ex_inverter_in_kW': Ex_inverter_in_kW,
-                'Ex_inverter_out_kW': Ex_inverter_out_kW,
-                'Q_heat_inverter_kW': Q_heat_inverter_kW,
-                'B_Inverter_Heat_kW': B_Inverter_Heat_kW,
-                'B_Dest_Inverter_kW': B_Dest_Inverter_kW,
-                'eta_ex_inverter': eta_ex_inverter,
-                'W_El_MTRB_in_kW': W_El_MTRB_in_kW,
-                'W_El_MTRB_out_kW': W_El_MTRB_out_kW,
-                'P_loss_Motor_MTRB_kW': P_loss_Motor_MTRB_kW,
-                'B_Motor_MTRB_Heat_kW': B_Motor_MTRB_Heat_kW,
-                'B_Dest_Motor_MTRB_kW': B_Dest_Motor_MTRB_kW,
-                'W_El_WTP_in_kW': W_El_WTP_in_kW,
-                'P_mec_WTPmotor_kW': P_mec_WTPmotor_kW,
-                'P_loss_Motor_WTP_kW': P_loss_Motor_WTP_kW,
-                'B_Motor_WTP_Heat_kW': B_Motor_WTP_Heat_kW,
-                'B_Dest_Motor_WTP_kW': B_Dest_Motor_WTP_kW,
-                'B_Thrust_Motor_WTP_kW': B_Thrust_Motor_WTP_kW,
-                'B_Perda_Dest_WTP_kW': B_Perda_Dest_WTP_kW, # Agora representa a soma de B_Dest_WTP e B_WTP_Air
-                'B_Thrust_Total_kW': B_Thrust_Total_kW,
-                'eta_ex_engine': eta_ex_engine,
-                'eta_ex_gearbox': eta_ex_gearbox,
-                'eta_ex_prop_SysTermico': eta_ex_prop_SysTermico,
-                'eta_ex_bat': eta_ex_bat,
-                'eta_ex_motor_MTRB': eta_ex_motor_MTRB,
-                'eta_ex_motor_WTP': eta_ex_motor_WTP,
-                'eta_ex_prop_WTP': eta_ex_prop_WTP,
-                'eta_ex_total': eta_ex_total
-            }
-            results_list_exergy.append(results_row)
-
-        df_results_exergy = pd.DataFrame(results_list_exergy)
-        dfs_results_exergy[hybrid_degree] = df_results_exergy
-
-        output_filename = f"resultados_exergia_{hybrid_degree.replace('%', '')}.csv"
-        df_results_exergy.to_csv(output_filename, sep=";", decimal=",", index=False)
-        print(f"Resultados de exergia para {hybrid_degree} salvos em {output_filename}")
+            return None
 
-    except Exception as e:
-        print(f"Erro ao processar {file_path}: {e}")
+        df_input = preparar_deltas_bateria(df_input, file_path)
 
-print("Análise exergética concluída.")
+        df_results_exergy = calcular_exergia(df_input, hybrid_degree)
 
+        gravados = gravar_resultados(df_results_exergy, base_resultados(hybrid_degree), formato,
+                                     opcoes_csv_exergia, exportar_csv)
+        print(f"Resultados de exergia para {hybrid_degree} salvos em {', '.join(gravados)}")
+        if compacto:
+            # Compactado só depois da gravação: Parquet e Feather não aceitam colunas esparsas
+            df_results_exergy = compactar_missao(df_results_exergy, float32=float32)
+        return df_results_exergy
 
+    except Exception as e:
+        print(f"Erro ao processar {file_path}: {e}")
+        return None
+
+def processar_configuracao_em_blocos(hybrid_degree, file_path, chunksize):
+    """Versão em blocos de processar_configuracao para missões muito longas.
+
+    Lê a planilha em blocos de chunksize linhas, carrega o estado dos deltas da bateria entre
+    os blocos e acrescenta os resultados ao CSV de saída, de modo que a memória fica limitada
+    ao tamanho do bloco. Retorna o resumo da exergia destruída por segmento (integrado bloco a
+    bloco) ou None em caso de erro.
+    """
+    output_filename = arquivo_resultados(hybrid_degree)
+    estado = {}
+    linhas = 0
+    integrais = []
+    ultima_linha = None
+    try:
+        for i, df_bloco in enumerate(ler_missao_em_blocos(file_path, hybrid_degree, chunksize)):
+            df_bloco = preparar_deltas_bateria(df_bloco, file_path, estado)
+            df_results_bloco = calcular_exergia(df_bloco, hybrid_degree)
+            df_results_bloco.to_csv(output_filename, sep=";", decimal=",", index=False,
+                                    mode='w' if i == 0 else 'a', header=(i == 0))
+            integrais.append(integrar_por_segmento(df_results_bloco, ultima_linha))
+            ultima_linha = df_results_bloco.iloc[[-1]]
+            linhas += len(df_results_bloco)
+
+        if linhas == 0:
+            print(f"Aviso: Arquivo {file_path} está vazio. Pulando...")
+            return None
+        print(f"Resultados de exergia para {hybrid_degree} salvos em {output_filename} ({linhas} linhas, em blocos de {chunksize})")
+        return montar_resumo(somar_integrais(integrais), hybrid_degree)
+
+    except Exception as e:
+        print(f"Erro ao processar {file_path}: {e}")
+        return None
+
+def executar_analise(files=files, workers=1, chunksize=None, formato='csv', exportar_csv=False,
+                     compacto=False, float32=False, usar_cache=True):
+    """Análise exergética das configurações de files ({rótulo: planilha}); imprime e retorna o resumo.
+
+    Retorna (resultados por configuração, tabela de resumo); com chunksize os resultados ficam apenas no CSV.
+    """
+    dfs_results_exergy = {}
+    preparar_equilibrio()
+    if chunksize:
+        resumos = executar_configuracoes(partial(processar_configuracao_em_blocos, chunksize=chunksize), files, workers=workers)
+    else:
+        dfs_results_exergy = executar_com_cache('exergia', partial(processar_configuracao, formato=formato, exportar_csv=exportar_csv,
+                                                                   compacto=compacto, float32=float32),
+                                                files, partial(chave_configuracao, float32=float32),
+                                                partial(arquivos_saida, formato=formato, exportar_csv=exportar_csv),
+                                                workers=workers, usar_cache=usar_cache)
+        if compacto:
+            dfs_results_exergy = {hybrid_degree: compactar_missao(df, float32=float32)
+                                  for hybrid_degree, df in dfs_results_exergy.items()}
+        resumos = {hybrid_degree: resumir_destruicao(df, hybrid_degree) for hybrid_degree, df in dfs_results_exergy.items()}
+
+    resumo = resumir_configuracoes(resumos) if resumos else None
+    print("Análise exergética concluída.")
+    return dfs_results_exergy, resumo
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Análise exergética das missões do SUAVE.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de processos para processar as configurações em paralelo (padrão: 1, execução serial).')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Processa cada planilha em blocos com este número de linhas, gravando os resultados incrementalmente.')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Recalcula todas as configurações, sem consultar o cache de resultados (.cache_resultados/).')
+    parser.add_argument('--formato', choices=formatos, default='csv',
+                        help='Formato de resultados_exergia_*: csv (padrão) ou colunar (npz; parquet e feather exigem pyarrow).')
+    parser.add_argument('--exportar-csv', action='store_true',
+                        help='Com --formato colunar, grava também o CSV (separador ";" e decimal ",").')
+    parser.add_argument('--compacto', action='store_true',
+                        help='Carrega apenas as colunas usadas e mantém os resultados com colunas nulas esparsas (reduz a memória com missões longas).')
+    parser.add_argument('--float32', action='store_true',
+                        help='Com --compacto, guarda entradas e resultados em float32 (exceto tempo e energia da bateria).')
+    perfil_execucao.adicionar_argumentos(parser)
+    args = parser.parse_args()
+    perfil_execucao.iniciar(args)
+    verificar_formato(args.formato)
+    if args.chunksize and args.formato != 'csv':
+        parser.error('--chunksize grava os resultados apenas em CSV.')
+    if args.float32 and not args.compacto:
+        parser.error('--float32 requer --compacto.')
+
+    executar_analise(files, args.workers, args.chunksize, args.formato, args.exportar_csv,
+                     args.compacto, args.float32, usar_cache=not args.sem_cache)
+    perfil_execucao.concluir(args)
@@ -0,0 +1,121 @@
+import argparse
+from functools import partial
+from dados_missao import files, carregar_missao, colunas_energia, colunas_exergia, compactar_missao
+from execucao_paralela import executar_configuracoes
+from graficos import renderizar_grupos, colunas_necessarias
+from arquivos_resultados import formatos, gravar_resultados, verificar_formato, opcoes_csv_exergia
+import analise_energetica
+import analise_exergetica
+from resumo_exergia import resumir_destruicao, resumir_configuracoes
+from plota_exergia import especificacoes_padrao, especificacoes_zoom
+import perfil_execucao
+
+# --- PIPELINE ÚNICO: ENERGIA, EXERGIA E GRÁFICOS ---
+# Cada planilha de missão é lida uma única vez (ou restaurada do cache binário
+# de dados_missao.py); as análises energética e exergética e os gráficos das
+# duas são feitos sobre os dados em memória, sem os CSVs intermediários que
+# plota_exergia.py relê. Gravar as tabelas de resultados e o resumo da exergia
+# destruída é opcional (--salvar).
+
+# Tabelas que podem ser gravadas com --salvar
+saidas = ['energia', 'exergia', 'resumo']
+
+especificacoes_exergia = especificacoes_padrao + especificacoes_zoom
+
+def analisar_configuracao(hybrid_degree, file_path, salvar=(), formato='csv', exportar_csv=False,
+                          usar_cache=True, compacto=False, float32=False):
+    """Lê uma planilha e executa as duas análises; retorna None em caso de erro.
+
+    Retorna um dicionário com 'energia' e 'exergia' (apenas as colunas usadas pelos gráficos e, para a
+    energia, as salvas) e 'resumo' (exergia destruída por segmento). Com salvar contendo 'energia' e/ou
+    'exergia', as tabelas completas são gravadas em <formato>, como nos scripts de cada análise.
+    """
+    try:
+        colunas = colunas_energia + [col for col in colunas_exergia if col not in colunas_energia]
+        df = carregar_missao(file_path, hybrid_degree, usar_cache, compacto=compacto, colunas=colunas, float32=float32)
+        if df.empty:
+            print(f"Aviso: Arquivo {file_path} está vazio. Pulando...")
+            return None
+
+        # A análise energética preenche NaNs em colunas que a exergética também lê: usa uma cópia
+        df_energia = df[[col for col in colunas_energia if col in df.columns]].copy()
+        df_energia = analise_energetica.calcular_energia(df_energia, hybrid_degree, file_path)
+        if 'energia' in salvar:
+            analise_energetica.salvar_resultados({hybrid_degree: df_energia}, formato, exportar_csv)
+
+        df_exergia = analise_exergetica.calcular_exergia(
+            analise_exergetica.preparar_deltas_bateria(df, file_path), hybrid_degree)
+        del df
+        if 'exergia' in salvar:
+            gravados = gravar_resultados(df_exergia, analise_exergetica.base_resultados(hybrid_degree), formato,
+                                         opcoes_csv_exergia, exportar_csv)
+            print(f"Resultados de exergia para {hybrid_degree} salvos em {', '.join(gravados)}")
+
+        resultados = {
+            'energia': df_energia[[col for col in analise_energetica.colunas_resultado if col in df_energia.columns]],
+            'exergia': df_exergia[colunas_necessarias(especificacoes_exergia)],
+            'resumo': resumir_destruicao(df_exergia, hybrid_degree),
+        }
+        if compacto:
+            for tabela in ('energia', 'exergia'):
+                resultados[tabela] = compactar_missao(resultados[tabela], float32=float32)
+        return resultados
+
+    except Exception as e:
+        print(f"Erro ao processar {file_path}: {e}")
+        return None
+
+def executar_pipeline(files=files, workers=1, salvar=(), formato='csv', exportar_csv=False,
+                      graficos=True, usar_cache=True, compacto=False, float32=False):
+    """Executa o pipeline para todas as configurações; retorna (resultados por configuração, tabela de resumo)."""
+    analise_exergetica.preparar_equilibrio()
+    resultados = executar_configuracoes(
+        partial(analisar_configuracao, salvar=salvar, formato=formato, exportar_csv=exportar_csv,
+                usar_cache=usar_cache, compacto=compacto, float32=float32),
+        files, workers=workers)
+    if not resultados:
+        return resultados, None
+
+    resumo = resumir_configuracoes({hybrid_degree: r['resumo'] for hybrid_degree, r in resultados.items()},
+                                   'resumo_exergia.csv' if 'resumo' in salvar else None)
+    if graficos:
+        grupos = [
+            (analise_energetica.especificacoes_graficos, {hybrid_degree: r['energia'] for hybrid_degree, r in resultados.items()}),
+            (especificacoes_exergia, {hybrid_degree: r['exergia'] for hybrid_degree, r in resultados.items()}),
+        ]
+        salvos = renderizar_grupos(grupos, workers=workers, usar_cache=usar_cache)
+        print(f"{len(salvos)} gráficos salvos.")
+    return resultados, resumo
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Análises energética e exergética e gráficos das missões do SUAVE, lendo cada planilha uma única vez.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de processos para as configurações e os gráficos (padrão: 1; 0 = todos os núcleos).')
+    parser.add_argument('--salvar', nargs='*', choices=saidas, default=[],
+                        help='Tabelas gravadas em disco: energia (energy_analysis_results_*), exergia (resultados_exergia_*) '
+                             'e/ou resumo (resumo_exergia.csv). Sem a opção, apenas os gráficos são gravados.')
+    parser.add_argument('--formato', choices=formatos, default='csv',
+                        help='Formato das tabelas gravadas com --salvar (padrão: csv).')
+    parser.add_argument('--exportar-csv', action='store_true',
+                        help='Com --formato colunar, grava também o CSV.')
+    parser.add_argument('--sem-graficos', action='store_true', help='Não gera os gráficos.')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Relê as planilhas e redesenha os gráficos, sem consultar os caches.')
+    parser.add_argument('--compacto', action='store_true',
+                        help='Carrega apenas as colunas usadas, na representação compacta (ver dados_missao.compactar_missao).')
+    parser.add_argument('--float32', action='store_true', help='Com --compacto, guarda as colunas em float32.')
+    perfil_execucao.adicionar_argumentos(parser)
+    args = parser.parse_args()
+    verificar_formato(args.formato)
+    if args.float32 and not args.compacto:
+        parser.error('--float32 requer --compacto.')
+    perfil_execucao.iniciar(args)
+
+    resultados, resumo = executar_pipeline(files, args.workers, args.salvar, args.formato, args.exportar_csv,
+                                           graficos=not args.sem_graficos, usar_cache=not args.sem_cache,
+                                           compacto=args.compacto, float32=args.float32)
+    if resumo is not None:
+        print(resumo.loc[resumo['segment'] == 'missao', ['configuracao', 'B_Dest_Total_MJ', 'eta_ex']].to_string(index=False))
+    print("Pipeline concluído.")
+    perfil_execucao.concluir(args)
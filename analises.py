@@ -0,0 +1,162 @@
+import os
+import re
+import glob
+import argparse
+import perfil_execucao
+
+# --- LINHA DE COMANDO ÚNICA DAS ANÁLISES ---
+# python analises.py energia|exergia|graficos|tudo [ENTRADAS...] [opções]
+#   energia   análise energética e seus gráficos (analise_energetica.py)
+#   exergia   análise exergética e resumo da exergia destruída (analise_exergetica.py)
+#   graficos  gráficos das eficiências exergéticas a partir dos resultados gravados (plota_exergia.py)
+#   tudo      pipeline único: energia, exergia e todos os gráficos (analise_missao.py)
+# As entradas são caminhos ou padrões glob, opcionalmente com o rótulo da
+# configuração (ROTULO=PADRAO, por exemplo 30%=missoes/longa.csv); sem rótulo,
+# ele é deduzido do nome do arquivo (resultados_suave_15.csv -> 15%,
+# *_convencional.csv -> Convencional). Sem entradas, são usadas as planilhas
+# de dados_missao.files (ou, em graficos, as de plota_exergia.files_to_plot).
+# Este módulo importa apenas a biblioteca padrão: pandas, matplotlib, scipy e
+# o Cantera só são carregados pelo subcomando que os usa, de modo que --help e
+# erros de uso respondem imediatamente.
+
+def rotulo_configuracao(caminho):
+    """Rótulo da configuração deduzido do nome do arquivo: '15%', 'Convencional' ou o próprio nome."""
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    partes = nome.split('_')
+    if any(parte.lower() == 'convencional' for parte in partes):
+        return 'Convencional'
+    for parte in partes:
+        if re.fullmatch(r'\d{1,3}', parte) and int(parte) <= 100:
+            return f'{int(parte)}%'
+    return nome
+
+def resolver_entradas(entradas, padrao):
+    """{rótulo: arquivo} a partir das entradas (ROTULO=PADRAO ou PADRAO); padrao se não houver entradas."""
+    if not entradas:
+        return dict(padrao)
+    configuracoes = {}
+    for entrada in entradas:
+        rotulo, separador, padrao_glob = entrada.partition('=')
+        if not separador:
+            rotulo, padrao_glob = '', entrada
+        arquivos = sorted(glob.glob(padrao_glob)) or ([padrao_glob] if os.path.exists(padrao_glob) else [])
+        if not arquivos:
+            raise ValueError(f"nenhum arquivo corresponde a '{padrao_glob}'")
+        if rotulo and len(arquivos) > 1:
+            raise ValueError(f"o rótulo '{rotulo}' corresponde a {len(arquivos)} arquivos ({padrao_glob})")
+        for arquivo in arquivos:
+            rotulo_arquivo = rotulo or rotulo_configuracao(arquivo)
+            if rotulo_arquivo in configuracoes:
+                raise ValueError(f"rótulo repetido: '{rotulo_arquivo}' ({configuracoes[rotulo_arquivo]} e {arquivo}); "
+                                 f"use ROTULO=ARQUIVO")
+            configuracoes[rotulo_arquivo] = arquivo
+    return configuracoes
+
+def _verificar_opcoes(parser, args):
+    from arquivos_resultados import verificar_formato
+    try:
+        verificar_formato(args.formato)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    if getattr(args, 'chunksize', None) and args.formato != 'csv':
+        parser.error('--chunksize grava os resultados apenas em CSV.')
+    if args.float32 and not args.compacto:
+        parser.error('--float32 requer --compacto.')
+
+def comando_energia(parser, args):
+    from dados_missao import files
+    _verificar_opcoes(parser, args)
+    import analise_energetica
+    analise_energetica.executar_analise(resolver_entradas(args.entradas, files), args.workers, args.chunksize,
+                                        args.formato, args.exportar_csv, args.compacto, args.float32,
+                                        usar_cache=not args.sem_cache, graficos=not args.sem_graficos)
+
+def comando_exergia(parser, args):
+    from dados_missao import files
+    _verificar_opcoes(parser, args)
+    import analise_exergetica
+    analise_exergetica.executar_analise(resolver_entradas(args.entradas, files), args.workers, args.chunksize,
+                                        args.formato, args.exportar_csv, args.compacto, args.float32,
+                                        usar_cache=not args.sem_cache)
+
+def comando_graficos(parser, args):
+    import plota_exergia
+    arquivos = resolver_entradas(args.entradas, {}) if args.entradas else plota_exergia.files_to_plot
+    if not plota_exergia.executar_graficos(arquivos, args.workers, usar_cache=not args.sem_cache,
+                                           suavizacao=plota_exergia.opcao_suavizacao(args)):
+        raise SystemExit(1)
+
+def comando_tudo(parser, args):
+    from dados_missao import files
+    _verificar_opcoes(parser, args)
+    import analise_missao
+    _, resumo = analise_missao.executar_pipeline(resolver_entradas(args.entradas, files), args.workers, args.salvar,
+                                                 args.formato, args.exportar_csv, graficos=not args.sem_graficos,
+                                                 usar_cache=not args.sem_cache, compacto=args.compacto,
+                                                 float32=args.float32)
+    if resumo is not None:
+        print(resumo.loc[resumo['segment'] == 'missao', ['configuracao', 'B_Dest_Total_MJ', 'eta_ex']].to_string(index=False))
+    print("Pipeline concluído.")
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description='Análises energética e exergética das missões do SUAVE e seus gráficos.')
+    subcomandos = parser.add_subparsers(dest='comando', required=True, metavar='{energia,exergia,graficos,tudo}')
+
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument('entradas', nargs='*', metavar='[ROTULO=]ARQUIVO',
+                       help='Planilhas (caminhos ou padrões glob, entre aspas), opcionalmente com o rótulo da configuração. '
+                            'Sem rótulo, ele é deduzido do nome do arquivo (_15 -> 15%%, _convencional -> Convencional).')
+    comum.add_argument('--workers', type=int, default=1, help='Número de processos (padrão: 1; 0 = todos os núcleos).')
+    comum.add_argument('--sem-cache', action='store_true', help='Recalcula e redesenha tudo, sem consultar os caches.')
+    perfil_execucao.adicionar_argumentos(comum)
+
+    saida = argparse.ArgumentParser(add_help=False)
+    saida.add_argument('--formato', default='csv',
+                       help='Formato das tabelas gravadas: csv (padrão), npz, parquet ou feather (os dois últimos exigem pyarrow).')
+    saida.add_argument('--exportar-csv', action='store_true', help='Com --formato colunar, grava também o CSV.')
+    saida.add_argument('--compacto', action='store_true',
+                       help='Mantém em memória apenas as colunas usadas, com colunas nulas esparsas.')
+    saida.add_argument('--float32', action='store_true', help='Com --compacto, guarda as colunas em float32.')
+
+    energia = subcomandos.add_parser('energia', aliases=['energy'], parents=[comum, saida],
+                                     help='Análise energética e seus gráficos.')
+    energia.add_argument('--chunksize', type=int, default=None,
+                         help='Processa cada planilha em blocos com este número de linhas (sem os gráficos).')
+    energia.add_argument('--sem-graficos', action='store_true', help='Não gera os gráficos.')
+    energia.set_defaults(executar=comando_energia)
+
+    exergia = subcomandos.add_parser('exergia', aliases=['exergy'], parents=[comum, saida],
+                                     help='Análise exergética e resumo da exergia destruída.')
+    exergia.add_argument('--chunksize', type=int, default=None,
+                         help='Processa cada planilha em blocos com este número de linhas.')
+    exergia.set_defaults(executar=comando_exergia)
+
+    graficos = subcomandos.add_parser('graficos', aliases=['plot'], parents=[comum],
+                                      help='Gráficos das eficiências exergéticas a partir dos resultados gravados '
+                                           '(entradas: resultados_exergia_*).')
+    graficos.add_argument('--suavizar', type=int, nargs=2, default=None, metavar=('JANELA', 'ORDEM'),
+                          help='Suaviza as séries com o filtro Savitzky-Golay (ex.: --suavizar 51 3).')
+    graficos.add_argument('--suavizar-causal', action='store_true',
+                          help='Com --suavizar, usa o filtro causal (apenas amostras atuais e anteriores).')
+    graficos.set_defaults(executar=comando_graficos)
+
+    tudo = subcomandos.add_parser('tudo', aliases=['all'], parents=[comum, saida],
+                                  help='Energia, exergia e todos os gráficos, lendo cada planilha uma única vez.')
+    tudo.add_argument('--salvar', nargs='*', choices=['energia', 'exergia', 'resumo'], default=[],
+                      help='Tabelas gravadas em disco (sem a opção, apenas os gráficos).')
+    tudo.add_argument('--sem-graficos', action='store_true', help='Não gera os gráficos.')
+    tudo.set_defaults(executar=comando_tudo)
+    return parser
+
+
+if __name__ == '__main__':
+    parser = criar_parser()
+    args = parser.parse_args()
+    try:
+        # Entradas inválidas são apontadas antes de carregar qualquer biblioteca pesada
+        resolver_entradas(args.entradas, {})
+    except ValueError as e:
+        parser.error(str(e))
+    perfil_execucao.iniciar(args)
+    args.executar(parser, args)
+    perfil_execucao.concluir(args)
@@ -0,0 +1,96 @@
+import os
+import argparse
+import pandas as pd
+from dados_missao import gravar_tabela_npz, ler_tabela_npz
+import perfil_execucao
+
+# --- FORMATOS DE SAÍDA DOS RESULTADOS ---
+# Os resultados das análises podem ser gravados em CSV (formato original) ou em
+# formatos colunares binários: .npz (apenas numpy), Parquet ou Feather (estes
+# dois exigem o pacote pyarrow). Nos formatos colunares a leitura carrega apenas
+# as colunas pedidas, sem converter texto. O CSV continua disponível como
+# exportação (--exportar-csv nos scripts ou este módulo pela linha de comando).
+
+formatos = ['csv', 'npz', 'parquet', 'feather']
+
+# Opções de CSV de cada tipo de resultado
+opcoes_csv_exergia = {'sep': ';', 'decimal': ','}
+opcoes_csv_energia = {'sep': ',', 'decimal': '.'}
+
+def verificar_formato(formato):
+    """Valida o formato e a disponibilidade do pyarrow para Parquet/Feather."""
+    if formato not in formatos:
+        raise ValueError(f"Formato desconhecido: {formato}. Opções: {', '.join(formatos)}")
+    if formato in ('parquet', 'feather'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(f"O formato {formato} requer o pacote pyarrow (pip install pyarrow); use 'npz' ou 'csv'.")
+
+def caminho_resultados(base, formato):
+    return f"{base}.{formato}"
+
+def gravar_resultados(df, base, formato='csv', opcoes_csv=opcoes_csv_exergia, exportar_csv=False):
+    """Grava df em base.<formato> (e também em base.csv com exportar_csv=True); retorna os arquivos gravados."""
+    verificar_formato(formato)
+    arquivo = caminho_resultados(base, formato)
+    with perfil_execucao.etapa(f'gravacao_{formato}', linhas=len(df)):
+        if formato == 'csv':
+            df.to_csv(arquivo, index=False, **opcoes_csv)
+        elif formato == 'npz':
+            gravar_tabela_npz(df, arquivo)
+        elif formato == 'parquet':
+            df.to_parquet(arquivo, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(arquivo)
+    arquivos = [arquivo]
+    if exportar_csv and formato != 'csv':
+        arquivos += gravar_resultados(df, base, 'csv', opcoes_csv)
+    return arquivos
+
+def localizar_resultados(base):
+    """Arquivo de resultados mais recente entre os formatos existentes para base (None se não houver)."""
+    existentes = [caminho_resultados(base, formato) for formato in formatos
+                  if os.path.exists(caminho_resultados(base, formato))]
+    if not existentes:
+        return None
+    return max(existentes, key=os.path.getmtime)
+
+def ler_resultados(arquivo, colunas=None, opcoes_csv=opcoes_csv_exergia):
+    """Lê um arquivo de resultados em qualquer dos formatos, carregando apenas colunas (se informado).
+
+    Colunas pedidas que não existem no arquivo são ignoradas.
+    """
+    formato = os.path.splitext(arquivo)[1].lstrip('.')
+    verificar_formato(formato)
+    if formato == 'csv':
+        usecols = None if colunas is None else (lambda coluna: coluna in colunas)
+        return pd.read_csv(arquivo, usecols=usecols, **opcoes_csv)
+    if formato == 'npz':
+        return ler_tabela_npz(arquivo, colunas)
+    if formato == 'parquet':
+        import pyarrow.parquet as pq
+        if colunas is not None:
+            disponiveis = pq.read_schema(arquivo).names
+            colunas = [coluna for coluna in colunas if coluna in disponiveis]
+        return pd.read_parquet(arquivo, columns=colunas)
+    import pyarrow.ipc
+    if colunas is not None:
+        disponiveis = pyarrow.ipc.open_file(arquivo).schema.names
+        colunas = [coluna for coluna in colunas if coluna in disponiveis]
+    return pd.read_feather(arquivo, columns=colunas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte arquivos de resultados entre CSV, npz, Parquet e Feather.')
+    parser.add_argument('arquivos', nargs='+', help='Arquivos de resultados a converter.')
+    parser.add_argument('--para', choices=formatos, default='csv', help='Formato de destino (padrão: csv).')
+    parser.add_argument('--energia', action='store_true',
+                        help="Usa o CSV da análise energética (separador ',' e decimal '.') em vez do da exergética (';' e ',').")
+    args = parser.parse_args()
+
+    opcoes_csv = opcoes_csv_energia if args.energia else opcoes_csv_exergia
+    for arquivo in args.arquivos:
+        base = os.path.splitext(arquivo)[0]
+        gravados = gravar_resultados(ler_resultados(arquivo, opcoes_csv=opcoes_csv), base, args.para, opcoes_csv)
+        print(f"{arquivo} -> {gravados[0]}")
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import logging
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+import pandas as pd
+import dados_missao
+from dados_missao import carregar_missao
+from missao_sintetica import escrever_missao_sintetica
+from arquivos_resultados import formatos, gravar_resultados, opcoes_csv_exergia, opcoes_csv_energia
+
+# --- BENCHMARK DAS ANÁLISES ENERGÉTICA E EXERGÉTICA ---
+# Gera missões sintéticas (missao_sintetica.py) de 10^3 a 10^7 linhas e mede,
+# separadamente, as etapas de leitura, cálculo, gravação e gráficos para uma
+# configuração híbrida e para a convencional: tempo (melhor de N repetições),
+# linhas por segundo e pico de memória alocada (tracemalloc, em uma execução
+# separada para não distorcer os tempos). Os resultados podem ser salvos como
+# baseline e comparados em execuções futuras para detectar regressões.
+
+diretorio_benchmark = '.benchmark'
+arquivo_baseline = os.path.join(diretorio_benchmark, 'baseline.json')
+
+tamanhos_padrao = [10**3, 10**4, 10**5]
+configuracoes_padrao = ['15%', 'Convencional']
+
+def _arquivo_missao(n_linhas, hybrid_degree, seed):
+    """Missão sintética em .benchmark/missoes/, gerada apenas na primeira vez."""
+    pasta = os.path.join(diretorio_benchmark, 'missoes')
+    os.makedirs(pasta, exist_ok=True)
+    file_path = os.path.join(pasta, f"suave_{hybrid_degree.replace('%', '')}_{n_linhas}_{seed}.csv")
+    if not os.path.exists(file_path):
+        print(f"Gerando missão sintética {file_path}...")
+        escrever_missao_sintetica(file_path + '.tmp', n_linhas, hybrid_degree, seed)
+        os.replace(file_path + '.tmp', file_path)
+    return file_path
+
+def _etapas(file_path, hybrid_degree, saida, formato='csv'):
+    """Etapas medidas, em ordem: (nome, função). Cada função recebe e atualiza o contexto."""
+    # Importados aqui para que os avisos e logs dos scripts não poluam o relatório
+    from analise_exergetica import preparar_deltas_bateria, calcular_exergia
+    from analise_energetica import calcular_energia, output_cols, especificacoes_graficos
+    from plota_exergia import especificacoes_padrao
+    from graficos import renderizar_graficos
+
+    sufixo = hybrid_degree.replace('%', '')
+    em_saida = lambda specs: [dict(spec, arquivo=os.path.join(saida, spec['arquivo'])) for spec in specs]
+
+    def leitura_csv(ctx):
+        ctx['df'] = carregar_missao(file_path, hybrid_degree, usar_cache=False)
+
+    def leitura_cache(ctx):
+        carregar_missao(file_path, hybrid_degree)
+
+    def exergia_calculo(ctx):
+        ctx['exergia'] = calcular_exergia(preparar_deltas_bateria(ctx['df'].copy(), file_path), hybrid_degree)
+
+    def exergia_gravacao(ctx):
+        gravar_resultados(ctx['exergia'], os.path.join(saida, f"resultados_exergia_{sufixo}"), formato, opcoes_csv_exergia)
+
+    def energia_calculo(ctx):
+        ctx['energia'] = calcular_energia(ctx['df'].copy(), hybrid_degree, file_path)
+
+    def energia_gravacao(ctx):
+        gravar_resultados(ctx['energia'][output_cols], os.path.join(saida, f"energy_analysis_results_{sufixo}"), formato, opcoes_csv_energia)
+
+    def exergia_graficos(ctx):
+        renderizar_graficos(em_saida(especificacoes_padrao), {hybrid_degree: ctx['exergia']})
+
+    def energia_graficos(ctx):
+        renderizar_graficos(em_saida(especificacoes_graficos), {hybrid_degree: ctx['energia']})
+
+    return [
+        ('leitura_csv', leitura_csv), ('leitura_cache', leitura_cache),
+        ('exergia_calculo', exergia_calculo), ('exergia_gravacao', exergia_gravacao),
+        ('energia_calculo', energia_calculo), ('energia_gravacao', energia_gravacao),
+        ('exergia_graficos', exergia_graficos), ('energia_graficos', energia_graficos),
+    ]
+
+def medir_configuracao(n_linhas, hybrid_degree, repeticoes=3, seed=0, etapas=None, memoria=True, formato='csv'):
+    """Mede todas as etapas para uma missão sintética; retorna uma lista de registros (dicionários)."""
+    file_path = _arquivo_missao(n_linhas, hybrid_degree, seed)
+    saida = os.path.join(diretorio_benchmark, 'saida')
+    os.makedirs(saida, exist_ok=True)
+    carregar_missao(file_path, hybrid_degree)  # aquece o cache binário usado em leitura_cache
+
+    registros = []
+    ctx = {}
+    for nome, funcao in _etapas(file_path, hybrid_degree, saida, formato):
+        if etapas and nome not in etapas:
+            # Etapas não selecionadas que produzem dados para as seguintes são executadas sem medição
+            if nome in ('leitura_csv', 'exergia_calculo', 'energia_calculo'):
+                funcao(ctx)
+            continue
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao(ctx)
+            tempos.append(time.perf_counter() - inicio)
+        pico_MB = np.nan
+        if memoria:
+            tracemalloc.start()
+            funcao(ctx)
+            pico_MB = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        tempo = min(tempos)
+        registros.append({
+            'linhas': n_linhas, 'configuracao': hybrid_degree, 'etapa': nome,
+            'tempo_s': tempo, 'linhas_por_s': n_linhas / tempo if tempo > 0 else np.inf, 'pico_memoria_MB': pico_MB,
+        })
+        print(f"  {hybrid_degree:>12} {n_linhas:>9} {nome:<18} {tempo:9.4f} s  {pico_MB:9.1f} MB")
+    return registros
+
+def executar_benchmark(tamanhos=tamanhos_padrao, configuracoes=configuracoes_padrao, **kwargs):
+    """Executa o benchmark para todos os tamanhos e configurações; retorna um DataFrame."""
+    registros = []
+    for n_linhas in tamanhos:
+        for hybrid_degree in configuracoes:
+            registros.extend(medir_configuracao(n_linhas, hybrid_degree, **kwargs))
+    return pd.DataFrame(registros)
+
+def salvar_baseline(resultados, caminho=arquivo_baseline):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w') as f:
+        json.dump({'maquina': platform.node(), 'python': platform.python_version(),
+                   'numpy': np.__version__, 'pandas': pd.__version__,
+                   'resultados': resultados.to_dict(orient='records')}, f, indent=1)
+    print(f"Baseline salvo em {caminho}")
+
+def comparar_baseline(resultados, caminho=arquivo_baseline, tolerancia=0.2):
+    """Acrescenta a razão tempo atual / baseline e marca as etapas mais lentas que 1 + tolerancia."""
+    with open(caminho) as f:
+        baseline = pd.DataFrame(json.load(f)['resultados'])
+    chave = ['linhas', 'configuracao', 'etapa']
+    comparacao = resultados.merge(baseline[chave + ['tempo_s']].rename(columns={'tempo_s': 'tempo_baseline_s'}),
+                                  on=chave, how='left')
+    comparacao['razao'] = comparacao['tempo_s'] / comparacao['tempo_baseline_s']
+    comparacao['regressao'] = comparacao['razao'] > 1 + tolerancia
+    return comparacao
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark das análises energética e exergética com missões sintéticas.')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=tamanhos_padrao,
+                        help='Números de linhas das missões sintéticas (padrão: 1000 10000 100000; até 10^7).')
+    parser.add_argument('--configuracoes', nargs='+', default=configuracoes_padrao)
+    parser.add_argument('--etapas', nargs='+', default=None, help='Mede apenas estas etapas (leitura_csv, leitura_cache, exergia_calculo, exergia_gravacao, energia_calculo, energia_gravacao, exergia_graficos, energia_graficos).')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições por etapa (é registrado o menor tempo).')
+    parser.add_argument('--formato', choices=formatos, default='csv', help='Formato dos resultados nas etapas de gravação.')
+    parser.add_argument('--sem-memoria', action='store_true', help='Não mede o pico de memória (tracemalloc).')
+    parser.add_argument('--salvar-baseline', action='store_true', help=f'Salva os resultados em {arquivo_baseline}.')
+    parser.add_argument('--comparar', action='store_true', help='Compara com o baseline salvo e falha se houver regressões.')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento relativo de tempo considerado regressão (padrão: 0.2).')
+    parser.add_argument('--saida', default='benchmark_resultados.csv', help='CSV com os resultados desta execução.')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    dados_missao.cache_dir = os.path.join(diretorio_benchmark, 'cache_missoes')
+
+    resultados = executar_benchmark(args.tamanhos, args.configuracoes, repeticoes=args.repeticoes,
+                                    etapas=args.etapas, memoria=not args.sem_memoria, formato=args.formato)
+    resultados.to_csv(args.saida, index=False)
+    print(f"\nResultados salvos em {args.saida}")
+
+    codigo_saida = 0
+    if args.comparar:
+        comparacao = comparar_baseline(resultados, tolerancia=args.tolerancia)
+        print(comparacao[['linhas', 'configuracao', 'etapa', 'tempo_s', 'tempo_baseline_s', 'razao', 'regressao']].to_string(index=False))
+        if comparacao['regressao'].any():
+            print(f"\nREGRESSÃO: {int(comparacao['regressao'].sum())} etapa(s) mais de {args.tolerancia:.0%} mais lenta(s) que o baseline.")
+            codigo_saida = 1
+    if args.salvar_baseline:
+        salvar_baseline(resultados)
+    raise SystemExit(codigo_saida)
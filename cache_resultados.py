@@ -0,0 +1,151 @@
+import os
+import json
+import shutil
+import hashlib
+import importlib.util
+from dados_missao import hash_arquivo, gravar_tabela_npz, ler_tabela_npz
+from execucao_paralela import executar_configuracoes
+
+# --- CACHE DE RESULTADOS ENDEREÇADO POR CONTEÚDO ---
+# Cada resultado (a análise de uma configuração ou uma figura) é guardado em
+# .cache_resultados/<chave>/, em que a chave é o hash das entradas (conteúdo
+# das planilhas), das constantes do modelo e da versão do código (hash dos
+# arquivos .py envolvidos). Se nada mudou, os arquivos de saída são copiados
+# do cache em vez de recalculados. O diretório tem tamanho limitado: ao
+# ultrapassar limite_cache_mb, as entradas usadas há mais tempo são removidas.
+
+cache_dir = '.cache_resultados'
+
+# Tamanho máximo do diretório do cache
+limite_cache_mb = 1024
+
+# Nome da tabela (DataFrame) guardada junto com os arquivos de saída
+_arquivo_tabela = 'tabela.npz'
+_arquivo_manifesto = 'manifesto.json'
+
+def versao_codigo(*modulos):
+    """Hash do código-fonte dos módulos (pelo nome, ex.: 'dados_missao') dos quais o resultado depende."""
+    sha = hashlib.sha1()
+    for modulo in modulos:
+        sha.update(hash_arquivo(importlib.util.find_spec(modulo).origin).encode())
+    return sha.hexdigest()
+
+def calcular_chave(*partes):
+    """Chave do cache a partir de partes serializáveis em JSON (hashes, parâmetros, rótulos)."""
+    texto = json.dumps(partes, sort_keys=True, default=str)
+    return hashlib.sha1(texto.encode()).hexdigest()[:24]
+
+def _entrada(chave):
+    return os.path.join(cache_dir, chave)
+
+def restaurar(chave, arquivos=()):
+    """Copia os arquivos de saída guardados sob chave para o diretório atual.
+
+    Retorna False se a entrada não existir ou estiver incompleta.
+    """
+    entrada = _entrada(chave)
+    manifesto = os.path.join(entrada, _arquivo_manifesto)
+    if not os.path.exists(manifesto):
+        return False
+    if not all(os.path.exists(os.path.join(entrada, os.path.basename(a))) for a in arquivos):
+        return False
+    for arquivo in arquivos:
+        shutil.copyfile(os.path.join(entrada, os.path.basename(arquivo)), arquivo)
+    # Marca a entrada como usada recentemente (política de remoção LRU)
+    os.utime(manifesto)
+    return True
+
+def ler_tabela(chave):
+    """Lê o DataFrame guardado sob chave."""
+    return ler_tabela_npz(os.path.join(_entrada(chave), _arquivo_tabela))
+
+def armazenar(chave, arquivos=(), tabela=None, descricao=''):
+    """Guarda os arquivos de saída (e opcionalmente um DataFrame) sob chave."""
+    entrada = _entrada(chave)
+    temporario = f"{entrada}.{os.getpid()}.tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    for arquivo in arquivos:
+        shutil.copyfile(arquivo, os.path.join(temporario, os.path.basename(arquivo)))
+    if tabela is not None:
+        gravar_tabela_npz(tabela, os.path.join(temporario, _arquivo_tabela))
+    with open(os.path.join(temporario, _arquivo_manifesto), 'w') as f:
+        json.dump({'descricao': descricao, 'arquivos': [os.path.basename(a) for a in arquivos],
+                   'tabela': tabela is not None}, f)
+    shutil.rmtree(entrada, ignore_errors=True)
+    os.replace(temporario, entrada)
+
+def _tamanho(caminho):
+    total = 0
+    for raiz, _, nomes in os.walk(caminho):
+        total += sum(os.path.getsize(os.path.join(raiz, nome)) for nome in nomes)
+    return total
+
+def limitar_cache(limite_mb=None):
+    """Remove as entradas usadas há mais tempo até o cache caber em limite_mb; retorna quantas foram removidas."""
+    limite = (limite_cache_mb if limite_mb is None else limite_mb) * 1024 * 1024
+    if not os.path.isdir(cache_dir):
+        return 0
+    entradas = []
+    for nome in os.listdir(cache_dir):
+        manifesto = os.path.join(cache_dir, nome, _arquivo_manifesto)
+        if os.path.exists(manifesto):
+            entradas.append((os.path.getmtime(manifesto), os.path.join(cache_dir, nome)))
+    entradas.sort()
+    tamanhos = {caminho: _tamanho(caminho) for _, caminho in entradas}
+    total = sum(tamanhos.values())
+    removidas = 0
+    for _, caminho in entradas:
+        if total <= limite:
+            break
+        shutil.rmtree(caminho, ignore_errors=True)
+        total -= tamanhos[caminho]
+        removidas += 1
+    return removidas
+
+def imprimir_relatorio(etapa, reaproveitados, recalculados, removidas=0):
+    """Resumo do uso do cache em uma etapa."""
+    print(f"Cache ({etapa}): {len(reaproveitados)} reaproveitado(s) {list(reaproveitados)}, "
+          f"{len(recalculados)} recalculado(s) {list(recalculados)}"
+          + (f", {removidas} entrada(s) antiga(s) removida(s)" if removidas else ''))
+
+def executar_com_cache(etapa, funcao, files, chave, arquivos_saida, workers=1, usar_cache=True):
+    """Executa funcao(hybrid_degree, file_path) apenas para as configurações cuja chave mudou.
+
+    chave(hybrid_degree, file_path) calcula a chave de uma configuração e arquivos_saida(hybrid_degree)
+    lista os arquivos que funcao grava. funcao deve retornar um DataFrame (ou None em caso de erro),
+    que é guardado junto com os arquivos. Retorna os DataFrames na ordem de files, como
+    executar_configuracoes.
+    """
+    if not usar_cache:
+        return executar_configuracoes(funcao, files, workers=workers)
+
+    chaves = {}
+    for hybrid_degree, file_path in files.items():
+        try:
+            chaves[hybrid_degree] = chave(hybrid_degree, file_path)
+        except OSError:
+            # Planilha ausente ou ilegível: funcao trata e reporta o erro
+            pass
+
+    reaproveitados = {}
+    for hybrid_degree, chave_configuracao in chaves.items():
+        try:
+            if restaurar(chave_configuracao, arquivos_saida(hybrid_degree)):
+                reaproveitados[hybrid_degree] = ler_tabela(chave_configuracao)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"AVISO: Entrada do cache de {hybrid_degree} inválida ({e}). Recalculando.")
+
+    pendentes = {hybrid_degree: file_path for hybrid_degree, file_path in files.items() if hybrid_degree not in reaproveitados}
+    recalculados = executar_configuracoes(funcao, pendentes, workers=workers)
+    for hybrid_degree, df in recalculados.items():
+        if hybrid_degree not in chaves:
+            continue
+        try:
+            armazenar(chaves[hybrid_degree], arquivos_saida(hybrid_degree), df, descricao=f"{etapa} {hybrid_degree}")
+        except OSError as e:
+            print(f"AVISO: Não foi possível gravar o cache de {hybrid_degree}: {e}")
+
+    imprimir_relatorio(etapa, reaproveitados, recalculados, limitar_cache())
+    resultados = {**reaproveitados, **recalculados}
+    return {hybrid_degree: resultados[hybrid_degree] for hybrid_degree in files if hybrid_degree in resultados}
@@ -0,0 +1,267 @@
+import os
+import glob
+import hashlib
+import pandas as pd
+import numpy as np
+import perfil_execucao
+
+# --- LEITURA DAS PLANILHAS DE MISSÃO DO SUAVE ---
+# Módulo compartilhado pelas análises energética e exergética: lê os arquivos
+# resultados_suave_*.csv (separador ';' e decimal ','), normaliza o esquema de
+# colunas e mantém um cache binário (.npz) para evitar reprocessar o texto.
+
+# Lista de arquivos e graus de hibridização
+files = {
+    '15%': 'resultados_suave_15.csv',
+    '20%': 'resultados_suave_20.csv',
+    '30%': 'resultados_suave_30.csv',
+    'Convencional': 'resultados_suave_convencional.csv'
+}
+
+# Lista de colunas numéricas a serem convertidas
+numeric_columns = [
+    'time', 'altitude_m', 'mach_number', 'velocity_m_s', 'pressure_Pa',
+    'density_kg_m3', 'temperature_C', 'lift_coefficient', 'drag_coefficient',
+    'angle_of_attack_rad', 'flight_path_angle_rad', 'mass_kg', 'mass_flow_kg_s',
+    'CG_m', 'CG_percent', 'throttle', 'battery_energy', 'battery_voltage',
+    'battery_voltage_under_load', 'battery_voltage_open_circuit',
+    'state_of_charge', 'rpm', 'rpm_wtp', 'battery_resistive_losses',
+    'emotor_efficiency', 'emotorWTP_efficiency', 'combustion_engine_throttle',
+    'beta_propeller', 'eta_propeller', 'cp_propeller', 'ct_propeller',
+    'j_propeller', 'rpm_propeller', 'thrust_propeller', 'beta_propellerWTP',
+    'eta_propellerWTP', 'cp_propellerWTP', 'ct_propellerWTP', 'j_propellerWTP',
+    'rpm_propellerWTP', 'thrust_propellerWTP', 'power_WTP', 'propeller_rpm',
+    'battery_current', 'battery_draw', 'propeller_motor_torque',
+    'propeller_torque', 'battery_specfic_power', 'propeller_tip_mach',
+    'propeller_power_coefficient', 'gas_turbine_p3', 'gas_turbine_t3',
+    'gas_turbine_far', 'electric_throttle', 'electric_throttle_WTP',
+    'disc_loading', 'power_loading', 'propeller_thrust', 'power',
+    'heat_load_vcs', 'tms_mdot_air_vcs', 'heat_load_liquid',
+    'tms_mdot_air_liquid', 'thrust_turboprop', 'thrust_WTP',
+    'power_propeller_turboprop', 'power_turboshaft', 'power_motor_turboprop',
+    'power_propeller_WTP', 'propellerWTP_tip_mach', 'co_emissions_index',
+    'co2_emissions_index', 'nox_emissions_index', 'co_emissions_total',
+    'co2_emissions_total', 'nox_emissions_total', 'l_over_d', 'weight',
+    'lift', 'drag', 'etap'
+]
+
+# Colunas de entrada lidas por cada análise no modo compacto (as demais não são carregadas)
+colunas_energia = [
+    'time', 'altitude_m', 'velocity_m_s', 'power', 'eta_propeller', 'etap', 'thrust_turboprop',
+    'thrust_propeller', 'propeller_thrust', 'thrust_WTP', 'electric_throttle', 'emotor_efficiency',
+    'power_propeller_turboprop', 'battery_energy', 'battery_resistive_losses', 'co2_emissions_total'
+]
+colunas_exergia = [
+    'segment', 'time', 'altitude_m', 'mach_number', 'velocity_m_s', 'pressure_Pa', 'temperature_C',
+    'mass_flow_kg_s', 'gas_turbine_far', 'gas_turbine_p3', 'gas_turbine_t3', 'power_turboshaft',
+    'combustion_engine_throttle', 'electric_throttle', 'electric_throttle_WTP', 'power_motor_turboprop',
+    'emotor_efficiency', 'emotorWTP_efficiency', 'thrust_propeller', 'thrust_WTP', 'battery_energy',
+    'battery_draw', 'battery_resistive_losses', 'power_propeller_WTP', 'eta_propellerWTP',
+    'T_motor_MTRB_op_K', 'T_motor_WTP_op_K'
+]
+
+# Colunas sem sentido na configuração convencional (sem bateria nem motores elétricos), zeradas na normalização
+colunas_zeradas_convencional = ['thrust_WTP', 'emotor_efficiency', 'electric_throttle',
+                                'battery_energy', 'power_motor_turboprop', 'power_propeller_WTP']
+
+# Colunas mantidas em float64 no modo float32: grandezas acumuladas cujas diferenças entre
+# linhas são usadas nos cálculos (em float32, battery_energy ~1e8 J teria resolução de ~8 J)
+colunas_float64 = ['time', 'battery_energy']
+
+# Diretório do cache binário das planilhas já convertidas
+cache_dir = '.cache_missoes'
+
+# Incrementar sempre que a normalização mudar, para invalidar o cache antigo
+versao_cache = 1
+
+def _remover_indice(df):
+    """Remove a coluna de índice sem nome exportada pelo SUAVE."""
+    return df.loc[:, [not str(col).startswith('Unnamed') for col in df.columns]]
+
+def ler_csv_suave(file_path):
+    """Lê a planilha do SUAVE (separador ';' e decimal ',') sem normalizar as colunas."""
+    return _remover_indice(pd.read_csv(file_path, delimiter=';', decimal=',', skip_blank_lines=True))
+
+def ler_missao_em_blocos(file_path, hybrid_degree, chunksize, estado=None, colunas=None):
+    """Lê e normaliza a planilha em blocos de chunksize linhas (gerador), sem carregá-la inteira.
+
+    O índice dos blocos continua a numeração da planilha completa. O cache binário não é usado.
+    As decisões da normalização que dependem da planilha inteira são tomadas antes do primeiro bloco
+    (decisoes_missao) e guardadas em estado. colunas restringe as colunas lidas da planilha.
+    """
+    estado = decisoes_missao(file_path, hybrid_degree, chunksize, {} if estado is None else estado)
+    with pd.read_csv(file_path, delimiter=';', decimal=',', skip_blank_lines=True, chunksize=chunksize,
+                     usecols=None if colunas is None else (lambda col: col in colunas)) as leitor:
+        for bloco in leitor:
+            yield normalizar_missao(_remover_indice(bloco), hybrid_degree, estado)
+
+def decisoes_missao(file_path, hybrid_degree, chunksize, estado):
+    """Toma, sobre a planilha inteira, as decisões de normalizar_missao e as guarda em estado (retornado).
+
+    Usada no processamento em blocos, para que a decisão não mude de um bloco para outro: a planilha
+    é lida previamente em blocos, apenas com as colunas envolvidas. Decisões já em estado são mantidas.
+    """
+    if hybrid_degree == 'Convencional' and 'remapear_potencia_turboprop' not in estado:
+        soma = 0.0
+        with pd.read_csv(file_path, delimiter=';', decimal=',', skip_blank_lines=True, chunksize=chunksize,
+                         usecols=lambda col: col == 'power_propeller_turboprop') as leitor:
+            for bloco in leitor:
+                if 'power_propeller_turboprop' in bloco.columns:
+                    soma += pd.to_numeric(bloco['power_propeller_turboprop'], errors='coerce').fillna(0).sum()
+        estado['remapear_potencia_turboprop'] = bool(soma == 0)
+    return estado
+
+def normalizar_missao(df, hybrid_degree, estado=None):
+    """Converte as colunas numéricas e aplica o remapeamento da configuração convencional.
+
+    Em blocos, estado traz as decisões tomadas sobre a planilha inteira (ver decisoes_missao); sem
+    ele, elas são tomadas sobre df.
+    """
+    if hybrid_degree == 'Convencional':
+        if 'etap' in df.columns:
+            df['eta_propeller'] = df['etap']
+        else:
+            df['eta_propeller'] = 0
+        if 'propeller_thrust' in df.columns:
+            df['thrust_turboprop'] = df['propeller_thrust']
+        else:
+            df['thrust_turboprop'] = 0
+        for col_to_zero in colunas_zeradas_convencional:
+            df[col_to_zero] = 0
+
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
+            if df[col].isnull().any():
+                df[col] = df[col].fillna(0)
+        else:
+            df[col] = 0.0
+
+    if hybrid_degree == 'Convencional':
+        remapear = (estado or {}).get('remapear_potencia_turboprop')
+        if remapear is None:
+            remapear = df['power_propeller_turboprop'].sum() == 0
+        if remapear:
+            df['power_propeller_turboprop'] = df['power']
+
+    return df
+
+def hash_arquivo(file_path):
+    """Hash SHA-1 do conteúdo de um arquivo, lido em blocos de 1 MB."""
+    sha = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def _coluna_nula(n_linhas, dtype=float):
+    """Coluna de zeros sem armazenar os valores (SparseArray com fill_value 0)."""
+    return pd.arrays.SparseArray(np.zeros(n_linhas, dtype=dtype), fill_value=0, kind='integer')
+
+def compactar_missao(df, colunas=None, float32=False):
+    """Representação compacta de uma missão (ou de uma tabela de resultados) em memória.
+
+    Apenas as colunas pedidas são mantidas; colunas inteiramente nulas (as ausentes da planilha e as
+    zeradas na configuração convencional) viram SparseArray sem valores armazenados, 'segment' vira
+    categórica e, com float32=True, as colunas float64 (exceto colunas_float64) passam a float32.
+    """
+    if colunas is not None:
+        df = df[[col for col in colunas if col in df.columns]]
+    dados = {}
+    for col in df.columns:
+        valores = df[col]
+        if col == 'segment':
+            dados[col] = valores.astype('category')
+        elif isinstance(valores.dtype, pd.SparseDtype) or valores.dtype.kind not in 'fiub':
+            dados[col] = valores
+        elif not valores.to_numpy().any():
+            dados[col] = pd.Series(_coluna_nula(len(df), valores.dtype), index=df.index)
+        elif float32 and valores.dtype == np.float64 and col not in colunas_float64:
+            dados[col] = valores.astype(np.float32)
+        else:
+            dados[col] = valores
+    return pd.DataFrame(dados, index=df.index)
+
+def memoria_mb(df):
+    """Memória ocupada pelo DataFrame, em MB (incluindo textos)."""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+def _chave_cache(file_path, hybrid_degree):
+    """Chave do cache: hash do conteúdo do arquivo, data de modificação e tipo de configuração."""
+    sha = hashlib.sha1(hash_arquivo(file_path).encode())
+    sha.update(str(os.stat(file_path).st_mtime_ns).encode())
+    sha.update(f"{hybrid_degree == 'Convencional'}|{versao_cache}".encode())
+    return sha.hexdigest()[:20]
+
+def gravar_tabela_npz(df, caminho):
+    """Grava um DataFrame em um .npz (colunas numéricas e de texto separadas), de forma atômica."""
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    arrays = {}
+    for i, col in enumerate(df.columns):
+        valores = df[col].to_numpy()
+        if valores.dtype.kind not in 'fiub':
+            valores = valores.astype(str)
+        arrays[f'c{i}'] = valores
+    arrays['__colunas__'] = np.array(df.columns, dtype=str)
+    temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+    np.savez(temporario, **arrays)
+    os.replace(temporario, caminho)
+
+def ler_tabela_npz(caminho, colunas=None):
+    """Lê um DataFrame gravado por gravar_tabela_npz; com colunas, carrega apenas as colunas pedidas que existirem."""
+    with np.load(caminho, allow_pickle=False) as dados:
+        todas = list(dados['__colunas__'])
+        if colunas is None:
+            colunas = todas
+        return pd.DataFrame({col: dados[f'c{todas.index(col)}'] for col in colunas if col in todas})
+
+def _salvar_cache(df, caminho_cache):
+    """Grava o DataFrame normalizado no cache e remove versões antigas da mesma planilha."""
+    gravar_tabela_npz(df, caminho_cache)
+
+    # Remove versões antigas do cache da mesma planilha
+    prefixo, chave = caminho_cache[:-len('.npz')].rsplit('_', 1)
+    for antigo in glob.glob(f"{glob.escape(prefixo)}_*.npz"):
+        resto = antigo[len(prefixo) + 1:-len('.npz')]
+        if antigo != caminho_cache and len(resto) == len(chave) and '_' not in resto:
+            os.remove(antigo)
+
+def carregar_missao(file_path, hybrid_degree, usar_cache=True, compacto=False, colunas=None, float32=False):
+    """Lê e normaliza uma planilha de missão, usando o cache binário quando disponível.
+
+    Com compacto=True a missão é devolvida por compactar_missao, apenas com as colunas pedidas
+    (todas se None); a partir do cache, as demais colunas nem chegam a ser lidas.
+    """
+    caminho_cache = None
+    if usar_cache:
+        nome = os.path.splitext(os.path.basename(file_path))[0]
+        caminho_cache = os.path.join(cache_dir, f"{nome}_{_chave_cache(file_path, hybrid_degree)}.npz")
+        if os.path.exists(caminho_cache):
+            try:
+                with perfil_execucao.etapa('leitura_cache', hybrid_degree):
+                    if compacto:
+                        df = compactar_missao(ler_tabela_npz(caminho_cache, colunas), float32=float32)
+                    else:
+                        df = ler_tabela_npz(caminho_cache)
+                    perfil_execucao.contar_linhas(len(df))
+                return df
+            except Exception as e:
+                print(f"AVISO: Cache {caminho_cache} inválido ({e}). Relendo {file_path}.")
+
+    with perfil_execucao.etapa('leitura_csv', hybrid_degree):
+        df = ler_csv_suave(file_path)
+        perfil_execucao.contar_linhas(len(df))
+    if df.empty:
+        return df
+    with perfil_execucao.etapa('conversao_numerica', hybrid_degree, len(df)):
+        df = normalizar_missao(df, hybrid_degree)
+
+    if caminho_cache is not None:
+        try:
+            with perfil_execucao.etapa('gravacao_cache', hybrid_degree, len(df)):
+                _salvar_cache(df, caminho_cache)
+        except OSError as e:
+            print(f"AVISO: Não foi possível gravar o cache {caminho_cache}: {e}")
+    if compacto:
+        return compactar_missao(df, colunas, float32)
+    return df
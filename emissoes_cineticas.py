@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dados_missao import files, carregar_missao, hash_arquivo
+from execucao_paralela import numero_workers
+import mecanismo
+from analise_exergetica import unidade_p3_Pa
+
+# --- EMISSÕES DE NOx E CO POR REDE DE REATORES (PSR -> PFR) ---
+# Verifica os índices de emissão do SUAVE (nox_emissions_index e
+# co_emissions_index, em g/kg de combustível) com a cinética do HyChem
+# (A2highT.cti). Cada ponto de operação (T3, P3, FAR) é modelado como:
+#   zona primária: reator perfeitamente misturado (PSR) com phi_zona_primaria
+#                  e tempo de residência tempo_residencia_psr_s;
+#   zona de diluição: mistura adiabática com o restante do ar (a T3) até o FAR
+#                  global, seguida de um reator pistonado (PFR, integrado como
+#                  reator a pressão constante) por tempo_residencia_pfr_s.
+# O mecanismo não tem química do nitrogênio (o N2 é inerte), então o NO é
+# calculado em pós-processamento pelo mecanismo de Zeldovich estendido, com
+# N em regime quase estacionário e O, O2, OH e N2 do cálculo cinético.
+#
+# As linhas de uma missão são muito repetitivas: os pontos de operação são
+# quantizados (passo_T3_K, passo_P3_relativo, passo_far), cada ponto distinto
+# é resolvido uma única vez (em um pool de processos) e os resultados ficam
+# memorizados em .cache_mecanismo/ para as execuções seguintes.
+#
+# Validação (missão de 15%): o EI de NOx médio fica próximo do SUAVE (12,8 contra
+# 11,2 g/kg), mas o de CO não (28,4 contra 3,7 g/kg). A diferença vem toda dos
+# pontos de baixa potência (descidas, T3 ~555 K, FAR ~0,017): após a diluição a
+# mistura sai a ~1170 K, temperatura em que a oxidação do CO formado na zona
+# primária é lenta demais para os 5 ms do PFR e o CO fica praticamente congelado
+# (~70 g/kg contra ~6 do SUAVE; 31 g/kg com 50 ms). Acima de ~1300 K na saída
+# (subida e cruzeiro) o CO se oxida quase por completo e a rede fica abaixo do
+# SUAVE (~0 contra ~2 g/kg). As médias são mostradas separadamente para as duas
+# faixas (T_congelamento_co_K).
+
+# Modelo da rede de reatores (valores típicos de câmaras convencionais; com eles o EI de NOx
+# fica na mesma ordem de grandeza do SUAVE na decolagem e no cruzeiro)
+phi_zona_primaria = 0.75
+tempo_residencia_psr_s = 1.5e-3
+tempo_residencia_pfr_s = 5e-3
+pontos_pfr = 200
+
+# Temperatura de saída abaixo da qual o CO da rede de reatores fica congelado no PFR
+T_congelamento_co_K = 1300.0
+
+# Quantização dos pontos de operação
+passo_T3_K = 5.0
+passo_P3_relativo = 0.02   # passo de 2% (escala logarítmica)
+passo_far = 0.0002
+
+# Resultados de cada ponto
+resultados_ponto = ['EI_NOx_g_kg', 'EI_CO_g_kg', 'T_psr_K', 'T_saida_K']
+
+M_NO = 30.006
+M_NO2 = 46.0055
+
+def _constantes_zeldovich(T):
+    """Constantes do mecanismo de Zeldovich estendido (Turns), em m3/kmol/s."""
+    k1f = 1.8e14 * np.exp(-38370 / T)
+    k1r = 3.8e13 * np.exp(-425 / T)
+    k2f = 1.8e10 * T * np.exp(-4680 / T)
+    k2r = 3.8e9 * T * np.exp(-20820 / T)
+    k3f = 7.1e13 * np.exp(-450 / T)
+    return tuple(1e-3 * k for k in (k1f, k1r, k2f, k2r, k3f))
+
+def taxa_no(T, c_O, c_O2, c_N2, c_OH, c_NO):
+    """Taxa de formação de NO (kmol/m3/s) com N em regime quase estacionário; concentrações em kmol/m3."""
+    k1f, k1r, k2f, k2r, k3f = _constantes_zeldovich(T)
+    K = (k1f / k1r) * (k2f / k2r)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retorno = 1 - c_NO**2 / (K * c_O2 * c_N2)
+        return 2 * k1f * c_O * c_N2 * retorno / (1 + k1r * c_NO / (k2f * c_O2 + k3f * c_OH))
+
+def _concentracoes(gas):
+    c = gas.concentrations
+    return gas.T, c[gas.species_index('O')], c[gas.species_index('O2')], c[gas.species_index('N2')], c[gas.species_index('OH')]
+
+def _no_psr(gas, tau):
+    """[NO] no PSR em regime permanente: raiz de c = tau * taxa_no(c), por bisseção entre 0 e o equilíbrio."""
+    T, c_O, c_O2, c_N2, c_OH = _concentracoes(gas)
+    k1f, k1r, k2f, k2r, _ = _constantes_zeldovich(T)
+    inferior, superior = 0.0, np.sqrt((k1f / k1r) * (k2f / k2r) * c_O2 * c_N2)
+    for _ in range(60):
+        c = 0.5 * (inferior + superior)
+        if c - tau * taxa_no(T, c_O, c_O2, c_N2, c_OH, c) > 0:
+            superior = c
+        else:
+            inferior = c
+    return 0.5 * (inferior + superior)
+
+def resolver_ponto(T3_K, P3_Pa, far, combustivel, ar, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Resolve a rede PSR -> PFR de um ponto de operação; retorna os valores de resultados_ponto."""
+    import cantera as ct
+    gas = mecanismo.obter_solucao(arquivo_cti)
+    especie_combustivel = next(iter(combustivel))
+
+    # Ar de diluição e FAR estequiométrico da mistura
+    gas.TPX = T3_K, P3_Pa, ar
+    Y_ar, h_ar = gas.Y, gas.enthalpy_mass
+    gas.set_equivalence_ratio(1.0, combustivel, ar)
+    Y_comb = gas.Y[gas.species_index(especie_combustivel)]
+    far_esteq = Y_comb / (1 - Y_comb)
+    phi_global = far / far_esteq
+    phi_pz = max(phi_zona_primaria, phi_global)
+
+    # Zona primária (PSR), iniciada no equilíbrio para garantir a ignição
+    gas.TP = T3_K, P3_Pa
+    gas.set_equivalence_ratio(phi_pz, combustivel, ar)
+    entrada = ct.Reservoir(gas, clone=False)
+    gas.equilibrate('HP')
+    psr = ct.IdealGasReactor(gas, volume=1.0, clone=False)
+    saida = ct.Reservoir(gas, clone=False)
+    mfc = ct.MassFlowController(entrada, psr, mdot=lambda t: psr.mass / tempo_residencia_psr_s)
+    ct.PressureController(psr, saida, primary=mfc, K=1e-5)
+    ct.ReactorNet([psr]).advance_to_steady_state()
+    gas.TPY = psr.T, P3_Pa, psr.Y
+    T_psr = gas.T
+    Y_NO = _no_psr(gas, tempo_residencia_psr_s) * M_NO / gas.density
+
+    # Diluição adiabática até o FAR global (por kg de combustível)
+    massa_pz = 1 + 1 / (phi_pz * far_esteq)
+    massa_total = 1 + 1 / far
+    fracao_pz = massa_pz / massa_total
+    gas.HPY = (fracao_pz * gas.enthalpy_mass + (1 - fracao_pz) * h_ar, P3_Pa,
+               fracao_pz * gas.Y + (1 - fracao_pz) * Y_ar)
+    Y_NO *= fracao_pz
+
+    # Zona de diluição (PFR): NO integrado ao longo dos estados do reator
+    pfr = ct.IdealGasConstPressureReactor(gas, clone=False)
+    rede = ct.ReactorNet([pfr])
+    instantes = np.linspace(0, tempo_residencia_pfr_s, pontos_pfr + 1)
+    for t_anterior, t in zip(instantes[:-1], instantes[1:]):
+        gas.TPY = pfr.T, P3_Pa, pfr.Y
+        T, c_O, c_O2, c_N2, c_OH = _concentracoes(gas)
+        c_NO = Y_NO * gas.density / M_NO
+        Y_NO = max(Y_NO + taxa_no(T, c_O, c_O2, c_N2, c_OH, c_NO) * (t - t_anterior) * M_NO / gas.density, 0.0)
+        rede.advance(t)
+    Y_CO = pfr.phase['CO'].Y[0]
+
+    return (1000 * Y_NO * (M_NO2 / M_NO) * massa_total, 1000 * Y_CO * massa_total, T_psr, pfr.T)
+
+def _resolver_tarefa(tarefa):
+    ponto, argumentos = tarefa
+    try:
+        return resolver_ponto(*ponto, *argumentos)
+    except Exception as e:
+        print(f"AVISO: Rede de reatores não convergiu em T3={ponto[0]:.0f} K, P3={ponto[1]:.0f} Pa, FAR={ponto[2]:.4f}: {e}")
+        return (np.nan,) * len(resultados_ponto)
+
+def quantizar(T3_K, P3_Pa, far):
+    """Índices inteiros (N, 3) dos pontos de operação na grade de quantização."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.stack([np.round(T3_K / passo_T3_K), np.round(np.log(P3_Pa) / np.log1p(passo_P3_relativo)),
+                         np.round(far / passo_far)], axis=-1).astype(np.int64)
+
+def ponto_representativo(indices):
+    """(T3_K, P3_Pa, far) no centro de cada célula de quantização."""
+    return indices[:, 0] * passo_T3_K, np.exp(indices[:, 1] * np.log1p(passo_P3_relativo)), indices[:, 2] * passo_far
+
+def _caminho_memoria(combustivel, ar, arquivo_cti):
+    texto = json.dumps([sorted(combustivel.items()), sorted(ar.items()), hash_arquivo(arquivo_cti), phi_zona_primaria,
+                        tempo_residencia_psr_s, tempo_residencia_pfr_s, pontos_pfr, passo_T3_K, passo_P3_relativo, passo_far])
+    return os.path.join(mecanismo.cache_dir, f"emissoes_{hashlib.sha1(texto.encode()).hexdigest()[:16]}.npz")
+
+def _ler_memoria(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with np.load(caminho) as dados:
+        return {tuple(indice): valores for indice, valores in zip(dados['indices'].tolist(), dados['valores'])}
+
+def _gravar_memoria(caminho, memoria):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+    np.savez(temporario, indices=np.array(list(memoria), dtype=np.int64).reshape(-1, 3),
+             valores=np.array(list(memoria.values()), dtype=float).reshape(-1, len(resultados_ponto)))
+    os.replace(temporario, caminho)
+
+def avaliar_pontos(T3_K, P3_Pa, far, combustivel, ar, arquivo_cti=mecanismo.arquivo_mecanismo, workers=1, usar_cache=True):
+    """Resultados da rede de reatores por linha: array (N, len(resultados_ponto)); NaN nas linhas sem combustão.
+
+    Retorna também um dicionário com as contagens (linhas, pontos distintos, memorizados, resolvidos).
+    """
+    T3_K, P3_Pa, far = (np.asarray(v, dtype=float) for v in (T3_K, P3_Pa, far))
+    ativo = (far > 0) & (T3_K > 0) & (P3_Pa > 0) & np.isfinite(T3_K + P3_Pa + far)
+    indices = quantizar(T3_K[ativo], P3_Pa[ativo], far[ativo])
+    distintos, inverso = np.unique(indices, axis=0, return_inverse=True)
+
+    caminho = _caminho_memoria(combustivel, ar, arquivo_cti)
+    memoria = _ler_memoria(caminho) if usar_cache else {}
+    pendentes = [i for i, indice in enumerate(distintos.tolist()) if tuple(indice) not in memoria]
+    if pendentes:
+        mecanismo.caminho_yaml(arquivo_cti)  # converte o mecanismo antes de iniciar os processos
+        argumentos = (combustivel, ar, arquivo_cti)
+        tarefas = [(ponto, argumentos) for ponto in zip(*ponto_representativo(distintos[pendentes]))]
+        workers = min(numero_workers(workers), len(tarefas))
+        if workers <= 1:
+            resolvidos = [_resolver_tarefa(tarefa) for tarefa in tarefas]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=mecanismo.inicializar_processo,
+                                     initargs=(arquivo_cti,)) as pool:
+                resolvidos = list(pool.map(_resolver_tarefa, tarefas, chunksize=max(1, len(tarefas) // (4 * workers))))
+        for i, valores in zip(pendentes, resolvidos):
+            memoria[tuple(distintos[i].tolist())] = np.asarray(valores, dtype=float)
+        if usar_cache:
+            _gravar_memoria(caminho, memoria)
+
+    valores_distintos = np.array([memoria[tuple(indice)] for indice in distintos.tolist()]).reshape(-1, len(resultados_ponto))
+    resultado = np.full((len(T3_K), len(resultados_ponto)), np.nan)
+    resultado[ativo] = valores_distintos[inverso.ravel()]
+    contagens = {'linhas': int(ativo.sum()), 'distintos': len(distintos),
+                 'memorizados': len(distintos) - len(pendentes), 'resolvidos': len(pendentes)}
+    return resultado, contagens
+
+def calcular_emissoes(df, combustivel, ar, arquivo_cti=mecanismo.arquivo_mecanismo, workers=1, usar_cache=True):
+    """Emissões da rede de reatores para cada linha da missão, lado a lado com os índices do SUAVE."""
+    resultado, contagens = avaliar_pontos(
+        df['gas_turbine_t3'].to_numpy(dtype=float), df['gas_turbine_p3'].to_numpy(dtype=float) * unidade_p3_Pa,
+        df['gas_turbine_far'].to_numpy(dtype=float), combustivel, ar, arquivo_cti, workers, usar_cache)
+    tabela = pd.DataFrame({col: df[col].to_numpy() for col in ('segment', 'time') if col in df.columns})
+    tabela['EI_NOx_SUAVE_g_kg'] = df['nox_emissions_index'].to_numpy(dtype=float)
+    tabela['EI_CO_SUAVE_g_kg'] = df['co_emissions_index'].to_numpy(dtype=float)
+    for j, nome in enumerate(resultados_ponto):
+        tabela[nome] = resultado[:, j]
+    return tabela, contagens
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Índices de emissão de NOx e CO por rede de reatores PSR -> PFR (HyChem A2highT).')
+    parser.add_argument('configuracoes', nargs='*', default=list(files),
+                        help=f"Configurações a analisar (padrão: {', '.join(files)}).".replace('%', '%%'))
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos para os pontos de operação (0 = todos os núcleos).')
+    parser.add_argument('--sem-cache', action='store_true', help='Resolve todos os pontos, sem consultar os resultados memorizados.')
+    parser.add_argument('--mecanismo', default=mecanismo.arquivo_mecanismo,
+                        help=f'Mecanismo CTI ou YAML (padrão: {mecanismo.arquivo_mecanismo}; ex.: um esqueleto de reducao_mecanismo.py).')
+    args = parser.parse_args()
+
+    from analise_exergetica import fuel_comp_cantera, composicao_ar_seco_cantera
+    for hybrid_degree in args.configuracoes:
+        inicio = time.perf_counter()
+        df = carregar_missao(files[hybrid_degree], hybrid_degree)
+        tabela, contagens = calcular_emissoes(df, fuel_comp_cantera, composicao_ar_seco_cantera, args.mecanismo,
+                                              args.workers, usar_cache=not args.sem_cache)
+        output_filename = f"emissoes_cineticas_{hybrid_degree.replace('%', '')}.csv"
+        tabela.to_csv(output_filename, sep=";", decimal=",", index=False)
+        print(f"{hybrid_degree}: {contagens['linhas']} linhas, {contagens['distintos']} pontos distintos "
+              f"({contagens['memorizados']} memorizados, {contagens['resolvidos']} resolvidos) em "
+              f"{time.perf_counter() - inicio:.1f} s; salvo em {output_filename}")
+        medias = tabela[['EI_NOx_SUAVE_g_kg', 'EI_NOx_g_kg', 'EI_CO_SUAVE_g_kg', 'EI_CO_g_kg']].mean()
+        print("  médias (g/kg): " + ", ".join(f"{nome} = {valor:.2f}" for nome, valor in medias.items()))
+        for rotulo, linhas in (('CO congelado', tabela['T_saida_K'] < T_congelamento_co_K),
+                               ('CO oxidado', tabela['T_saida_K'] >= T_congelamento_co_K)):
+            if linhas.any():
+                print(f"  {rotulo} (T_saida {'<' if rotulo == 'CO congelado' else '>='} {T_congelamento_co_K:.0f} K, "
+                      f"{int(linhas.sum())} linhas): EI_CO_SUAVE_g_kg = {tabela.loc[linhas, 'EI_CO_SUAVE_g_kg'].mean():.2f}, "
+                      f"EI_CO_g_kg = {tabela.loc[linhas, 'EI_CO_g_kg'].mean():.2f}")
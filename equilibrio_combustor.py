@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dados_missao import hash_arquivo
+from execucao_paralela import numero_workers
+import mecanismo
+
+# --- ESTADO DE EQUILÍBRIO NA SAÍDA DO COMBUSTOR ---
+# Para separar a irreversibilidade da combustão das demais perdas do motor
+# térmico, os reagentes (POSF10325 e ar na razão de equivalência phi, a T3 e P3)
+# são levados ao equilíbrio químico adiabático a pressão constante (HP) com o
+# mecanismo A2highT.cti. Resolver o equilíbrio linha a linha não escala, então
+# as propriedades são calculadas uma única vez em uma grade phi x T3 x P3
+# (em paralelo, em um pool de processos) e guardadas em .cache_mecanismo/; as
+# missões interpolam na grade (trilinear, em ln P3) e apenas os pontos fora
+# dela são resolvidos com o Cantera. Esses pontos são quantizados (como em
+# emissoes_cineticas.py), resolvidos uma vez por ponto distinto no centro da
+# célula e memorizados em .cache_mecanismo/ entre as execuções.
+
+# Grade (cobre a faixa das missões do SUAVE: phi ~0,2-0,4, T3 ~550-730 K, P3 ~4-20 bar)
+grade_phi = np.round(np.arange(0.05, 1.0001, 0.05), 4)
+grade_T3_K = np.arange(300.0, 1000.1, 50.0)
+grade_P3_Pa = np.array([1, 2, 5, 10, 20, 40]) * 1e5
+
+# Quantização dos pontos fora da grade (phi absoluto, T3 em K e P3 relativo)
+passo_phi = 0.001
+passo_T3_K = 1.0
+passo_P3_relativo = 0.005
+
+# Propriedades calculadas em cada ponto (por kg de mistura)
+propriedades = [
+    'T_ad_K',               # temperatura adiabática de equilíbrio
+    's_ger_J_kgK',          # entropia gerada na combustão (s dos produtos - s dos reagentes)
+    'cp_produtos_J_kgK',    # cp médio dos produtos entre T0 e T_ad (composição congelada)
+]
+
+# Grades já carregadas neste processo, pela chave
+_grades = {}
+
+def estado_equilibrio(phi, T3_K, P3_Pa, combustivel, ar, T0_K, P0_Pa, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Resolve o equilíbrio HP de um ponto com o Cantera; retorna os valores de propriedades, na ordem."""
+    gas = mecanismo.obter_solucao(arquivo_cti)
+    gas.TP = T3_K, P3_Pa
+    gas.set_equivalence_ratio(phi, combustivel, ar)
+    s_reagentes = gas.entropy_mass
+    gas.equilibrate('HP')
+    T_ad, h_ad, s_ad, Y = gas.T, gas.enthalpy_mass, gas.entropy_mass, gas.Y
+    gas.TPY = T0_K, P0_Pa, Y
+    h0 = gas.enthalpy_mass
+    return (T_ad, s_ad - s_reagentes, (h_ad - h0) / (T_ad - T0_K) if T_ad != T0_K else gas.cp_mass)
+
+def _resolver_lote(tarefa):
+    pontos, argumentos = tarefa
+    return [estado_equilibrio(*ponto, *argumentos) for ponto in pontos]
+
+def gerar_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti=mecanismo.arquivo_mecanismo, workers=0):
+    """Calcula as propriedades em todos os pontos da grade, distribuídos em um pool de processos.
+
+    Dentro de um processo de um pool (configurações em paralelo) a grade é calculada em série, para
+    não abrir um pool com todos os núcleos em cada processo; o normal é construí-la antes, no processo
+    principal (ver analise_exergetica.preparar_equilibrio).
+
+    Retorna um array (len(grade_phi), len(grade_T3_K), len(grade_P3_Pa), len(propriedades)).
+    """
+    mecanismo.caminho_yaml(arquivo_cti)  # converte o mecanismo antes de iniciar os processos
+    pontos = [(phi, T3, P3) for phi in grade_phi for T3 in grade_T3_K for P3 in grade_P3_Pa]
+    argumentos = (combustivel, ar, T0_K, P0_Pa, arquivo_cti)
+    if multiprocessing.parent_process() is not None:
+        workers = 1
+    workers = min(numero_workers(workers), len(pontos))
+    tamanho_lote = max(1, len(pontos) // (4 * workers))
+    tarefas = [(pontos[i:i + tamanho_lote], argumentos) for i in range(0, len(pontos), tamanho_lote)]
+    if workers <= 1:
+        lotes = [_resolver_lote(tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=mecanismo.inicializar_processo,
+                                 initargs=(arquivo_cti,)) as pool:
+            lotes = list(pool.map(_resolver_lote, tarefas))
+    valores = np.array([valor for lote in lotes for valor in lote])
+    return valores.reshape(len(grade_phi), len(grade_T3_K), len(grade_P3_Pa), len(propriedades))
+
+def _chave_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti):
+    texto = json.dumps([sorted(combustivel.items()), sorted(ar.items()), T0_K, P0_Pa, hash_arquivo(arquivo_cti),
+                        grade_phi.tolist(), grade_T3_K.tolist(), grade_P3_Pa.tolist(), propriedades])
+    return hashlib.sha1(texto.encode()).hexdigest()[:16]
+
+def carregar_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti=mecanismo.arquivo_mecanismo, workers=0):
+    """Grade de equilíbrio lida do cache (ou calculada com o Cantera na primeira vez)."""
+    chave = _chave_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti)
+    if chave not in _grades:
+        caminho = os.path.join(mecanismo.cache_dir, f"combustor_{chave}.npz")
+        if not os.path.exists(caminho):
+            print(f"Calculando a grade de equilíbrio do combustor ({grade_phi.size * grade_T3_K.size * grade_P3_Pa.size} pontos)...")
+            valores = gerar_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti, workers)
+            os.makedirs(mecanismo.cache_dir, exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+            np.savez(temporario, valores=valores, phi=grade_phi, T3_K=grade_T3_K, P3_Pa=grade_P3_Pa)
+            os.replace(temporario, caminho)
+        with np.load(caminho) as dados:
+            _grades[chave] = dados['valores']
+    return _grades[chave]
+
+def quantizar(phi, T3_K, P3_Pa):
+    """Índices inteiros (N, 3) dos pontos na grade de quantização dos pontos fora da grade."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.stack([np.round(phi / passo_phi), np.round(T3_K / passo_T3_K),
+                         np.round(np.log(P3_Pa) / np.log1p(passo_P3_relativo))], axis=-1).astype(np.int64)
+
+def ponto_representativo(indices):
+    """(phi, T3_K, P3_Pa) no centro de cada célula de quantização."""
+    return indices[:, 0] * passo_phi, indices[:, 1] * passo_T3_K, np.exp(indices[:, 2] * np.log1p(passo_P3_relativo))
+
+def _caminho_memoria(combustivel, ar, T0_K, P0_Pa, arquivo_cti):
+    texto = json.dumps([_chave_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti), passo_phi, passo_T3_K, passo_P3_relativo])
+    return os.path.join(mecanismo.cache_dir, f"combustor_fora_{hashlib.sha1(texto.encode()).hexdigest()[:16]}.npz")
+
+def _ler_memoria(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with np.load(caminho) as dados:
+        return {tuple(indice): valores for indice, valores in zip(dados['indices'].tolist(), dados['valores'])}
+
+def _gravar_memoria(caminho, memoria):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+    np.savez(temporario, indices=np.array(list(memoria), dtype=np.int64).reshape(-1, 3),
+             valores=np.array(list(memoria.values()), dtype=float).reshape(-1, len(propriedades)))
+    os.replace(temporario, caminho)
+
+def resolver_fora_da_grade(phi, T3_K, P3_Pa, combustivel, ar, T0_K, P0_Pa, arquivo_cti=mecanismo.arquivo_mecanismo,
+                           usar_cache=True):
+    """Propriedades (N, len(propriedades)) de pontos fora da grade, uma solução do Cantera por ponto distinto."""
+    distintos, inverso = np.unique(quantizar(phi, T3_K, P3_Pa), axis=0, return_inverse=True)
+    caminho = _caminho_memoria(combustivel, ar, T0_K, P0_Pa, arquivo_cti)
+    memoria = _ler_memoria(caminho) if usar_cache else {}
+    pendentes = [i for i, indice in enumerate(distintos.tolist()) if tuple(indice) not in memoria]
+    if pendentes:
+        for i, ponto in zip(pendentes, zip(*ponto_representativo(distintos[pendentes]))):
+            memoria[tuple(distintos[i].tolist())] = np.asarray(
+                estado_equilibrio(*ponto, combustivel, ar, T0_K, P0_Pa, arquivo_cti), dtype=float)
+        if usar_cache:
+            _gravar_memoria(caminho, memoria)
+    valores_distintos = np.array([memoria[tuple(indice)] for indice in distintos.tolist()]).reshape(-1, len(propriedades))
+    return valores_distintos[inverso.ravel()]
+
+def interpolar_equilibrio(phi, T3_K, P3_Pa, combustivel, ar, T0_K, P0_Pa, arquivo_cti=mecanismo.arquivo_mecanismo,
+                          usar_cache=True):
+    """Propriedades de equilíbrio para colunas inteiras: dicionário {propriedade: array}.
+
+    Linhas sem combustão (phi <= 0 ou dados ausentes) resultam em 0. Pontos fora da grade são
+    resolvidos com o Cantera (ver resolver_fora_da_grade).
+    """
+    from scipy.interpolate import RegularGridInterpolator
+    valores = carregar_grade(combustivel, ar, T0_K, P0_Pa, arquivo_cti)
+    phi, T3_K, P3_Pa = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (phi, T3_K, P3_Pa)))
+    ativo = (phi > 0) & (T3_K > 0) & (P3_Pa > 0) & np.isfinite(phi + T3_K + P3_Pa)
+    resultado = np.zeros(phi.shape + (len(propriedades),))
+
+    interpolador = RegularGridInterpolator((grade_phi, grade_T3_K, np.log(grade_P3_Pa)), valores,
+                                           bounds_error=False, fill_value=np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pontos = np.stack([phi[ativo], T3_K[ativo], np.log(P3_Pa[ativo])], axis=-1)
+    resultado[ativo] = interpolador(pontos)
+
+    fora = ativo & np.isnan(resultado[..., 0])
+    if np.any(fora):
+        resultado[fora] = resolver_fora_da_grade(phi[fora], T3_K[fora], P3_Pa[fora], combustivel, ar, T0_K, P0_Pa,
+                                                 arquivo_cti, usar_cache)
+    return {nome: resultado[..., i] for i, nome in enumerate(propriedades)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Calcula (uma única vez) a grade de equilíbrio do combustor usada por analise_exergetica.py.')
+    parser.add_argument('--workers', type=int, default=0, help='Número de processos (padrão: 0 = todos os núcleos).')
+    args = parser.parse_args()
+
+    from analise_exergetica import fuel_comp_cantera, composicao_ar_seco_cantera, T0_ref_K, P0_ref_Pa
+    inicio = time.perf_counter()
+    valores = carregar_grade(fuel_comp_cantera, composicao_ar_seco_cantera, T0_ref_K, P0_ref_Pa, workers=args.workers)
+    print(f"Grade {valores.shape[:3]} pronta em {time.perf_counter() - inicio:.1f} s "
+          f"(T_ad de {np.nanmin(valores[..., 0]):.0f} a {np.nanmax(valores[..., 0]):.0f} K)")
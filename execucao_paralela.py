@@ -0,0 +1,38 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import perfil_execucao
+
+# --- EXECUÇÃO DAS CONFIGURAÇÕES DE MISSÃO ---
+# As configurações ('15%', '20%', '30%', 'Convencional', ...) não compartilham
+# estado, então cada planilha pode ser processada em um processo separado.
+
+def numero_workers(workers):
+    """Converte a opção --workers (0 ou negativo = todos os núcleos) no número de processos."""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+def _executar_configuracao(funcao, hybrid_degree, file_path):
+    with perfil_execucao.etapa('configuracao', hybrid_degree):
+        return funcao(hybrid_degree, file_path)
+
+def executar_configuracoes(funcao, files, workers=1):
+    """Executa funcao(hybrid_degree, file_path) para cada configuração de files.
+
+    Com workers > 1 as configurações são distribuídas em um ProcessPoolExecutor. O dicionário
+    retornado segue sempre a ordem de files, independentemente da ordem de término; configurações
+    para as quais a função retornar None são omitidas.
+    """
+    workers = min(numero_workers(workers), max(len(files), 1))
+    resultados = {}
+    if workers <= 1:
+        for hybrid_degree, file_path in files.items():
+            resultados[hybrid_degree] = _executar_configuracao(funcao, hybrid_degree, file_path)
+    else:
+        tarefa = perfil_execucao.em_processo(_executar_configuracao)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = {hybrid_degree: pool.submit(tarefa, funcao, hybrid_degree, file_path)
+                       for hybrid_degree, file_path in files.items()}
+            for hybrid_degree, futuro in futuros.items():
+                resultados[hybrid_degree] = perfil_execucao.incorporar(futuro.result())
+    return {hybrid_degree: df for hybrid_degree, df in resultados.items() if df is not None}
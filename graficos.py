@@ -0,0 +1,217 @@
+import logging
+import hashlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from execucao_paralela import numero_workers
+import perfil_execucao
+from suavizacao import suavizar, suavizar_causal
+from cache_resultados import restaurar, armazenar, limitar_cache, imprimir_relatorio, calcular_chave, versao_codigo
+
+# --- CAMADA DE PLOTAGEM DECLARATIVA ---
+# Cada gráfico é descrito por um dicionário (especificação) com a coluna, o
+# título, os filtros, os limites do eixo y e a regra de zoom. As figuras são
+# renderizadas com o backend Agg, em série ou distribuídas em um pool de
+# processos; cada processo recebe apenas as séries de que a figura precisa.
+#
+# Chaves da especificação:
+#   'arquivo'        nome do PNG gerado
+#   'titulo'         título da figura; 'fonte_titulo' opcional (padrão do matplotlib)
+#   'y', 'x'         colunas plotadas (x padrão: 'time')
+#   'escala_y', 'escala_x'  fatores multiplicativos (padrão: 1 e 1/60 para o tempo em minutos)
+#   'rotulo_y', 'rotulo_x'  rótulos dos eixos (rotulo_x padrão: 'Tempo (min)')
+#   'rotulo_serie'   legenda de cada série, com {config} substituído pela configuração
+#   'apenas_hibridos'  ignora a configuração 'Convencional'
+#   'omitir_nulas'   ignora séries inteiramente nulas
+#   'ylim'           limites fixos do eixo y
+#   'zoom'           'pico' (janela logo abaixo do maior valor) ou 'faixa' (faixa dos valores
+#                    positivos com 10% de margem); sem dados positivos a figura não é salva
+#   'tipo'           'linha' (padrão) ou 'dispersao'
+#   'suavizacao'     (janela, ordem) do filtro Savitzky-Golay aplicado a cada série, ou
+#                    (janela, ordem, 'causal') para o filtro causal (ver suavizacao.py)
+#   'texto_vazio'    mensagem exibida quando nenhuma série é plotada
+#   'ncol_legenda'   número de colunas da legenda (padrão: automático)
+
+colors = {'15%': 'blue', '20%': 'red', '30%': 'green', 'Convencional': 'black'}
+
+# --- DEFINIÇÃO DE TAMANHOS DE FONTE ---
+legend_fontsize = 11
+axis_label_fontsize = 12
+tick_label_fontsize = 10
+
+# Ajustes de figura e layout
+figure_width = 10
+figure_height = 10
+tight_layout_rect = [0.12, 0.20, 0.95, 0.93]
+
+def cor_configuracao(hybrid_degree, posicao):
+    """Cor fixa das configurações conhecidas; as demais usam o ciclo de cores do matplotlib."""
+    if hybrid_degree in colors:
+        return colors[hybrid_degree]
+    return f'C{posicao % 10}'
+
+def place_legend_below(ax, ncol=None, fontsize=legend_fontsize):
+    handles, labels = ax.get_legend_handles_labels()
+    if not handles:
+        return
+
+    num_items = len(handles)
+    if ncol is None:
+        if num_items <= 2:
+            ncol = num_items
+        elif num_items <= 4:
+            ncol = 2
+        else:
+            ncol = 3
+        if ncol == 0: ncol = 1
+
+    ax.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, -0.22),
+              ncol=ncol, fancybox=True, shadow=False, borderaxespad=0., fontsize=fontsize)
+
+def _suavizar(valores, janela, ordem, hybrid_degree, tipo='centrado'):
+    with perfil_execucao.etapa('suavizacao', hybrid_degree, len(valores)):
+        valores = (suavizar_causal if tipo == 'causal' else suavizar)(valores, janela, ordem)
+    return np.nan_to_num(valores, nan=0.0)
+
+def extrair_series(spec, dfs):
+    """Seleciona e escala as séries de uma especificação: lista de (configuração, cor, x, y)."""
+    x_col = spec.get('x', 'time')
+    y_col = spec['y']
+    escala_x = spec.get('escala_x', 1 / 60 if x_col == 'time' else 1)
+    escala_y = spec.get('escala_y', 1)
+    series = []
+    for posicao, (hybrid_degree, df) in enumerate(dfs.items()):
+        if spec.get('apenas_hibridos') and hybrid_degree == 'Convencional':
+            continue
+        if y_col not in df.columns or x_col not in df.columns:
+            continue
+        y = df[y_col].to_numpy(dtype=float)
+        if spec.get('omitir_nulas') and np.all(np.nan_to_num(y) == 0):
+            continue
+        if spec.get('suavizacao'):
+            y = _suavizar(y, *spec['suavizacao'], hybrid_degree)
+        series.append((hybrid_degree, cor_configuracao(hybrid_degree, posicao),
+                       df[x_col].to_numpy(dtype=float) * escala_x, y * escala_y))
+    return series
+
+def colunas_necessarias(especificacoes):
+    """Colunas lidas pelas especificações (para carregar apenas essas colunas dos resultados)."""
+    colunas = []
+    for spec in especificacoes:
+        for coluna in (spec.get('x', 'time'), spec['y']):
+            if coluna not in colunas:
+                colunas.append(coluna)
+    return colunas
+
+def _limites_zoom(spec, series):
+    """Limites do eixo y para as regras de zoom; None se não houver valores positivos."""
+    positivos = [y[y > 0] for _, _, _, y in series]
+    positivos = np.concatenate(positivos) if positivos else np.array([])
+    if positivos.size == 0:
+        return None
+    minimo, maximo = positivos.min(), positivos.max()
+    if spec['zoom'] == 'pico':
+        # Janela de 0,1 ponto percentual abaixo do pico e 0,02 acima
+        return max(0, maximo - 0.1), min(100, maximo + 0.02)
+    y_padding = (maximo - minimo) * 0.1
+    return max(0, minimo - y_padding), min(100, maximo + y_padding)
+
+def renderizar_figura(spec, series):
+    """Renderiza uma figura a partir da especificação e das séries já extraídas; retorna o arquivo salvo."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    limites_zoom = None
+    if spec.get('zoom'):
+        limites_zoom = _limites_zoom(spec, series)
+        if limites_zoom is None:
+            return None
+
+    fig = plt.figure(figsize=(figure_width, figure_height))
+    ax = fig.gca()
+    for hybrid_degree, cor, x, y in series:
+        rotulo = spec['rotulo_serie'].format(config=hybrid_degree)
+        if spec.get('tipo') == 'dispersao':
+            ax.scatter(x, y, color=cor, label=rotulo, alpha=0.5, s=10)
+        else:
+            ax.plot(x, y, color=cor, label=rotulo)
+    if spec.get('fonte_titulo'):
+        ax.set_title(spec['titulo'], fontsize=spec['fonte_titulo'])
+    else:
+        ax.set_title(spec['titulo'])
+    ax.set_xlabel(spec.get('rotulo_x', 'Tempo (min)'), fontsize=axis_label_fontsize)
+    ax.set_ylabel(spec['rotulo_y'], fontsize=axis_label_fontsize)
+    ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
+    ax.grid(True)
+    if limites_zoom is not None:
+        ax.set_ylim(*limites_zoom)
+    elif spec.get('ylim'):
+        ax.set_ylim(*spec['ylim'])
+    if series:
+        place_legend_below(ax, ncol=spec.get('ncol_legenda'))
+    elif spec.get('texto_vazio'):
+        ax.text(0.5, 0.5, spec['texto_vazio'], horizontalalignment='center', verticalalignment='center', transform=ax.transAxes)
+    fig.tight_layout(rect=tight_layout_rect)
+    with perfil_execucao.etapa('savefig'):
+        fig.savefig(spec['arquivo'])
+    plt.close(fig)
+    return spec['arquivo']
+
+def _renderizar_tarefa(tarefa):
+    with perfil_execucao.etapa('grafico', linhas=sum(len(x) for _, _, x, _ in tarefa[1])):
+        return renderizar_figura(*tarefa)
+
+def chave_figura(spec, series):
+    """Chave do cache de uma figura: especificação, conteúdo das séries e versão deste módulo."""
+    sha = hashlib.sha1()
+    for hybrid_degree, cor, x, y in series:
+        sha.update(f"{hybrid_degree}|{cor}|{len(x)}".encode())
+        sha.update(np.ascontiguousarray(x).tobytes())
+        sha.update(np.ascontiguousarray(y).tobytes())
+    return calcular_chave('grafico', spec, sha.hexdigest(), versao_codigo('graficos'))
+
+def renderizar_graficos(especificacoes, dfs, workers=1, usar_cache=False):
+    """Renderiza todas as especificações, em série ou em um pool de processos (backend Agg).
+
+    Com usar_cache=True, as figuras cujas séries e especificação não mudaram são copiadas do cache
+    de resultados (cache_resultados.py) em vez de renderizadas novamente.
+    Retorna a lista de arquivos salvos, na ordem das especificações.
+    """
+    return renderizar_grupos([(especificacoes, dfs)], workers=workers, usar_cache=usar_cache)
+
+def renderizar_grupos(grupos, workers=1, usar_cache=False):
+    """Como renderizar_graficos, para vários pares (especificacoes, dfs) em um único pool.
+
+    Usado quando as figuras vêm de tabelas diferentes (por exemplo, resultados de energia e de
+    exergia das mesmas configurações).
+    """
+    tarefas = [(spec, extrair_series(spec, dfs)) for especificacoes, dfs in grupos for spec in especificacoes]
+    salvos = [None] * len(tarefas)
+    chaves = {}
+    if usar_cache:
+        for i, (spec, series) in enumerate(tarefas):
+            chaves[i] = chave_figura(spec, series)
+            if restaurar(chaves[i], [spec['arquivo']]):
+                salvos[i] = spec['arquivo']
+    pendentes = [i for i in range(len(tarefas)) if salvos[i] is None]
+
+    workers = min(numero_workers(workers), max(len(pendentes), 1))
+    if workers <= 1:
+        renderizados = [_renderizar_tarefa(tarefas[i]) for i in pendentes]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            renderizados = [perfil_execucao.incorporar(resultado) for resultado in
+                            pool.map(perfil_execucao.em_processo(_renderizar_tarefa), [tarefas[i] for i in pendentes])]
+
+    for i, arquivo in zip(pendentes, renderizados):
+        salvos[i] = arquivo
+        if usar_cache and arquivo:
+            try:
+                armazenar(chaves[i], [arquivo], descricao=f"grafico {arquivo}")
+            except OSError as e:
+                logging.warning(f"Não foi possível gravar o cache de {arquivo}: {e}")
+
+    if usar_cache:
+        reaproveitados = [tarefas[i][0]['arquivo'] for i in range(len(tarefas)) if i not in pendentes]
+        imprimir_relatorio('graficos', reaproveitados, [tarefas[i][0]['arquivo'] for i in pendentes], limitar_cache())
+    return [arquivo for arquivo in salvos if arquivo]
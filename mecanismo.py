@@ -0,0 +1,75 @@
+import os
+import time
+import argparse
+import warnings
+from dados_missao import hash_arquivo
+
+# --- MECANISMO DE CINÉTICA QUÍMICA (CANTERA) ---
+# O mecanismo HyChem do Jet A (A2highT.cti, 119 espécies e 841 reações) está no
+# formato CTI, que as versões atuais do Cantera não leem mais. Na primeira vez
+# ele é convertido para YAML e guardado em .cache_mecanismo/ (a chave é o hash
+# do .cti); a partir daí cada processo apenas carrega o YAML. O objeto Solution
+# é criado sob demanda e reaproveitado por todo o processo (inclusive pelos
+# processos de um pool, um Solution por processo). O Cantera só é importado
+# quando um Solution é pedido, de modo que os scripts que não usam cinética
+# química não pagam o tempo de importação.
+
+arquivo_mecanismo = 'A2highT.cti'
+
+# Diretório dos mecanismos convertidos
+cache_dir = '.cache_mecanismo'
+
+# Solutions já criados neste processo, por arquivo YAML
+_solucoes = {}
+
+def caminho_yaml(arquivo_cti=arquivo_mecanismo):
+    """Caminho do mecanismo convertido para YAML, convertendo-o na primeira vez.
+
+    Mecanismos já em YAML (como os esqueletos gerados por reducao_mecanismo.py) são usados diretamente.
+    """
+    if os.path.splitext(arquivo_cti)[1] in ('.yaml', '.yml'):
+        return arquivo_cti
+    nome = os.path.splitext(os.path.basename(arquivo_cti))[0]
+    caminho = os.path.join(cache_dir, f"{nome}_{hash_arquivo(arquivo_cti)[:16]}.yaml")
+    if not os.path.exists(caminho):
+        from cantera import cti2yaml
+        os.makedirs(cache_dir, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        try:
+            cti2yaml.convert(arquivo_cti, temporario)
+            os.replace(temporario, caminho)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+    return caminho
+
+def obter_solucao(arquivo_cti=arquivo_mecanismo):
+    """Solution do Cantera para o mecanismo, criado uma única vez por processo.
+
+    O objeto é compartilhado: quem alterar o estado (TPX, equilibrate, ...) deve defini-lo antes de usar.
+    """
+    caminho = caminho_yaml(arquivo_cti)
+    if caminho not in _solucoes:
+        import cantera as ct
+        with warnings.catch_warnings():
+            # O HyChem tem pequenas descontinuidades nos polinômios NASA em Tmid, avisadas a cada carga
+            warnings.simplefilter('ignore', UserWarning)
+            _solucoes[caminho] = ct.Solution(caminho)
+    return _solucoes[caminho]
+
+def inicializar_processo(arquivo_cti=arquivo_mecanismo):
+    """Inicializador de ProcessPoolExecutor: carrega o mecanismo uma vez em cada processo do pool."""
+    obter_solucao(arquivo_cti)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte o mecanismo CTI para YAML (uma única vez) e mede o tempo de carga.')
+    parser.add_argument('arquivo', nargs='?', default=arquivo_mecanismo, help=f'Mecanismo CTI (padrão: {arquivo_mecanismo}).')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    caminho = caminho_yaml(args.arquivo)
+    print(f"Mecanismo YAML: {caminho} ({time.perf_counter() - inicio:.2f} s)")
+    inicio = time.perf_counter()
+    gas = obter_solucao(args.arquivo)
+    print(f"{gas.n_species} espécies, {gas.n_reactions} reações; Solution criado em {time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,230 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+# --- GERADOR DE MISSÕES SINTÉTICAS NO FORMATO DO SUAVE ---
+# Gera planilhas com exatamente as colunas de resultados_suave_*.csv (híbrida ou
+# convencional), separador ';' e decimal ',', com qualquer número de linhas. A
+# missão segue os segmentos da missão de 400 km (subida, cruzeiro, descida,
+# reserva e espera) com atmosfera padrão, descarga da bateria e o MTRB alternando
+# entre motor (subidas e cruzeiros), gerador (descidas da missão principal) e
+# desligado (descidas da reserva). Usado pelo benchmark.py.
+
+colunas_hibrido = [
+    'segment', 'time', 'altitude_m', 'mach_number', 'velocity_m_s', 'pressure_Pa', 'density_kg_m3',
+    'temperature_C', 'lift_coefficient', 'drag_coefficient', 'angle_of_attack_rad', 'flight_path_angle_rad',
+    'mass_kg', 'mass_flow_kg_s', 'CG_m', 'CG_percent', 'throttle', 'battery_energy', 'battery_voltage',
+    'battery_voltage_under_load', 'battery_voltage_open_circuit', 'state_of_charge', 'rpm', 'rpm_wtp',
+    'battery_resistive_losses', 'emotor_efficiency', 'emotorWTP_efficiency', 'combustion_engine_throttle',
+    'beta_propeller', 'eta_propeller', 'cp_propeller', 'ct_propeller', 'j_propeller', 'rpm_propeller',
+    'thrust_propeller', 'beta_propellerWTP', 'eta_propellerWTP', 'cp_propellerWTP', 'ct_propellerWTP',
+    'j_propellerWTP', 'rpm_propellerWTP', 'thrust_propellerWTP', 'power_WTP', 'propeller_rpm',
+    'battery_current', 'battery_draw', 'propeller_motor_torque', 'propeller_torque', 'battery_specfic_power',
+    'propeller_tip_mach', 'propeller_power_coefficient', 'gas_turbine_p3', 'gas_turbine_t3', 'gas_turbine_far',
+    'electric_throttle', 'electric_throttle_WTP', 'disc_loading', 'power_loading', 'propeller_thrust', 'power',
+    'heat_load_vcs', 'tms_mdot_air_vcs', 'heat_load_liquid', 'tms_mdot_air_liquid', 'thrust_turboprop',
+    'thrust_WTP', 'power_propeller_turboprop', 'power_turboshaft', 'power_motor_turboprop',
+    'power_propeller_WTP', 'propellerWTP_tip_mach', 'co_emissions_index', 'co2_emissions_index',
+    'nox_emissions_index', 'co_emissions_total', 'co2_emissions_total', 'nox_emissions_total', 'l_over_d',
+    'weight', 'lift', 'drag'
+]
+
+colunas_convencional = [
+    'segment', 'time', 'altitude_m', 'mach_number', 'velocity_m_s', 'pressure_Pa', 'density_kg_m3',
+    'temperature_C', 'lift_coefficient', 'drag_coefficient', 'angle_of_attack_rad', 'flight_path_angle_rad',
+    'mass_kg', 'mass_flow_kg_s', 'CG_m', 'CG_percent', 'combustion_engine_throttle', 'battery_energy',
+    'battery_voltage', 'battery_voltage_under_load', 'battery_voltage_open_circuit', 'state_of_charge', 'rpm',
+    'etap', 'propeller_rpm', 'propeller_torque', 'propeller_motor_torque', 'propeller_power_coefficient',
+    'power_turboshaft', 'propeller_tip_mach', 'motor_torque', 'gas_turbine_p3', 'gas_turbine_t3',
+    'gas_turbine_far', 'disc_loading', 'power_loading', 'thrust_propeller', 'co_emissions_index',
+    'co2_emissions_index', 'nox_emissions_index', 'co_emissions_total', 'co2_emissions_total',
+    'nox_emissions_total', 'l_over_d', 'weight', 'lift', 'drag', 'electric_throttle', 'power'
+]
+
+# Segmentos da missão: (nome, duração (s), altitude inicial e final (m), velocidade (m/s),
+# potência de eixo total (W), manete do motor térmico, eficiência da hélice, L/D, modo do MTRB)
+segmentos = [
+    ('climb_1', 72.2, 0.0, 457.2, 82.31, 3.093e6, 0.90, 0.849, 9.5, 'motor'),
+    ('climb_2', 81.3, 457.2, 1219.2, 85.91, 2.975e6, 0.90, 0.855, 11.0, 'motor'),
+    ('climb_3', 108.4, 1219.2, 2133.6, 89.00, 2.807e6, 0.90, 0.859, 12.5, 'motor'),
+    ('climb_4', 80.4, 2133.6, 2743.2, 92.60, 2.662e6, 0.90, 0.863, 13.5, 'motor'),
+    ('climb_5', 89.0, 2743.2, 3352.8, 95.48, 2.541e6, 0.90, 0.866, 14.5, 'motor'),
+    ('climb_6', 99.4, 3352.8, 3962.4, 98.46, 2.424e6, 0.90, 0.869, 15.0, 'motor'),
+    ('climb_7', 112.6, 3962.4, 4572.0, 101.60, 2.312e6, 0.90, 0.871, 15.5, 'motor'),
+    ('climb_8', 130.6, 4572.0, 5181.6, 104.84, 2.196e6, 0.90, 0.873, 16.0, 'motor'),
+    ('cruise', 1902.8, 5181.6, 5181.6, 125.00, 1.650e6, 0.71, 0.860, 17.0, 'motor'),
+    ('descent_5', 93.2, 5181.6, 4572.0, 104.84, 1.258e5, 0.15, 0.126, 16.5, 'gerador'),
+    ('descent_6', 97.8, 4572.0, 3962.4, 101.60, 1.444e5, 0.15, 0.223, 16.5, 'gerador'),
+    ('descent_7', 102.5, 3962.4, 3352.8, 98.46, 1.622e5, 0.15, 0.290, 16.5, 'gerador'),
+    ('descent_8', 107.6, 3352.8, 2743.2, 95.48, 1.813e5, 0.15, 0.346, 16.5, 'gerador'),
+    ('descent_9', 112.9, 2743.2, 2133.6, 92.60, 2.002e5, 0.15, 0.387, 16.0, 'gerador'),
+    ('descent_10', 180.3, 2133.6, 1219.2, 89.00, 2.237e5, 0.15, 0.425, 16.0, 'gerador'),
+    ('descent_11', 159.6, 1219.2, 457.2, 85.91, 2.500e5, 0.15, 0.451, 15.5, 'gerador'),
+    ('descent_12', 148.0, 457.2, 0.0, 59.04, 5.878e5, 0.24, 0.734, 10.0, 'gerador'),
+    ('reserve_climb_1', 43.8, 0.0, 457.2, 82.31, 3.093e6, 0.90, 0.849, 9.5, 'motor'),
+    ('reserve_climb_2', 78.4, 457.2, 1219.2, 85.91, 2.975e6, 0.90, 0.855, 11.0, 'motor'),
+    ('reserve_climb_3', 104.2, 1219.2, 2133.6, 89.00, 2.807e6, 0.90, 0.859, 12.5, 'motor'),
+    ('reserve_climb_4', 77.2, 2133.6, 2743.2, 92.60, 2.662e6, 0.90, 0.863, 13.5, 'motor'),
+    ('reserve_climb_5', 85.2, 2743.2, 3352.8, 95.48, 2.541e6, 0.90, 0.866, 14.5, 'motor'),
+    ('reserve_cruise', 944.9, 3352.8, 3352.8, 96.72, 1.183e6, 0.48, 0.829, 16.5, 'motor'),
+    ('reserve_descent_3', 107.4, 3352.8, 2743.2, 95.48, 1.813e5, 0.15, 0.346, 16.5, 'desligado'),
+    ('reserve_descent_4', 112.8, 2743.2, 2133.6, 92.60, 2.002e5, 0.15, 0.387, 16.0, 'desligado'),
+    ('reserve_descent_5', 180.1, 2133.6, 1219.2, 89.00, 2.237e5, 0.15, 0.425, 16.0, 'desligado'),
+    ('reserve_descent_6', 159.5, 1219.2, 457.2, 85.91, 2.500e5, 0.15, 0.451, 15.5, 'desligado'),
+    ('reserve_descent_7', 149.0, 457.2, 0.0, 58.63, 5.777e5, 0.23, 0.732, 10.0, 'desligado'),
+    ('hold', 1800.0, 457.2, 457.2, 113.18, 1.718e6, 0.53, 0.834, 16.0, 'motor'),
+]
+
+# Constantes do gerador
+area_asa_m2 = 43.0
+diametro_helice_m = 4.23
+potencia_MTRB_W = 168188.42
+potencia_WTP_W = 154964.45
+consumo_bateria_motor_W = 14900.0
+recarga_bateria_gerador_W = 8000.0
+consumo_bateria_ocioso_W = 422.0
+
+def _atmosfera_padrao(altitude_m):
+    """Temperatura (K), pressão (Pa) e densidade (kg/m3) da atmosfera padrão na troposfera."""
+    T = 288.15 - 0.0065 * altitude_m
+    P = 101325 * (T / 288.15) ** 5.2559
+    return T, P, P / (287.05 * T)
+
+def _tabela_segmentos():
+    tabela = pd.DataFrame(segmentos, columns=['segment', 'duracao', 'h0', 'h1', 'velocidade', 'potencia',
+                                              'manete', 'eta_helice', 'l_over_d', 'modo_MTRB'])
+    tabela['t0'] = np.concatenate([[0.0], np.cumsum(tabela['duracao'].to_numpy())[:-1]])
+    return tabela
+
+def gerar_bloco(inicio, fim, n_linhas, hybrid_degree='15%', seed=0, estado=None):
+    """Gera as linhas [inicio, fim) de uma missão sintética de n_linhas linhas.
+
+    As grandezas acumuladas (energia da bateria, combustível consumido) são carregadas entre blocos
+    consecutivos em estado; blocos gerados em ordem reproduzem a missão completa.
+    """
+    estado = {} if estado is None else estado
+    is_conventional = hybrid_degree == 'Convencional'
+    escala_bateria = 0.0 if is_conventional else float(str(hybrid_degree).rstrip('%')) / 15
+    rng = np.random.default_rng([seed, inicio])
+    tabela = _tabela_segmentos()
+
+    duracao_total = tabela['duracao'].sum()
+    dt = duracao_total / max(n_linhas - 1, 1)
+    time = np.arange(inicio, fim) * dt
+    i_seg = np.clip(np.searchsorted(tabela['t0'].to_numpy(), time, side='right') - 1, 0, len(tabela) - 1)
+    seg = {col: tabela[col].to_numpy()[i_seg] for col in tabela.columns}
+    fracao = np.clip((time - seg['t0']) / seg['duracao'], 0, 1)
+    ruido = 1 + 0.01 * rng.standard_normal(len(time))
+
+    altitude = seg['h0'] + (seg['h1'] - seg['h0']) * fracao
+    T, P, rho = _atmosfera_padrao(altitude)
+    velocidade = seg['velocidade'] * (1 + 0.002 * rng.standard_normal(len(time)))
+    gamma = np.arctan((seg['h1'] - seg['h0']) / seg['duracao'] / velocidade)
+    manete = seg['manete']
+    power = seg['potencia'] * ruido
+
+    # Sistema elétrico: MTRB como motor, gerador ou desligado (sinal de torque e corrente invertidos)
+    motor = (seg['modo_MTRB'] == 'motor') & (not is_conventional)
+    gerador = (seg['modo_MTRB'] == 'gerador') & (not is_conventional)
+    power_motor = np.where(motor, potencia_MTRB_W, np.where(gerador, -0.5 * potencia_MTRB_W, 0.0))
+    power_WTP = np.where(motor, potencia_WTP_W, 0.0)
+    battery_draw = escala_bateria * np.where(motor, -consumo_bateria_motor_W * ruido,
+                                             np.where(gerador, recarga_bateria_gerador_W, -consumo_bateria_ocioso_W))
+    energia_inicial = 98056335.0 * escala_bateria
+    battery_energy = estado.get('battery_energy', energia_inicial) + np.cumsum(battery_draw * dt)
+    estado['battery_energy'] = battery_energy[-1] if len(time) else estado.get('battery_energy', energia_inicial)
+
+    power_propeller = power - power_WTP
+    power_turboshaft = power_propeller - power_motor
+    mass_flow = 0.045 + 0.06 * power_turboshaft / 1e6
+    combustivel = estado.get('combustivel', 0.0) + np.cumsum(mass_flow * dt)
+    estado['combustivel'] = combustivel[-1] if len(time) else estado.get('combustivel', 0.0)
+    mass = (17996.65 if is_conventional else 18044.90) - combustivel
+
+    rpm = np.full(len(time), 1200.0 if is_conventional else 1039.679068)
+    n_rps = rpm / 60
+    eta_helice = seg['eta_helice']
+    thrust_propeller = eta_helice * power_propeller / velocidade
+    eta_WTP = np.where(motor, 0.834, 0.0)
+    thrust_WTP = np.where(motor, eta_WTP * power_WTP / velocidade, -50.0 if not is_conventional else 0.0)
+    weight = mass * 9.81
+    lift = weight * np.cos(gamma)
+    cl = lift / (0.5 * rho * velocidade ** 2 * area_asa_m2)
+    soc = np.where(energia_inicial > 0, 0.95 * battery_energy / max(energia_inicial, 1), 0.0)
+    v_carga = np.where(escala_bateria > 0, 715 + 79 * soc, 0.0)
+    corrente = np.abs(battery_draw) / np.where(v_carga > 0, v_carga, 1)
+    perdas_bateria = 0.066 * corrente ** 2
+    indice_co = 6.53 - 6.0 * (manete - 0.15)
+    indice_nox = 6.0 + 14.6 * (manete - 0.15)
+    a_som = np.sqrt(1.4 * 287.05 * T)
+    j = velocidade / (n_rps * diametro_helice_m)
+    cp = power_propeller / (rho * n_rps ** 3 * diametro_helice_m ** 5)
+    ct = thrust_propeller / (rho * n_rps ** 2 * diametro_helice_m ** 4)
+    propeller_torque = power_propeller / (2 * np.pi * n_rps)
+    eletrico = np.where(motor | gerador, 1.0, 0.0)
+
+    dados = {
+        'segment': seg['segment'], 'time': time, 'altitude_m': altitude,
+        'mach_number': velocidade / a_som, 'velocity_m_s': velocidade, 'pressure_Pa': P, 'density_kg_m3': rho,
+        'temperature_C': T,  # o SUAVE exporta a temperatura em K nesta coluna
+        'lift_coefficient': cl, 'drag_coefficient': cl / seg['l_over_d'], 'angle_of_attack_rad': cl / 9.7,
+        'flight_path_angle_rad': gamma, 'mass_kg': mass, 'mass_flow_kg_s': mass_flow,
+        'CG_m': 9.36 - 1e-5 * combustivel, 'CG_percent': 21.34 - 1e-3 * combustivel, 'throttle': manete,
+        'combustion_engine_throttle': manete, 'battery_energy': battery_energy, 'battery_voltage': 0.0,
+        'battery_voltage_under_load': v_carga, 'battery_voltage_open_circuit': v_carga * 1.0016,
+        'state_of_charge': soc, 'rpm': rpm, 'rpm_wtp': 3718.666711, 'battery_resistive_losses': perdas_bateria,
+        'emotor_efficiency': 0.970731783 * eletrico, 'emotorWTP_efficiency': np.where(motor, 0.97065007, 0.0),
+        'beta_propeller': 15 + 10 * j, 'eta_propeller': eta_helice, 'etap': eta_helice, 'cp_propeller': cp,
+        'ct_propeller': ct, 'j_propeller': j, 'rpm_propeller': rpm, 'thrust_propeller': thrust_propeller,
+        'beta_propellerWTP': 16 + 10 * j, 'eta_propellerWTP': eta_WTP, 'cp_propellerWTP': 0.24 * eletrico,
+        'ct_propellerWTP': np.where(motor, 0.17, -0.007), 'j_propellerWTP': j, 'rpm_propellerWTP': 3718.666711,
+        'thrust_propellerWTP': thrust_WTP, 'power_WTP': power_WTP, 'propeller_rpm': rpm,
+        'battery_current': corrente, 'battery_draw': battery_draw,
+        'propeller_motor_torque': propeller_torque if is_conventional else -power_motor / 2618.0,
+        'propeller_torque': propeller_torque, 'motor_torque': propeller_torque,
+        'battery_specfic_power': np.abs(battery_draw) / 147.0,
+        'propeller_tip_mach': n_rps * np.pi * diametro_helice_m / a_som, 'propeller_power_coefficient': cp,
+        'gas_turbine_p3': (3 + 17.5 * manete) * (P / 101325) ** 0.35, 'gas_turbine_t3': 520 + 230 * manete,
+        'gas_turbine_far': 0.0155 + 0.0097 * manete, 'electric_throttle': -eletrico,
+        'electric_throttle_WTP': np.where(motor, 1.0, 0.0), 'disc_loading': thrust_propeller / 12.69,
+        'power_loading': 2.215 * thrust_propeller / power_propeller, 'propeller_thrust': 2.215 * thrust_propeller,
+        'power': power, 'heat_load_vcs': 5.2 * perdas_bateria, 'tms_mdot_air_vcs': 1e-4 * perdas_bateria,
+        'heat_load_liquid': np.where(motor, 6573.100317, 0.0), 'tms_mdot_air_liquid': np.where(motor, 0.14, 0.00116),
+        'thrust_turboprop': thrust_propeller, 'thrust_WTP': thrust_WTP, 'power_propeller_turboprop': power_propeller,
+        'power_turboshaft': power_turboshaft, 'power_motor_turboprop': power_motor,
+        'power_propeller_WTP': power_WTP, 'propellerWTP_tip_mach': n_rps * np.pi * diametro_helice_m / a_som,
+        'co_emissions_index': indice_co, 'co2_emissions_index': 3160.0, 'nox_emissions_index': indice_nox,
+        'co_emissions_total': indice_co * combustivel / 1000, 'co2_emissions_total': 3.16 * combustivel,
+        'nox_emissions_total': indice_nox * combustivel / 1000, 'l_over_d': seg['l_over_d'],
+        'weight': weight, 'lift': lift, 'drag': lift / seg['l_over_d'],
+    }
+    colunas = colunas_convencional if is_conventional else colunas_hibrido
+    df = pd.DataFrame({col: np.broadcast_to(dados[col], len(time)) for col in colunas})
+    df.index = pd.RangeIndex(inicio, fim)
+    return df
+
+def gerar_missao_sintetica(n_linhas, hybrid_degree='15%', seed=0):
+    """Missão sintética completa em memória (DataFrame com as colunas da planilha do SUAVE)."""
+    return gerar_bloco(0, n_linhas, n_linhas, hybrid_degree, seed)
+
+def escrever_missao_sintetica(file_path, n_linhas, hybrid_degree='15%', seed=0, linhas_por_bloco=200000):
+    """Grava uma missão sintética de n_linhas linhas no formato do SUAVE, em blocos para limitar a memória."""
+    estado = {}
+    for inicio in range(0, n_linhas, linhas_por_bloco):
+        fim = min(inicio + linhas_por_bloco, n_linhas)
+        bloco = gerar_bloco(inicio, fim, n_linhas, hybrid_degree, seed, estado)
+        bloco.to_csv(file_path, sep=';', decimal=',', mode='w' if inicio == 0 else 'a', header=(inicio == 0))
+    return file_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera uma missão sintética no formato das planilhas do SUAVE.')
+    parser.add_argument('linhas', type=int, help='Número de linhas da missão.')
+    parser.add_argument('--configuracao', default='15%', help="Grau de hibridização ('15%%', '20%%', '30%%') ou 'Convencional'.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', default=None, help='Arquivo de saída (padrão: missao_sintetica_<configuração>_<linhas>.csv).')
+    args = parser.parse_args()
+
+    saida = args.saida or f"missao_sintetica_{args.configuracao.replace('%', '')}_{args.linhas}.csv"
+    escrever_missao_sintetica(saida, args.linhas, args.configuracao, args.seed)
+    print(f"Missão sintética com {args.linhas} linhas salva em {saida}")
@@ -0,0 +1,134 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from dados_missao import files
+from alinhamento_missoes import carregar_saidas, alinhar_configuracoes, pontos_por_segmento
+
+# --- MODELO SUBSTITUTO EM FUNÇÃO DO GRAU DE HIBRIDIZAÇÃO ---
+# Só há missões do SUAVE para 15%, 20%, 30% e a aeronave convencional (tratada
+# como 0% de hibridização). Para responder por outros graus (25%, 40%, ...)
+# sem novas simulações, as saídas das análises energética e exergética de cada
+# configuração são alinhadas em uma base comum (alinhamento_missoes.py, modo
+# 'fases': pontos_por_segmento instantes igualmente espaçados dentro de cada
+# segmento da missão, com o próprio tempo como uma das saídas) e, em cada
+# ponto da base, cada coluna é aproximada em função do grau de hibridização.
+# Os dois métodos são lineares nos dados: a previsão para qualquer grau é uma
+# combinação ponderada das configurações conhecidas (pesos), de modo que cada
+# consulta custa milissegundos:
+#   'linear'     interpolação linear por partes (extrapolação pelo último trecho);
+#   'quadratico' polinômio de grau até 2 ajustado por mínimos quadrados.
+# O erro de interpolação é estimado por validação cruzada deixando uma
+# configuração de fora (leave-one-out). As saídas das configurações conhecidas
+# ficam no cache de resultados (cache_resultados.py).
+
+metodos = ['linear', 'quadratico']
+
+def grau_hibridizacao(rotulo):
+    """Grau de hibridização (%) de uma configuração: '15%' -> 15.0; 'Convencional' -> 0.0."""
+    return 0.0 if rotulo == 'Convencional' else float(rotulo.rstrip('%'))
+
+def montar_modelo(files=files, pontos=pontos_por_segmento, workers=1, usar_cache=True):
+    """Base do modelo: configurações alinhadas, com os graus de hibridização em ordem crescente.
+
+    Retorna um dicionário com 'graus' (K,), 'rotulos', 'base' (segment e u de cada ponto), 'colunas'
+    e 'valores' (K, pontos da base, colunas).
+    """
+    tabela = alinhar_configuracoes(carregar_saidas(files, workers, usar_cache), 'time', 'fases', pontos)
+    rotulos = sorted(dict.fromkeys(tabela['configuracao']), key=grau_hibridizacao)
+    colunas = [col for col in tabela.columns if col not in ('configuracao', 'segment', 'u')]
+    primeira = tabela[tabela['configuracao'] == rotulos[0]]
+    return {
+        'graus': np.array([grau_hibridizacao(rotulo) for rotulo in rotulos]),
+        'rotulos': rotulos,
+        'base': primeira[['segment', 'u']].reset_index(drop=True),
+        'colunas': colunas,
+        'valores': np.stack([tabela.loc[tabela['configuracao'] == rotulo, colunas].to_numpy(dtype=float)
+                             for rotulo in rotulos]),
+    }
+
+def pesos(graus, h, metodo='quadratico'):
+    """Pesos (len(h), K) das configurações conhecidas na previsão para os graus h."""
+    graus = np.asarray(graus, dtype=float)
+    h = np.atleast_1d(np.asarray(h, dtype=float))
+    if metodo == 'quadratico':
+        grau_polinomio = min(2, len(graus) - 1)
+        return np.vander(h, grau_polinomio + 1) @ np.linalg.pinv(np.vander(graus, grau_polinomio + 1))
+    if metodo != 'linear':
+        raise ValueError(f"Método desconhecido: {metodo}. Opções: {', '.join(metodos)}")
+    if len(graus) == 1:
+        return np.ones((len(h), 1))
+    # Trecho de cada h (os das pontas são prolongados para a extrapolação)
+    i = np.clip(np.searchsorted(graus, h) - 1, 0, len(graus) - 2)
+    fracao = (h - graus[i]) / (graus[i + 1] - graus[i])
+    w = np.zeros((len(h), len(graus)))
+    w[np.arange(len(h)), i] = 1 - fracao
+    w[np.arange(len(h)), i + 1] = fracao
+    return w
+
+def prever(modelo, h, metodo='quadratico'):
+    """Saídas alinhadas previstas para os graus de hibridização h: DataFrame com hybrid_degree, segment, u e as colunas."""
+    h = np.atleast_1d(np.asarray(h, dtype=float))
+    K, P, C = modelo['valores'].shape
+    previstos = (pesos(modelo['graus'], h, metodo) @ modelo['valores'].reshape(K, -1)).reshape(len(h) * P, C)
+    tabela = pd.DataFrame(previstos, columns=modelo['colunas'])
+    tabela.insert(0, 'u', np.tile(modelo['base']['u'].to_numpy(), len(h)))
+    tabela.insert(0, 'segment', np.tile(modelo['base']['segment'].to_numpy(), len(h)))
+    tabela.insert(0, 'hybrid_degree', np.repeat(h, P))
+    return tabela
+
+def validacao_cruzada(modelo, metodo='quadratico'):
+    """Erro leave-one-out: cada configuração é prevista pelas demais.
+
+    Retorna um DataFrame (configuração x coluna) com o erro RMS normalizado pela amplitude da coluna
+    na configuração deixada de fora (NaN nas colunas constantes nela).
+    """
+    graus, valores = modelo['graus'], modelo['valores']
+    erros = {}
+    for k, rotulo in enumerate(modelo['rotulos']):
+        demais = np.arange(len(graus)) != k
+        previsto = np.tensordot(pesos(graus[demais], graus[k], metodo)[0], valores[demais], axes=1)
+        real = valores[k]
+        amplitude = real.max(axis=0) - real.min(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            erros[rotulo] = np.sqrt(np.mean((previsto - real)**2, axis=0)) / np.where(amplitude > 0, amplitude, np.nan)
+    return pd.DataFrame(erros, index=modelo['colunas']).T
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Modelo substituto das saídas de energia e exergia em função do grau de hibridização.')
+    parser.add_argument('graus', nargs='*', type=float, default=[25.0],
+                        help='Graus de hibridização (%%) a prever (padrão: 25).')
+    parser.add_argument('--metodo', choices=metodos, default='quadratico', help='Método de interpolação (padrão: quadratico).')
+    parser.add_argument('--pontos', type=int, default=pontos_por_segmento,
+                        help=f'Pontos da base comum por segmento da missão (padrão: {pontos_por_segmento}).')
+    parser.add_argument('--sem-convencional', action='store_true', help='Não usa a aeronave convencional como 0%% de hibridização.')
+    parser.add_argument('--colunas', nargs='*', default=['eta_ex_total', 'B_Dest_Bat_kW', 'global_efficiency'],
+                        help='Colunas destacadas no relatório da validação cruzada.')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos (padrão: 1; 0 = todos os núcleos).')
+    parser.add_argument('--sem-cache', action='store_true', help='Recalcula as análises das configurações conhecidas.')
+    args = parser.parse_args()
+
+    configuracoes = {rotulo: arquivo for rotulo, arquivo in files.items()
+                     if not (args.sem_convencional and rotulo == 'Convencional')}
+    inicio = time.perf_counter()
+    modelo = montar_modelo(configuracoes, args.pontos, args.workers, usar_cache=not args.sem_cache)
+    print(f"Base: {', '.join(modelo['rotulos'])} ({modelo['valores'].shape[1]} pontos, {len(modelo['colunas'])} colunas) "
+          f"em {time.perf_counter() - inicio:.2f} s")
+
+    print("Validação cruzada (leave-one-out), erro RMS / amplitude da coluna:")
+    for metodo in metodos:
+        erros = validacao_cruzada(modelo, metodo)
+        destaques = [col for col in args.colunas if col in erros.columns]
+        print(f"  {metodo}: mediana das colunas por configuração deixada de fora: "
+              + ", ".join(f"{rotulo} {100 * erros.loc[rotulo].median():.1f}%" for rotulo in erros.index))
+        print(erros[destaques].map(lambda v: f"{100 * v:.1f}%").to_string().replace('\n', '\n    ').join(['    ', '']))
+
+    for h in args.graus:
+        inicio = time.perf_counter()
+        previsao = prever(modelo, h, args.metodo)
+        duracao_ms = 1000 * (time.perf_counter() - inicio)
+        aviso = ' (extrapolação)' if not modelo['graus'].min() <= h <= modelo['graus'].max() else ''
+        output_filename = f"substituto_{h:g}.csv"
+        previsao.to_csv(output_filename, sep=";", decimal=",", index=False)
+        print(f"{h:g}%{aviso}: previsto em {duracao_ms:.1f} ms, salvo em {output_filename}")
@@ -0,0 +1,151 @@
+import argparse
+import numpy as np
+import pandas as pd
+from analise_exergetica import calcular_balancos_exergeticos, integrar_no_tempo, preparar_deltas_bateria
+from dados_missao import files, carregar_missao
+from resumo_exergia import parcelas_util, parcelas_entrada
+
+# --- PROPAGAÇÃO DE INCERTEZAS POR MONTE CARLO ---
+# Sorteia N conjuntos das constantes incertas do modelo (exergia química do
+# combustível, extrações auxiliares, eficiência do inversor, temperaturas de
+# operação dos motores, ...) e avalia todos em lotes com o broadcasting de
+# calcular_balancos_exergeticos, reportando percentis por instante de tempo e
+# as distribuições das grandezas integradas na missão. Os balanços são locais a
+# cada linha (com os deltas da bateria já calculados), então a missão é
+# percorrida em blocos de linhas: apenas as séries (amostras x linhas) de um
+# bloco ficam em memória, e as integrais na missão são somadas bloco a bloco.
+
+# Distribuições padrão: (tipo, parâmetros). Tipos: 'normal' (média, desvio),
+# 'uniforme' (mínimo, máximo), 'triangular' (mínimo, moda, máximo), 'constante' (valor)
+distribuicoes_padrao = {
+    'b_fuel_kJ_kg': ('normal', 45673, 0.01 * 45673),
+    'W_Mec_Hydraulic_kW': ('uniforme', 0.9 * 14.914, 1.1 * 14.914),
+    'W_Electric_kW_aux_engine': ('uniforme', 0.9 * 14.914, 1.1 * 14.914),
+    'assumed_inverter_efficiency': ('triangular', 0.93, 0.95, 0.97),
+    'T_motor_op_K': ('uniforme', 100 + 273.15, 150 + 273.15),
+}
+
+# Grandezas com percentis por instante de tempo
+metricas_padrao = [
+    'eta_ex_total', 'B_Perda_Dest_Engine_kW', 'B_Perda_Dest_Gearbox_kW', 'B_Perda_Dest_Prop_SysTermico_kW',
+    'B_Dest_Bat_kW', 'B_Dest_Inverter_kW', 'B_Dest_Motor_MTRB_kW', 'B_Dest_Motor_WTP_kW', 'B_Perda_Dest_WTP_kW',
+]
+
+# Valores (amostras x linhas) de cada série mantidos em memória por bloco de linhas
+elementos_por_bloco = 1_000_000
+
+def nome_integrado(metrica):
+    """Nome da grandeza integrada na missão: B_Dest_Bat_kW -> B_Dest_Bat_MJ."""
+    return metrica[:-len('_kW')] + '_MJ'
+
+def amostrar(distribuicoes, n_amostras, seed=None):
+    """Sorteia n_amostras valores de cada parâmetro segundo as distribuições especificadas."""
+    rng = np.random.default_rng(seed)
+    amostras = {}
+    for nome, (tipo, *args) in distribuicoes.items():
+        if tipo == 'normal':
+            amostras[nome] = rng.normal(args[0], args[1], n_amostras)
+        elif tipo == 'uniforme':
+            amostras[nome] = rng.uniform(args[0], args[1], n_amostras)
+        elif tipo == 'triangular':
+            amostras[nome] = rng.triangular(args[0], args[1], args[2], n_amostras)
+        elif tipo == 'constante':
+            amostras[nome] = np.full(n_amostras, float(args[0]))
+        else:
+            raise ValueError(f"Distribuição desconhecida para {nome}: {tipo}")
+    tabela = pd.DataFrame(amostras)
+    tabela.index.name = 'amostra'
+    return tabela
+
+def propagar_incerteza(df_input, hybrid_degree, distribuicoes=None, n_amostras=10000, metricas=None,
+                       percentis=(5, 50, 95), tamanho_lote=1000, seed=None, linhas_bloco=None):
+    """Executa o Monte Carlo sobre uma missão (normalizada e com os deltas da bateria).
+
+    A missão é avaliada em blocos de linhas_bloco linhas (padrão: elementos_por_bloco / n_amostras),
+    o que limita a memória a (n_amostras, linhas_bloco) por métrica, qualquer que seja o tamanho da missão.
+
+    Retorna um dicionário com:
+      'amostras': DataFrame com os parâmetros sorteados;
+      'temporal': DataFrame com segment, time e os percentis de cada métrica por instante ('<metrica>_p<q>');
+      'integrados': DataFrame (uma linha por amostra) com a exergia destruída integrada na missão (MJ)
+                    e a eficiência exergética da missão (eta_ex_total_missao);
+      'resumo': percentis das grandezas integradas.
+    """
+    distribuicoes = distribuicoes_padrao if distribuicoes is None else distribuicoes
+    metricas = list(metricas or metricas_padrao)
+    amostras = amostrar(distribuicoes, n_amostras, seed)
+    time_s = df_input['time'].to_numpy(dtype=float)
+    n = len(df_input)
+
+    linhas_bloco = max(2, linhas_bloco or elementos_por_bloco // n_amostras)
+
+    integrados = {nome_integrado(metrica): np.zeros(n_amostras) for metrica in metricas if metrica.endswith('_kW')}
+    util_MJ, entrada_MJ = np.zeros(n_amostras), np.zeros(n_amostras)
+    temporal = {'segment': df_input['segment'].to_numpy(), 'time': time_s}
+    temporal.update({f'{metrica}_p{q:g}': np.empty(n) for metrica in metricas for q in percentis})
+
+    for inicio_linhas in range(0, n, linhas_bloco):
+        fim_linhas = min(inicio_linhas + linhas_bloco, n)
+        # O bloco inclui a última linha do anterior, para que a soma das integrais (trapézio) cubra a missão inteira
+        primeira = max(inicio_linhas - 1, 0)
+        bloco = df_input.iloc[primeira:fim_linhas]
+        time_bloco = time_s[primeira:fim_linhas]
+        series = {metrica: np.empty((n_amostras, len(bloco))) for metrica in metricas}
+
+        for inicio in range(0, n_amostras, tamanho_lote):
+            lote = amostras.iloc[inicio:inicio + tamanho_lote]
+            fim = inicio + len(lote)
+            parametros = {nome: lote[nome].to_numpy()[:, None] for nome in lote.columns}
+            r = calcular_balancos_exergeticos(bloco, hybrid_degree, parametros)
+            forma = (len(lote), len(bloco))
+            for metrica in metricas:
+                series[metrica][inicio:fim] = np.broadcast_to(r[metrica], forma)
+                if metrica.endswith('_kW'):
+                    integrados[nome_integrado(metrica)][inicio:fim] += integrar_no_tempo(series[metrica][inicio:fim], time_bloco)
+
+            # Eficiência exergética da missão: exergia útil integrada / exergia de entrada integrada
+            util = sum(np.broadcast_to(r[parcela], forma) for parcela in parcelas_util)
+            entrada = sum(np.broadcast_to(r[parcela], forma) for parcela in parcelas_entrada)
+            util_MJ[inicio:fim] += integrar_no_tempo(util, time_bloco)
+            entrada_MJ[inicio:fim] += integrar_no_tempo(entrada, time_bloco)
+
+        deslocamento = inicio_linhas - primeira
+        for metrica in metricas:
+            valores_percentis = np.percentile(series[metrica][:, deslocamento:], percentis, axis=0)
+            for q, valores in zip(percentis, valores_percentis):
+                temporal[f'{metrica}_p{q:g}'][inicio_linhas:fim_linhas] = valores
+
+    temporal = pd.DataFrame(temporal)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eta_missao = np.where(entrada_MJ > 0, util_MJ / entrada_MJ, 0)
+
+    df_integrados = pd.DataFrame(integrados, index=amostras.index)
+    df_integrados['eta_ex_total_missao'] = eta_missao
+    resumo = df_integrados.quantile([q / 100 for q in percentis]).T
+    resumo.columns = [f'p{q:g}' for q in percentis]
+    resumo.insert(0, 'media', df_integrados.mean())
+    resumo.insert(1, 'desvio', df_integrados.std())
+
+    return {'amostras': amostras, 'temporal': temporal, 'integrados': df_integrados, 'resumo': resumo}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Propagação de incertezas por Monte Carlo na análise exergética.')
+    parser.add_argument('configuracoes', nargs='*', default=list(files),
+                        help=f"Configurações a analisar (padrão: {', '.join(files)}).".replace('%', '%%'))
+    parser.add_argument('--amostras', type=int, default=10000, help='Número de amostras (padrão: 10000).')
+    parser.add_argument('--seed', type=int, default=None, help='Semente do gerador aleatório.')
+    parser.add_argument('--lote', type=int, default=1000, help='Amostras avaliadas por lote (limita a memória).')
+    parser.add_argument('--linhas', type=int, default=None,
+                        help=f'Linhas da missão por bloco (padrão: {elementos_por_bloco} / amostras; limita a memória).')
+    args = parser.parse_args()
+
+    for hybrid_degree in args.configuracoes:
+        file_path = files[hybrid_degree]
+        df_input = preparar_deltas_bateria(carregar_missao(file_path, hybrid_degree), file_path)
+        resultado = propagar_incerteza(df_input, hybrid_degree, n_amostras=args.amostras,
+                                       tamanho_lote=args.lote, seed=args.seed, linhas_bloco=args.linhas)
+        sufixo = hybrid_degree.replace('%', '')
+        resultado['temporal'].to_csv(f"incerteza_exergia_{sufixo}.csv", sep=";", decimal=",", index=False)
+        resultado['resumo'].to_csv(f"incerteza_exergia_missao_{sufixo}.csv", sep=";", decimal=",", index_label='grandeza')
+        print(f"Monte Carlo ({args.amostras} amostras) para {hybrid_degree}:")
+        print(resultado['resumo'].to_string(float_format=lambda v: f"{v:.4g}"))
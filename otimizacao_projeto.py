@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import argparse
+from functools import partial
+import numpy as np
+import pandas as pd
+from dados_missao import files, carregar_missao, hash_arquivo
+from execucao_paralela import executar_configuracoes
+from cache_resultados import calcular_chave, versao_codigo
+from analise_exergetica import calcular_balancos_exergeticos, integrar_no_tempo, parametros_modelo, preparar_deltas_bateria, preparar_equilibrio
+from resumo_exergia import componentes_destruicao, parcelas_util, parcelas_entrada
+
+# --- OTIMIZAÇÃO DO PROJETO (HIBRIDIZAÇÃO E EFICIÊNCIAS DOS COMPONENTES) ---
+# Procura, com evolução diferencial (scipy.optimize.differential_evolution), os
+# valores das variáveis de projeto que minimizam a exergia destruída integrada
+# na missão ou maximizam a eficiência exergética da missão (mesmas definições
+# de resumo_exergia.py), usando os balanços de analise_exergetica.py como
+# função objetivo. O grau de hibridização só existe nas configurações com
+# missão do SUAVE, então ele é uma variável discreta: cada configuração é
+# otimizada nas variáveis contínuas (em paralelo, uma configuração por
+# processo com --workers) e a melhor é escolhida ao final. Em cada geração a
+# população inteira é avaliada de uma vez por broadcasting (como em
+# varredura_parametrica.py).
+#
+# As variáveis são arredondadas em resolucao antes da avaliação, e cada ponto
+# visitado fica memorizado em .cache_otimizacao/ (por planilha, constantes
+# fixas do modelo e versão do código), junto com o resultado de cada busca
+# concluída: repetir ou estender uma busca não reavalia nenhum ponto.
+
+cache_dir = '.cache_otimizacao'
+
+# Variáveis de projeto contínuas: nome do parâmetro do modelo -> limites padrão
+variaveis_padrao = {
+    'assumed_inverter_efficiency': (0.90, 0.99),
+    'eta_gearbox': (0.95, 0.995),
+}
+
+# Resolução das variáveis na memória dos pontos visitados
+resolucao = 1e-5
+
+# Objetivos: 'destruicao' (exergia destruída na missão, MJ, minimizada) ou 'eta_ex' (maximizada)
+objetivos = ['destruicao', 'eta_ex']
+
+def avaliar_projetos(df_input, hybrid_degree, X, variaveis, parametros=None):
+    """Exergia destruída na missão (MJ) e eficiência exergética da missão para S projetos de uma vez.
+
+    X é um array (S, len(variaveis)); parametros fixa as demais constantes do modelo.
+    Retorna dois arrays (S,).
+    """
+    X = np.atleast_2d(X)
+    valores = dict(parametros or {})
+    valores.update({nome: X[:, [j]] for j, nome in enumerate(variaveis)})
+    r = calcular_balancos_exergeticos(df_input, hybrid_degree, valores)
+    time_s = df_input['time'].to_numpy(dtype=float)
+    forma = (len(X), len(time_s))
+    integrar = lambda colunas: sum(integrar_no_tempo(np.broadcast_to(r[col], forma), time_s) for col in colunas)
+    destruicao = integrar(componentes_destruicao)
+    util, entrada = integrar(parcelas_util), integrar(parcelas_entrada)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eta = np.where(entrada > 0, util / entrada, 0)
+    return destruicao, eta
+
+def _caminho_memoria(file_path, hybrid_degree, variaveis, parametros):
+    fixos = {nome: valor for nome, valor in parametros_modelo(parametros).items() if nome not in variaveis}
+    chave = calcular_chave('otimizacao', hash_arquivo(file_path), hybrid_degree, sorted(variaveis), fixos, resolucao,
+                           versao_codigo('analise_exergetica', 'resumo_exergia', 'dados_missao', 'propriedades_ar',
+                                         'equilibrio_combustor'))
+    return os.path.join(cache_dir, f"visitados_{chave}.npz"), chave
+
+def _ler_memoria(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with np.load(caminho) as dados:
+        return {tuple(indice): tuple(valores) for indice, valores in zip(dados['indices'].tolist(), dados['valores'].tolist())}
+
+def _gravar_memoria(caminho, memoria, n_variaveis):
+    os.makedirs(cache_dir, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+    np.savez(temporario, indices=np.array(list(memoria), dtype=np.int64).reshape(-1, n_variaveis),
+             valores=np.array(list(memoria.values()), dtype=float).reshape(-1, 2))
+    os.replace(temporario, caminho)
+
+def otimizar_configuracao(hybrid_degree, file_path, objetivo='destruicao', variaveis=None, parametros=None,
+                          maxiter=30, popsize=10, seed=0, tol=1e-6, usar_cache=True):
+    """Otimiza as variáveis contínuas de uma configuração; retorna um dicionário com o melhor projeto.
+
+    variaveis é {nome do parâmetro: (mínimo, máximo)} (padrão: variaveis_padrao). O dicionário
+    retornado tem a configuração, o objetivo, os valores ótimos, a exergia destruída e a eficiência
+    no ótimo e as contagens de avaliações (calculadas e reaproveitadas da memória).
+    """
+    from scipy.optimize import differential_evolution
+    variaveis = dict(variaveis or variaveis_padrao)
+    nomes = list(variaveis)
+    caminho, chave = _caminho_memoria(file_path, hybrid_degree, nomes, parametros)
+    busca = calcular_chave(chave, objetivo, variaveis, maxiter, popsize, seed, tol)
+    caminho_busca = os.path.join(cache_dir, f"busca_{busca}.json")
+    if usar_cache and os.path.exists(caminho_busca):
+        with open(caminho_busca) as f:
+            resultado = json.load(f)
+        resultado.update(calculados=0, reaproveitados=resultado['avaliacoes'], busca_reaproveitada=True)
+        return resultado
+
+    df_input = preparar_deltas_bateria(carregar_missao(file_path, hybrid_degree), file_path)
+    memoria = _ler_memoria(caminho) if usar_cache else {}
+    contagens = {'calculados': 0, 'reaproveitados': 0}
+
+    def funcao_objetivo(x):
+        # differential_evolution vetorizado: x tem forma (variáveis, S)
+        indices = [tuple(linha) for linha in np.round(np.atleast_2d(x.T) / resolucao).astype(np.int64).tolist()]
+        pendentes = list(dict.fromkeys(indice for indice in indices if indice not in memoria))
+        if pendentes:
+            destruicao, eta = avaliar_projetos(df_input, hybrid_degree, np.array(pendentes) * resolucao, nomes, parametros)
+            memoria.update(zip(pendentes, zip(destruicao.tolist(), eta.tolist())))
+        contagens['calculados'] += len(pendentes)
+        contagens['reaproveitados'] += len(indices) - len(pendentes)
+        valores = np.array([memoria[indice] for indice in indices])
+        return valores[:, 0] if objetivo == 'destruicao' else -valores[:, 1]
+
+    inicio = time.perf_counter()
+    otimo = differential_evolution(funcao_objetivo, list(variaveis.values()), maxiter=maxiter, popsize=popsize,
+                                   seed=seed, tol=tol, polish=False, vectorized=True, updating='deferred')
+    if usar_cache:
+        _gravar_memoria(caminho, memoria, len(nomes))
+
+    indice = tuple(np.round(otimo.x / resolucao).astype(np.int64).tolist())
+    destruicao, eta = memoria[indice]
+    resultado = {'configuracao': hybrid_degree, 'objetivo': objetivo,
+                 **{nome: indice[j] * resolucao for j, nome in enumerate(nomes)},
+                 'B_Dest_Total_MJ': destruicao, 'eta_ex_missao': eta, 'convergiu': bool(otimo.success),
+                 'geracoes': int(otimo.nit), 'avaliacoes': contagens['calculados'] + contagens['reaproveitados'],
+                 'segundos': time.perf_counter() - inicio}
+    if usar_cache:
+        with open(caminho_busca, 'w') as f:
+            json.dump(resultado, f, indent=2)
+    resultado.update(contagens, busca_reaproveitada=False)
+    return resultado
+
+def otimizar_projeto(files=files, objetivo='destruicao', variaveis=None, workers=1, **kwargs):
+    """Otimiza todas as configurações (em paralelo) e retorna a tabela ordenada do melhor para o pior projeto."""
+    preparar_equilibrio(kwargs.get('parametros'))
+    resultados = executar_configuracoes(partial(otimizar_configuracao, objetivo=objetivo, variaveis=variaveis, **kwargs),
+                                        files, workers=workers)
+    tabela = pd.DataFrame(list(resultados.values()))
+    coluna, crescente = ('B_Dest_Total_MJ', True) if objetivo == 'destruicao' else ('eta_ex_missao', False)
+    return tabela.sort_values(coluna, ascending=crescente, ignore_index=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Otimiza o grau de hibridização e as eficiências do inversor e da '
+                                                 'transmissão com a exergia da missão como objetivo.')
+    parser.add_argument('configuracoes', nargs='*', default=list(files),
+                        help=f"Configurações (graus de hibridização) candidatas (padrão: {', '.join(files)}).".replace('%', '%%'))
+    parser.add_argument('--objetivo', choices=objetivos, default='destruicao',
+                        help='destruicao: minimiza a exergia destruída na missão (padrão); eta_ex: maximiza a eficiência exergética da missão.')
+    for nome, opcao in (('assumed_inverter_efficiency', '--limites-inversor'), ('eta_gearbox', '--limites-transmissao')):
+        parser.add_argument(opcao, type=float, nargs=2, default=variaveis_padrao[nome], metavar=('MIN', 'MAX'),
+                            help=f'Limites de {nome} (padrão: {variaveis_padrao[nome][0]} a {variaveis_padrao[nome][1]}).')
+    parser.add_argument('--maxiter', type=int, default=30, help='Número máximo de gerações (padrão: 30).')
+    parser.add_argument('--popsize', type=int, default=10, help='Multiplicador do tamanho da população (padrão: 10).')
+    parser.add_argument('--seed', type=int, default=0, help='Semente da evolução diferencial (padrão: 0).')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos (uma configuração por processo; 0 = todos os núcleos).')
+    parser.add_argument('--sem-cache', action='store_true', help='Reavalia todos os pontos, sem consultar a memória em .cache_otimizacao/.')
+    args = parser.parse_args()
+
+    variaveis = {'assumed_inverter_efficiency': tuple(args.limites_inversor), 'eta_gearbox': tuple(args.limites_transmissao)}
+    tabela = otimizar_projeto({hybrid_degree: files[hybrid_degree] for hybrid_degree in args.configuracoes}, args.objetivo,
+                              variaveis, args.workers, maxiter=args.maxiter, popsize=args.popsize, seed=args.seed,
+                              usar_cache=not args.sem_cache)
+    tabela.to_csv('otimizacao_projeto.csv', sep=";", decimal=",", index=False)
+    colunas = ['configuracao', *variaveis, 'B_Dest_Total_MJ', 'eta_ex_missao', 'geracoes', 'calculados', 'reaproveitados']
+    print(tabela[colunas].to_string(index=False, float_format=lambda v: f"{v:.5g}"))
+    print(f"Melhor projeto: {tabela.loc[0, 'configuracao']} (resultados em otimizacao_projeto.csv)")
@@ -0,0 +1,233 @@
+import os
+import sys
+import json
+import time
+import platform
+import contextlib
+
+# --- PERFIL DAS ETAPAS DE UMA EXECUÇÃO (--profile) ---
+# As etapas mais pesadas (leitura do CSV, conversão das colunas numéricas,
+# cálculos, suavização, gravação, savefig) são marcadas com
+#     with perfil_execucao.etapa('exergia_calculo', hybrid_degree):
+# e, quando o perfil está ativo, cada uma registra o tempo, o número de linhas
+# processadas (contar_linhas), as linhas por segundo e o pico de memória
+# alocada acima do início da etapa (tracemalloc). Etapas podem ser aninhadas;
+# a configuração é herdada da etapa externa. Com o perfil desligado, etapa()
+# devolve sempre o mesmo contexto nulo e contar_linhas() retorna de imediato,
+# de modo que o custo é de uma chamada de função por etapa.
+#
+# Opcionalmente as etapas de cálculo (perfilar=True) são medidas também com o
+# cProfile. Nas execuções com --workers, os registros e as estatísticas dos
+# processos do pool voltam junto com os resultados (em_processo/incorporar).
+
+# Estado do perfil neste processo
+_ativo = False
+_memoria = False
+_cprofile = None            # cProfile.Profile, quando pedido
+_profundidade_cprofile = 0
+_registros = []             # etapas concluídas
+_abertas = []               # pilha das etapas em andamento
+_estatisticas = []          # estatísticas do cProfile recebidas dos processos do pool
+_inicios = 0                # contador de etapas iniciadas (ordem de início)
+_nulo = contextlib.nullcontext()
+
+def ativo():
+    return _ativo
+
+def ativar(memoria=True, cprofile=False):
+    """Liga o perfil neste processo (memoria: pico por etapa com tracemalloc; cprofile: etapas de cálculo)."""
+    global _ativo, _memoria, _cprofile
+    _ativo, _memoria = True, memoria
+    if memoria:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    if cprofile and _cprofile is None:
+        import cProfile
+        _cprofile = cProfile.Profile()
+
+def desativar():
+    global _ativo, _cprofile
+    _ativo, _cprofile = False, None
+    if _memoria:
+        import tracemalloc
+        tracemalloc.stop()
+
+def etapa(nome, configuracao=None, linhas=None, perfilar=False):
+    """Contexto que mede uma etapa; sem o perfil ativo, um contexto nulo compartilhado."""
+    if not _ativo:
+        return _nulo
+    return _medir(nome, configuracao, linhas, perfilar)
+
+def contar_linhas(linhas):
+    """Soma linhas à etapa em andamento mais interna (usado quando o número só é conhecido durante a etapa)."""
+    if _ativo and _abertas:
+        _abertas[-1]['linhas'] = (_abertas[-1]['linhas'] or 0) + int(linhas)
+
+@contextlib.contextmanager
+def _medir(nome, configuracao, linhas, perfilar):
+    global _profundidade_cprofile, _inicios
+    if configuracao is None and _abertas:
+        configuracao = _abertas[-1]['configuracao']
+    _inicios += 1
+    registro = {'etapa': nome, 'configuracao': configuracao, 'nivel': len(_abertas), 'processo': os.getpid(),
+                'ordem': _inicios, 'segundos': 0.0, 'linhas': linhas, 'pico_mb': None}
+    if _memoria:
+        import tracemalloc
+        atual, pico = tracemalloc.get_traced_memory()
+        # O pico é global: repassa o pico até aqui às etapas externas antes de zerá-lo
+        for externa in _abertas:
+            externa['_pico'] = max(externa['_pico'], pico)
+        tracemalloc.reset_peak()
+        registro['_base'], registro['_pico'] = atual, atual
+    _abertas.append(registro)
+    if perfilar and _cprofile is not None:
+        _profundidade_cprofile += 1
+        if _profundidade_cprofile == 1:
+            _cprofile.enable()
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['segundos'] = time.perf_counter() - inicio
+        if perfilar and _cprofile is not None:
+            _profundidade_cprofile -= 1
+            if _profundidade_cprofile == 0:
+                _cprofile.disable()
+        _abertas.pop()
+        if _memoria:
+            import tracemalloc
+            pico = max(registro.pop('_pico'), tracemalloc.get_traced_memory()[1])
+            registro['pico_mb'] = (pico - registro.pop('_base')) / 2**20
+            for externa in _abertas:
+                externa['_pico'] = max(externa['_pico'], pico)
+        _registros.append(registro)
+
+class _ResultadoPerfilado:
+    """Resultado de uma tarefa executada em um processo do pool, com os registros do perfil."""
+    def __init__(self, resultado, registros, estatisticas):
+        self.resultado, self.registros, self.estatisticas = resultado, registros, estatisticas
+
+class _TarefaPerfilada:
+    """Envolve a função de uma tarefa do pool para ativar o perfil no processo e devolver os registros."""
+    def __init__(self, funcao, memoria, cprofile):
+        self.funcao, self.memoria, self.cprofile = funcao, memoria, cprofile
+
+    def __call__(self, *args, **kwargs):
+        ativar(self.memoria, self.cprofile)
+        inicio = len(_registros)
+        resultado = self.funcao(*args, **kwargs)
+        estatisticas = None
+        if _cprofile is not None:
+            _cprofile.create_stats()
+            estatisticas = _cprofile.stats
+            _cprofile.clear()
+        registros = _registros[inicio:]
+        del _registros[inicio:]
+        return _ResultadoPerfilado(resultado, registros, estatisticas)
+
+def em_processo(funcao):
+    """Função a enviar ao pool: com o perfil ativo, envolvida para coletar os registros no processo filho."""
+    if not _ativo:
+        return funcao
+    return _TarefaPerfilada(funcao, _memoria, _cprofile is not None)
+
+def incorporar(resultado):
+    """Desembrulha o resultado de uma tarefa do pool, incorporando os registros ao perfil deste processo."""
+    if not isinstance(resultado, _ResultadoPerfilado):
+        return resultado
+    global _inicios
+    nivel = len(_abertas)
+    for registro in sorted(resultado.registros, key=lambda r: r['ordem']):
+        _inicios += 1
+        registro['ordem'] = _inicios
+        if registro['configuracao'] is None and _abertas:
+            registro['configuracao'] = _abertas[-1]['configuracao']
+        registro['nivel'] += nivel
+        _registros.append(registro)
+    if resultado.estatisticas is not None:
+        _estatisticas.append(resultado.estatisticas)
+    return resultado.resultado
+
+class _EstatisticasRecebidas:
+    # pstats.Stats.add aceita objetos com create_stats() e o atributo stats
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+def resumo_etapas():
+    """Registros agrupados por (configuração, etapa): chamadas, tempo, linhas, linhas/s e pico de memória.
+
+    As configurações aparecem na ordem em que foram concluídas e, em cada uma, as etapas na ordem de início.
+    """
+    grupos = {}
+    for registro in sorted(_registros, key=lambda r: r['ordem']):
+        chave = (registro['configuracao'], registro['etapa'])
+        grupo = grupos.setdefault(chave, {'configuracao': registro['configuracao'], 'etapa': registro['etapa'],
+                                          'nivel': registro['nivel'], 'chamadas': 0, 'segundos': 0.0,
+                                          'linhas': None, 'pico_mb': None})
+        grupo['chamadas'] += 1
+        grupo['segundos'] += registro['segundos']
+        if registro['linhas'] is not None:
+            grupo['linhas'] = (grupo['linhas'] or 0) + registro['linhas']
+        if registro['pico_mb'] is not None:
+            grupo['pico_mb'] = max(grupo['pico_mb'] or 0.0, registro['pico_mb'])
+    configuracoes = list(dict.fromkeys(registro['configuracao'] for registro in _registros))
+    resumo = sorted(grupos.values(), key=lambda g: configuracoes.index(g['configuracao']))
+    for grupo in resumo:
+        grupo['linhas_por_s'] = grupo['linhas'] / grupo['segundos'] if grupo['linhas'] and grupo['segundos'] > 0 else None
+    return resumo
+
+def imprimir_relatorio(resumo):
+    print("\nPerfil da execução:")
+    print(f"  {'configuração':<14} {'etapa':<28} {'chamadas':>8} {'tempo (s)':>10} {'linhas':>10} {'linhas/s':>12} {'pico (MB)':>10}")
+    for grupo in resumo:
+        nome = '  ' * grupo['nivel'] + grupo['etapa']
+        linhas = f"{grupo['linhas']:d}" if grupo['linhas'] is not None else '-'
+        taxa = f"{grupo['linhas_por_s']:.0f}" if grupo['linhas_por_s'] else '-'
+        pico = f"{grupo['pico_mb']:.1f}" if grupo['pico_mb'] is not None else '-'
+        print(f"  {str(grupo['configuracao'] or '-'):<14} {nome:<28} {grupo['chamadas']:>8d} {grupo['segundos']:>10.3f} "
+              f"{linhas:>10} {taxa:>12} {pico:>10}")
+    if _memoria:
+        print("  (o tracemalloc deixa as etapas com muitas alocações mais lentas; use --profile-sem-memoria para tempos puros)")
+
+def finalizar(arquivo_json=None, arquivo_cprofile=None, linhas_cprofile=25):
+    """Imprime o relatório e grava o JSON (registros e resumo) e, se medido, o perfil do cProfile (.prof)."""
+    resumo = resumo_etapas()
+    imprimir_relatorio(resumo)
+    if arquivo_json:
+        with open(arquivo_json, 'w', encoding='utf-8') as f:
+            json.dump({'comando': sys.argv, 'python': platform.python_version(), 'cpus': os.cpu_count(),
+                       'memoria': _memoria, 'resumo': resumo, 'registros': _registros}, f, indent=2)
+        print(f"Perfil salvo em {arquivo_json}")
+    if _cprofile is not None:
+        import pstats
+        estatisticas = pstats.Stats(_cprofile)
+        for stats in _estatisticas:
+            estatisticas.add(_EstatisticasRecebidas(stats))
+        if arquivo_cprofile:
+            estatisticas.dump_stats(arquivo_cprofile)
+            print(f"cProfile das etapas de cálculo salvo em {arquivo_cprofile} (python -m pstats {arquivo_cprofile})")
+        estatisticas.sort_stats('cumulative').print_stats(linhas_cprofile)
+
+def adicionar_argumentos(parser):
+    """Opções --profile, --profile-cprofile e --profile-sem-memoria de um script."""
+    parser.add_argument('--profile', nargs='?', const='perfil_execucao.json', default=None, metavar='ARQ.json',
+                        help='Mede o tempo, as linhas/s e o pico de memória de cada etapa por configuração e grava o '
+                             'relatório em JSON (padrão: perfil_execucao.json).')
+    parser.add_argument('--profile-cprofile', nargs='?', const='perfil_execucao.prof', default=None, metavar='ARQ.prof',
+                        help='Com --profile, mede também as etapas de cálculo com o cProfile (padrão: perfil_execucao.prof).')
+    parser.add_argument('--profile-sem-memoria', action='store_true',
+                        help='Com --profile, não mede o pico de memória (tempos sem a sobrecarga do tracemalloc).')
+
+def iniciar(args):
+    """Ativa o perfil conforme as opções de adicionar_argumentos."""
+    if args.profile or args.profile_cprofile:
+        ativar(memoria=not args.profile_sem_memoria, cprofile=bool(args.profile_cprofile))
+
+def concluir(args):
+    """Relatório final, se o perfil foi ativado por iniciar(args)."""
+    if _ativo:
+        finalizar(args.profile or 'perfil_execucao.json', args.profile_cprofile)
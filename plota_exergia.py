@@ -1,350 +1,132 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+from graficos import renderizar_graficos, colunas_necessarias, axis_label_fontsize
+from arquivos_resultados import formatos, localizar_resultados, ler_resultados
+import perfil_execucao
 
 # --- SCRIPT DE PLOTAGEM DOS RESULTADOS DE EXERGIA ---
 
-# Dicionario com os arquivos de entrada e os nomes das configuracoes
+# Dicionario com os arquivos de entrada (sem extensao) e os nomes das configuracoes.
+# E lido o arquivo mais recente entre .csv, .npz, .parquet e .feather (com a extensao, o proprio arquivo).
 files_to_plot = {
-    '15%': 'resultados_exergia_15.csv',
-    '20%': 'resultados_exergia_20.csv',
-    '30%': 'resultados_exergia_30.csv',
-    'Convencional': 'resultados_exergia_Convencional.csv'
+    '15%': 'resultados_exergia_15',
+    '20%': 'resultados_exergia_20',
+    '30%': 'resultados_exergia_30',
+    'Convencional': 'resultados_exergia_Convencional'
 }
 
-# Dicionario para armazenar os DataFrames lidos
-dfs = {}
-
-# Carregar cada planilha de resultados
-print("Carregando arquivos de resultados...")
-for hybrid_degree, file_path in files_to_plot.items():
-    try:
-        df = pd.read_csv(file_path, delimiter=';', decimal=',')
-        dfs[hybrid_degree] = df
-        print(f"Arquivo '{file_path}' carregado com sucesso.")
-    except FileNotFoundError:
-        print(f"AVISO: O arquivo '{file_path}' nao foi encontrado. Esta configuracao sera ignorada.")
-    except Exception as e:
-        print(f"ERRO: Nao foi possivel ler o arquivo '{file_path}'. Erro: {e}")
-
-if not dfs:
-    print("\nNenhum arquivo de dados foi carregado. Encerrando o script.")
-    exit()
-
 # --- CONFIGURACOES DE PLOTAGEM ---
 
-colors = {'15%': 'blue', '20%': 'red', '30%': 'green', 'Convencional': 'black'}
-
-legend_fontsize = 11
-axis_label_fontsize = 12
-tick_label_fontsize = 10
-
-def place_legend_below(ax=None, ncol=None, fontsize=legend_fontsize):
-    if ax is None:
-        ax = plt.gca()
-    handles, labels = ax.get_legend_handles_labels()
-    if not handles:
-        return
-    
-    num_items = len(handles)
-    if ncol is None:
-        ncol = min(num_items, 3)
-        if ncol == 0: ncol = 1
-            
-    ax.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, -0.22), 
-              ncol=ncol, fancybox=True, shadow=False, borderaxespad=0., fontsize=fontsize)
-
-figure_width = 10
-figure_height = 10
-tight_layout_rect = [0.12, 0.20, 0.95, 0.93]
-
-# --- GERACAO DOS GRAFICOS (UM POR UM) ---
-print("\nIniciando a geracao dos graficos um por um...")
-
-# --- Gráficos Padrão (0-100%) ---
-
-# Gráfico 1: Eficiencia Exergetica Total do Sistema
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_total'
-title_text = 'Eficiência Exergética Global do Sistema Propulsivo'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência Global - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 2: Eficiencia Exergetica do Motor Termico
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_engine'
-title_text = 'Eficiência Exergética do Motor Térmico'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Efic. Mot. Térm. - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 3: Eficiencia Exergetica da Caixa de Transmissao
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_gearbox'
-title_text = 'Eficiência Exergética da Caixa de Transmissão'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência da Transm. - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 4: Eficiencia Exergetica da Helice (Sist. Termico)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_prop_SysTermico'
-title_text = 'Eficiência Exergética da Hélice (Sistema Propulsivo Térmico)'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência da Hélice - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 5: Eficiencia Exergetica da Bateria
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_bat'
-title_text = 'Eficiência Exergética das Baterias'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência das Baterias - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 6: Eficiencia Exergetica do Inversor
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_inverter'
-title_text = 'Eficiência Exergética do Inversor DC/AC'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência do Inversor - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 7: Eficiencia Exergetica do Motor Eletrico (MTRB)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_motor_MTRB'
-title_text = 'Eficiência Exergética do Motor Elétrico (MTRB - Motor/Gerador)'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Efic. do MTRB - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 8: Eficiencia Exergetica do Motor Eletrico (WTP)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_motor_WTP'
-title_text = 'Eficiência Exergética do Motor Elétrico (Ponta de Asa)'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Efic. do Mot. Elét. WTP - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-# Gráfico 9: Eficiencia Exergetica da Helice (WTP)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_prop_WTP'
-title_text = 'Eficiência Exergética da Hélice (Sistema Propulsivo Elétrico)'
-print(f"Gerando grafico: {title_text}")
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-        ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência da Hélice - {hybrid_degree}')
-ax.set_title(f'{title_text}', fontsize=axis_label_fontsize+2)
-ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-ax.grid(True)
-ax.set_ylim(0, 100)
-place_legend_below(ax)
-plt.tight_layout(rect=tight_layout_rect)
-plt.savefig(f"{eta_col}_vs_time.png")
-plt.close()
-print(f"Grafico salvo como: {eta_col}_vs_time.png")
-
-print("\nGeracao de graficos padrao concluida.")
-
-# --- GERACAO DOS GRAFICOS COM ZOOM ---
-print("\nIniciando a geracao de graficos com zoom...")
-
-# Gráfico Zoom 1: Bateria
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_bat'
-title_text = 'Eficiência Exergética das Baterias'
-print(f"Gerando grafico: {title_text}")
-min_zoom_val, max_zoom_val = 100, 0
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns:
-        non_zero_data = df[df[eta_col] > 0][eta_col] * 100
-        if not non_zero_data.empty:
-            min_zoom_val = min(min_zoom_val, non_zero_data.min())
-            max_zoom_val = max(max_zoom_val, non_zero_data.max())
-if max_zoom_val > 0:
-    for hybrid_degree, df in dfs.items():
-        if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-            ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Eficiência das Baterias - {hybrid_degree}')
-    ax.set_title(title_text, fontsize=axis_label_fontsize+2)
-    ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-    ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-    ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-    ax.grid(True)
-    y_padding = (max_zoom_val - min_zoom_val) * 0.1
-    ax.set_ylim(max(0, min_zoom_val - y_padding), min(100, max_zoom_val + y_padding))
-    place_legend_below(ax)
-    plt.tight_layout(rect=tight_layout_rect)
-    plt.savefig(f"{eta_col}_vs_time_zoom.png")
-    print(f"Grafico salvo como: {eta_col}_vs_time_zoom.png")
-plt.close()
-
-# Gráfico Zoom 2: Motor Elétrico (MTRB)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_motor_MTRB'
-title_text = 'Eficiência Exergética do Motor Elétrico (MTRB - Motor/Gerador)'
-print(f"Gerando grafico: {title_text}")
-min_zoom_val, max_zoom_val = 100, 0
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns:
-        non_zero_data = df[df[eta_col] > 0][eta_col] * 100
-        if not non_zero_data.empty:
-            min_zoom_val = min(min_zoom_val, non_zero_data.min())
-            max_zoom_val = max(max_zoom_val, non_zero_data.max())
-if max_zoom_val > 0:
-    for hybrid_degree, df in dfs.items():
-        if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-            ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Efic. do MTRB - {hybrid_degree}')
-    ax.set_title(title_text, fontsize=axis_label_fontsize+2)
-    ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-    ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-    ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-    ax.grid(True)
-    y_padding = (max_zoom_val - min_zoom_val) * 0.1
-    ax.set_ylim(max(0, min_zoom_val - y_padding), min(100, max_zoom_val + y_padding))
-    place_legend_below(ax)
-    plt.tight_layout(rect=tight_layout_rect)
-    plt.savefig(f"{eta_col}_vs_time_zoom.png")
-    print(f"Grafico salvo como: {eta_col}_vs_time_zoom.png")
-plt.close()
-
-# Gráfico Zoom 3: Motor Elétrico (WTP)
-plt.figure(figsize=(figure_width, figure_height))
-ax = plt.gca()
-eta_col = 'eta_ex_motor_WTP'
-title_text = 'Eficiência Exergética do Motor Elétrico (Ponta de Asa)'
-print(f"Gerando grafico: {title_text}")
-min_zoom_val, max_zoom_val = 100, 0
-for hybrid_degree, df in dfs.items():
-    if hybrid_degree != 'Convencional' and eta_col in df.columns:
-        non_zero_data = df[df[eta_col] > 0][eta_col] * 100
-        if not non_zero_data.empty:
-            min_zoom_val = min(min_zoom_val, non_zero_data.min())
-            max_zoom_val = max(max_zoom_val, non_zero_data.max())
-if max_zoom_val > 0:
-    for hybrid_degree, df in dfs.items():
-        if hybrid_degree != 'Convencional' and eta_col in df.columns and 'time' in df.columns:
-            ax.plot(df['time'] / 60, df[eta_col] * 100, color=colors[hybrid_degree], label=f'Efic. do Mot. Elét. WTP - {hybrid_degree}')
-    ax.set_title(title_text, fontsize=axis_label_fontsize+2)
-    ax.set_xlabel('Tempo (min)', fontsize=axis_label_fontsize)
-    ax.set_ylabel('Eficiência Exergética (%)', fontsize=axis_label_fontsize)
-    ax.tick_params(axis='both', which='major', labelsize=tick_label_fontsize)
-    ax.grid(True)
-    y_padding = (max_zoom_val - min_zoom_val) * 0.1
-    ax.set_ylim(max(0, min_zoom_val - y_padding), min(100, max_zoom_val + y_padding))
-    place_legend_below(ax)
-    plt.tight_layout(rect=tight_layout_rect)
-    plt.savefig(f"{eta_col}_vs_time_zoom.png")
-    print(f"Grafico salvo como: {eta_col}_vs_time_zoom.png")
-plt.close()
-
-print("\nGeracao de graficos concluida com sucesso.")
+# (coluna, titulo, rotulo da serie, apenas hibridos)
+graficos_eficiencia = [
+    ('eta_ex_total', 'Eficiência Exergética Global do Sistema Propulsivo', 'Eficiência Global', False),
+    ('eta_ex_engine', 'Eficiência Exergética do Motor Térmico', 'Efic. Mot. Térm.', False),
+    ('eta_ex_gearbox', 'Eficiência Exergética da Caixa de Transmissão', 'Eficiência da Transm.', False),
+    ('eta_ex_prop_SysTermico', 'Eficiência Exergética da Hélice (Sistema Propulsivo Térmico)', 'Eficiência da Hélice', False),
+    ('eta_ex_bat', 'Eficiência Exergética das Baterias', 'Eficiência das Baterias', True),
+    ('eta_ex_inverter', 'Eficiência Exergética do Inversor DC/AC', 'Eficiência do Inversor', True),
+    ('eta_ex_motor_MTRB', 'Eficiência Exergética do Motor Elétrico (MTRB - Motor/Gerador)', 'Efic. do MTRB', True),
+    ('eta_ex_motor_WTP', 'Eficiência Exergética do Motor Elétrico (Ponta de Asa)', 'Efic. do Mot. Elét. WTP', True),
+    ('eta_ex_prop_WTP', 'Eficiência Exergética da Hélice (Sistema Propulsivo Elétrico)', 'Eficiência da Hélice', True),
+]
+
+# Graficos repetidos com o eixo y ajustado a faixa dos valores positivos
+colunas_zoom = ['eta_ex_bat', 'eta_ex_motor_MTRB', 'eta_ex_motor_WTP']
+
+def _especificacao(eta_col, title_text, rotulo, apenas_hibridos, zoom=False):
+    spec = {
+        'arquivo': f"{eta_col}_vs_time{'_zoom' if zoom else ''}.png",
+        'titulo': title_text, 'fonte_titulo': axis_label_fontsize + 2,
+        'y': eta_col, 'escala_y': 100, 'rotulo_y': 'Eficiência Exergética (%)',
+        'rotulo_serie': rotulo + ' - {config}', 'apenas_hibridos': apenas_hibridos,
+        'ncol_legenda': 3,
+    }
+    if zoom:
+        spec['zoom'] = 'faixa'
+    else:
+        spec['ylim'] = (0, 100)
+    return spec
+
+especificacoes_padrao = [_especificacao(*grafico) for grafico in graficos_eficiencia]
+especificacoes_zoom = [_especificacao(*grafico, zoom=True)
+                       for grafico in graficos_eficiencia if grafico[0] in colunas_zoom]
+
+def carregar_resultados(arquivos=files_to_plot, colunas=None):
+    """Carrega os resultados de exergia disponiveis, apenas com as colunas pedidas (todas se None)."""
+    dfs = {}
+    print("Carregando arquivos de resultados...")
+    for hybrid_degree, base in arquivos.items():
+        if base.rsplit('.', 1)[-1] in formatos:
+            file_path = base
+        else:
+            file_path = localizar_resultados(base) or f"{base}.csv"
+        try:
+            with perfil_execucao.etapa('leitura_resultados', hybrid_degree):
+                df = ler_resultados(file_path, colunas)
+                perfil_execucao.contar_linhas(len(df))
+            dfs[hybrid_degree] = df
+            print(f"Arquivo '{file_path}' carregado com sucesso.")
+        except FileNotFoundError:
+            print(f"AVISO: O arquivo '{file_path}' nao foi encontrado. Esta configuracao sera ignorada.")
+        except Exception as e:
+            print(f"ERRO: Nao foi possivel ler o arquivo '{file_path}'. Erro: {e}")
+    return dfs
+
+def gerar_graficos(especificacoes, dfs, workers=1, usar_cache=False):
+    for spec in especificacoes:
+        print(f"Gerando grafico: {spec['titulo']}")
+    for arquivo in renderizar_graficos(especificacoes, dfs, workers=workers, usar_cache=usar_cache):
+        print(f"Grafico salvo como: {arquivo}")
+
+def adicionar_argumentos_suavizacao(parser):
+    """Opcoes --suavizar JANELA ORDEM e --suavizar-causal."""
+    parser.add_argument('--suavizar', type=int, nargs=2, default=None, metavar=('JANELA', 'ORDEM'),
+                        help="Suaviza as series com o filtro Savitzky-Golay (ex.: --suavizar 51 3).")
+    parser.add_argument('--suavizar-causal', action='store_true',
+                        help="Com --suavizar, usa o filtro causal (apenas amostras atuais e anteriores).")
+
+def opcao_suavizacao(args):
+    if not args.suavizar:
+        return None
+    return (*args.suavizar, 'causal') if args.suavizar_causal else tuple(args.suavizar)
+
+def com_suavizacao(especificacoes, suavizacao):
+    """Copias das especificacoes com a suavizacao (janela, ordem) ou (janela, ordem, 'causal') de graficos.py."""
+    return [dict(spec, suavizacao=tuple(suavizacao)) for spec in especificacoes] if suavizacao else especificacoes
+
+def executar_graficos(arquivos=files_to_plot, workers=1, usar_cache=True, suavizacao=None):
+    """Carrega os resultados de exergia e gera os graficos padrao e com zoom; retorna False se nada foi carregado.
+
+    suavizacao, se informada, e aplicada a todas as series (ver com_suavizacao).
+    """
+    especificacoes = com_suavizacao(especificacoes_padrao, suavizacao)
+    especificacoes_com_zoom = com_suavizacao(especificacoes_zoom, suavizacao)
+    dfs = carregar_resultados(arquivos, colunas=colunas_necessarias(especificacoes + especificacoes_com_zoom))
+    if not dfs:
+        print("\nNenhum arquivo de dados foi carregado. Encerrando o script.")
+        return False
+
+    print("\nIniciando a geracao dos graficos...")
+    gerar_graficos(especificacoes, dfs, workers, usar_cache=usar_cache)
+    print("\nGeracao de graficos padrao concluida.")
+
+    print("\nIniciando a geracao de graficos com zoom...")
+    gerar_graficos(especificacoes_com_zoom, dfs, workers, usar_cache=usar_cache)
+
+    print("\nGeracao de graficos concluida com sucesso.")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gráficos dos resultados da análise exergética.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Número de processos para renderizar os gráficos em paralelo (0 = todos os núcleos).")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Renderiza todos os gráficos, sem consultar o cache de resultados (.cache_resultados/).")
+    adicionar_argumentos_suavizacao(parser)
+    perfil_execucao.adicionar_argumentos(parser)
+    args = parser.parse_args()
+    perfil_execucao.iniciar(args)
+
+    if not executar_graficos(files_to_plot, args.workers, usar_cache=not args.sem_cache, suavizacao=opcao_suavizacao(args)):
+        exit()
+    perfil_execucao.concluir(args)
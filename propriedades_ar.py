@@ -0,0 +1,101 @@
+import os
+import json
+import logging
+import hashlib
+import numpy as np
+from dados_missao import hash_arquivo
+import mecanismo
+
+# --- PROPRIEDADES DO AR COM CALOR ESPECÍFICO VARIÁVEL ---
+# Entalpia e entropia do ar seco tabeladas em função da temperatura a partir dos
+# polinômios NASA do mecanismo (A2highT.cti), para a composição usada na
+# análise exergética. A tabela é gerada uma única vez com o Cantera e guardada
+# em .cache_mecanismo/; depois a exergia física de colunas inteiras é obtida
+# por interpolação linear vetorizada, sem o Cantera. O ar é tratado como gás
+# ideal (como no mecanismo), então a dependência com a pressão é exata:
+# s(T, P) = s°(T) - R ln(P/P0), e basta tabelar h(T) e s°(T).
+
+# Faixa e passo da tabela (faixa de validade dos polinômios NASA do O2, N2, AR e CO2)
+T_min_K = 200.0
+T_max_K = 3500.0
+passo_T_K = 1.0
+
+# Pressão em que s° é tabelada
+P_tabela_Pa = 101325.0
+
+# Tabelas já carregadas neste processo, pela chave
+_tabelas = {}
+
+# A extrapolação fora da tabela é avisada uma única vez por processo
+_extrapolacao_avisada = False
+
+def _chave_tabela(composicao, arquivo_cti):
+    texto = json.dumps([sorted(composicao.items()), hash_arquivo(arquivo_cti), T_min_K, T_max_K, passo_T_K, P_tabela_Pa])
+    return hashlib.sha1(texto.encode()).hexdigest()[:16]
+
+def gerar_tabela_ar(composicao, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Calcula h (J/kg), s° (J/kg.K, em P_tabela_Pa), cp (J/kg.K) e R (J/kg.K) da mistura com o Cantera."""
+    import cantera as ct
+    gas = mecanismo.obter_solucao(arquivo_cti)
+    T_K = np.arange(T_min_K, T_max_K + passo_T_K / 2, passo_T_K)
+    estados = ct.SolutionArray(gas, len(T_K))
+    estados.TPX = T_K, P_tabela_Pa, composicao
+    return {
+        'T_K': T_K,
+        'h_J_kg': np.asarray(estados.enthalpy_mass),
+        's_J_kgK': np.asarray(estados.entropy_mass),
+        'cp_J_kgK': np.asarray(estados.cp_mass),
+        'R_J_kgK': np.array(ct.gas_constant / gas.mean_molecular_weight),
+    }
+
+def carregar_tabela_ar(composicao, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Tabela do ar para a composição, lida do cache (ou gerada com o Cantera na primeira vez)."""
+    chave = _chave_tabela(composicao, arquivo_cti)
+    if chave not in _tabelas:
+        caminho = os.path.join(mecanismo.cache_dir, f"ar_{chave}.npz")
+        if not os.path.exists(caminho):
+            try:
+                tabela = gerar_tabela_ar(composicao, arquivo_cti)
+            except ImportError:
+                raise ImportError("A tabela de propriedades do ar é gerada com o Cantera (pip install cantera) na "
+                                  "primeira execução; sem ele, use modelo_exergia_ar = 'cp_constante'.")
+            os.makedirs(mecanismo.cache_dir, exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+            np.savez(temporario, **tabela)
+            os.replace(temporario, caminho)
+        with np.load(caminho) as dados:
+            _tabelas[chave] = {nome: dados[nome] for nome in dados.files}
+    return _tabelas[chave]
+
+def _interpolar(tabela, coluna, T_K):
+    """Interpola h ou s° em T_K; fora da faixa da tabela, extrapola com o cp da extremidade."""
+    global _extrapolacao_avisada
+    T_tab, valores, cp = tabela['T_K'], tabela[coluna], tabela['cp_J_kgK']
+    resultado = np.interp(T_K, T_tab, valores)
+    if not _extrapolacao_avisada and (np.any(T_K < T_tab[0]) or np.any(T_K > T_tab[-1])):
+        _extrapolacao_avisada = True
+        logging.warning(f"Temperaturas fora da tabela do ar ({T_tab[0]:.0f} K a {T_tab[-1]:.0f} K; encontradas de "
+                        f"{np.nanmin(T_K):.0f} K a {np.nanmax(T_K):.0f} K): extrapolando com o cp da extremidade.")
+    for fora, i in ((T_K < T_tab[0], 0), (T_K > T_tab[-1], -1)):
+        if np.any(fora):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variacao = cp[i] * (T_K - T_tab[i]) if coluna == 'h_J_kg' else cp[i] * np.log(T_K / T_tab[i])
+            resultado = np.where(fora, valores[i] + variacao, resultado)
+    return resultado
+
+def exergia_fisica_especifica_J_kg(T_K, P_Pa, T0_K, P0_Pa, composicao, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Exergia física específica (J/kg, sem o termo cinético) do ar com cp variável.
+
+    (h - h0) - T0 (s - s0), com h e s° interpolados na tabela; aceita escalares ou arrays.
+    """
+    tabela = carregar_tabela_ar(composicao, arquivo_cti)
+    T_K = np.asarray(T_K, dtype=float)
+    T0_K = np.asarray(T0_K, dtype=float)
+    h0, s0 = _interpolar(tabela, 'h_J_kg', T0_K), _interpolar(tabela, 's_J_kgK', T0_K)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta_s = _interpolar(tabela, 's_J_kgK', T_K) - s0 - tabela['R_J_kgK'] * np.log(P_Pa / P0_Pa)
+    return _interpolar(tabela, 'h_J_kg', T_K) - h0 - T0_K * delta_s
+
+def entalpia_J_kg(T_K, composicao, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Entalpia específica do ar (J/kg, referência do mecanismo) interpolada na tabela."""
+    return _interpolar(carregar_tabela_ar(composicao, arquivo_cti), 'h_J_kg', np.asarray(T_K, dtype=float))
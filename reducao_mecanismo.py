@@ -0,0 +1,295 @@
+import os
+import time
+import shutil
+import argparse
+import warnings
+import numpy as np
+from dados_missao import files, carregar_missao, hash_arquivo
+import mecanismo
+import emissoes_cineticas
+
+# --- REDUÇÃO DO MECANISMO (DRGEP) NO ENVELOPE DAS MISSÕES ---
+# O HyChem A2highT (119 espécies, 841 reações) é muito maior do que o
+# necessário para os pontos de operação das missões. Este script gera um
+# mecanismo esqueleto pelo método DRGEP (grafo de relações diretas com
+# propagação de erro):
+#   1. os pontos de operação (T3, P3, FAR) das missões são quantizados como em
+#      emissoes_cineticas.py e pontos_envelope deles, espalhados na faixa de
+#      FAR e P3, formam o envelope;
+#   2. em cada ponto são integradas ignições a pressão constante (phi global e
+#      phi da zona primária, temperaturas_iniciais_K) e os estados amostrados
+#      ao longo delas fornecem os coeficientes de interação entre espécies;
+#   3. a importância de cada espécie é o maior produto de coeficientes em um
+#      caminho a partir das espécies alvo (busca de Dijkstra);
+#   4. uma busca binária no número de espécies mantidas (em ordem de
+#      importância) encontra o menor esqueleto cujo erro no envelope fica
+#      dentro das tolerâncias de atraso de ignição, temperatura da chama (T do
+#      PSR) e EI de NOx (rede de reatores de emissoes_cineticas.py).
+# O esqueleto é gravado em YAML e pode ser passado a emissoes_cineticas.py
+# (--mecanismo); mecanismo.py usa arquivos YAML diretamente. A grade de
+# equilíbrio do combustor (equilibrio_combustor.py) continua com o mecanismo
+# completo: o equilíbrio depende apenas da termodinâmica dos produtos e é
+# calculado uma única vez.
+
+# Espécies alvo da busca (além do combustível) e espécies sempre mantidas (além do combustível e do ar)
+especies_alvo = ['O2', 'CO', 'OH', 'O']
+especies_mantidas = ['N2', 'AR', 'CO2', 'H2O', 'O', 'OH', 'O2', 'CO']
+
+# Envelope e amostragem
+pontos_envelope = 6
+temperaturas_iniciais_K = [1000.0, 1200.0, 1500.0]
+aumento_ignicao_K = 400.0       # o atraso de ignição é o instante em que T = T inicial + aumento_ignicao_K
+tempo_maximo_ignicao_s = 1.0
+estados_por_trajetoria = 30
+
+# Tolerâncias padrão (erro relativo máximo no envelope)
+tolerancia_ignicao = 0.10
+tolerancia_temperatura = 0.01
+tolerancia_nox = 0.10
+
+# Grandezas comparadas entre os mecanismos
+grandezas = ['ignicao', 'temperatura', 'nox', 'co']
+
+def envelope_missoes(configuracoes, combustivel, ar, pontos=pontos_envelope):
+    """Pontos (T3_K, P3_Pa, far, phi) representativos das missões das configurações."""
+    gas = mecanismo.obter_solucao()
+    especie_combustivel = next(iter(combustivel))
+    gas.TP = 300.0, 101325.0
+    gas.set_equivalence_ratio(1.0, combustivel, ar)
+    Y_comb = gas.Y[gas.species_index(especie_combustivel)]
+    far_esteq = Y_comb / (1 - Y_comb)
+
+    indices = []
+    for hybrid_degree in configuracoes:
+        df = carregar_missao(files[hybrid_degree], hybrid_degree)
+        T3_K = df['gas_turbine_t3'].to_numpy(dtype=float)
+        P3_Pa = df['gas_turbine_p3'].to_numpy(dtype=float) * emissoes_cineticas.unidade_p3_Pa
+        far = df['gas_turbine_far'].to_numpy(dtype=float)
+        ativo = (far > 0) & (T3_K > 0) & (P3_Pa > 0) & np.isfinite(T3_K + P3_Pa + far)
+        indices.append(emissoes_cineticas.quantizar(T3_K[ativo], P3_Pa[ativo], far[ativo]))
+    distintos = np.unique(np.concatenate(indices), axis=0)
+    # Ordena por FAR e P3 e escolhe pontos igualmente espaçados (incluindo os extremos)
+    distintos = distintos[np.lexsort((distintos[:, 1], distintos[:, 2]))]
+    escolhidos = distintos[np.unique(np.linspace(0, len(distintos) - 1, pontos).round().astype(int))]
+    T3_K, P3_Pa, far = emissoes_cineticas.ponto_representativo(escolhidos)
+    return list(zip(T3_K, P3_Pa, far, far / far_esteq))
+
+def ignicao(gas, T_K, P_Pa, phi, combustivel, ar, amostrar=False):
+    """Atraso de ignição (s) a pressão constante; com amostrar, também os estados (T, P, Y) da trajetória."""
+    import cantera as ct
+    gas.TP = T_K, P_Pa
+    gas.set_equivalence_ratio(phi, combustivel, ar)
+    reator = ct.IdealGasConstPressureReactor(gas, clone=False)  # compartilha o Solution, como em emissoes_cineticas
+    rede = ct.ReactorNet([reator])
+    T_ignicao = T_K + aumento_ignicao_K
+    estados = [(reator.T, P_Pa, reator.Y)]
+    t_anterior, T_anterior, atraso = 0.0, reator.T, np.nan
+    while rede.time < tempo_maximo_ignicao_s:
+        t = rede.step()
+        if amostrar:
+            estados.append((reator.T, P_Pa, reator.Y))
+        if reator.T >= T_ignicao:
+            atraso = t_anterior + (t - t_anterior) * (T_ignicao - T_anterior) / (reator.T - T_anterior)
+            break
+        t_anterior, T_anterior = t, reator.T
+    if not amostrar:
+        return atraso
+    # Completa a trajetória até perto do equilíbrio e reduz a amostra a estados_por_trajetoria
+    if np.isfinite(atraso):
+        rede.advance(min(3 * atraso, tempo_maximo_ignicao_s))
+        estados.append((reator.T, P_Pa, reator.Y))
+    selecionados = np.unique(np.linspace(0, len(estados) - 1, estados_por_trajetoria).round().astype(int))
+    return atraso, [estados[i] for i in selecionados]
+
+def coeficientes_interacao(gas):
+    """Matriz r[A, B] de coeficientes de interação diretos do DRGEP no estado atual do gas."""
+    nu = gas.product_stoich_coeffs - gas.reactant_stoich_coeffs
+    participa = (gas.product_stoich_coeffs + gas.reactant_stoich_coeffs) > 0
+    contribuicao = nu * gas.net_rates_of_progress
+    producao = np.maximum(contribuicao, 0).sum(axis=1)
+    consumo = np.maximum(-contribuicao, 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.abs(contribuicao @ participa.T) / np.maximum(producao, consumo)[:, None]
+    r = np.nan_to_num(r, nan=0.0, posinf=0.0)
+    np.fill_diagonal(r, 0.0)
+    return np.minimum(r, 1.0)
+
+def _caminho_maximo(r, origem):
+    """Maior produto de coeficientes em um caminho a partir de origem até cada espécie (Dijkstra)."""
+    R = np.zeros(len(r))
+    R[origem] = 1.0
+    visitado = np.zeros(len(r), dtype=bool)
+    for _ in range(len(r)):
+        candidatos = np.where(visitado, -1.0, R)
+        i = int(np.argmax(candidatos))
+        if candidatos[i] <= 0:
+            break
+        visitado[i] = True
+        R = np.where(visitado, R, np.maximum(R, R[i] * r[i]))
+    return R
+
+def importancia_especies(gas, estados, alvos):
+    """Importância DRGEP de cada espécie: máximo sobre os estados e os alvos."""
+    importancia = np.zeros(gas.n_species)
+    indices_alvo = [gas.species_index(nome) for nome in alvos]
+    for T_K, P_Pa, Y in estados:
+        gas.TPY = T_K, P_Pa, Y
+        r = coeficientes_interacao(gas)
+        for alvo in indices_alvo:
+            importancia = np.maximum(importancia, _caminho_maximo(r, alvo))
+    return importancia
+
+def gravar_esqueleto(gas, especies, caminho):
+    """Grava em YAML o mecanismo com as especies e as reações que envolvem apenas elas; retorna (espécies, reações)."""
+    import cantera as ct
+    mantidas = set(especies)
+    reacoes = [reacao for reacao in gas.reactions()
+               if set(reacao.reactants) <= mantidas and set(reacao.products) <= mantidas]
+    esqueleto = ct.Solution(thermo='ideal-gas', kinetics='gas', species=[gas.species(nome) for nome in especies],
+                            reactions=reacoes)
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    esqueleto.write_yaml(caminho)
+    return esqueleto.n_species, esqueleto.n_reactions
+
+def _razoes_ignicao(phi):
+    """Razões de equivalência das ignições de um ponto: a global e a da zona primária do PSR."""
+    return sorted({round(phi, 4), max(emissoes_cineticas.phi_zona_primaria, round(phi, 4))})
+
+def amostrar_estados(envelope, combustivel, ar, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Estados (T, P, Y) das ignições em todos os pontos do envelope, com o mecanismo completo."""
+    gas = mecanismo.obter_solucao(arquivo_cti)
+    estados = []
+    for T3_K, P3_Pa, far, phi in envelope:
+        for phi_ignicao in _razoes_ignicao(phi):
+            for T_K in temperaturas_iniciais_K:
+                estados += ignicao(gas, T_K, P3_Pa, phi_ignicao, combustivel, ar, amostrar=True)[1]
+    return estados
+
+def avaliar_mecanismo(arquivo, envelope, combustivel, ar):
+    """Grandezas de cada ponto do envelope com o mecanismo: ({grandeza: array}, tempo em s).
+
+    ignicao tem os atrasos das ignições de cada ponto (ver _razoes_ignicao e temperaturas_iniciais_K);
+    temperatura (T do PSR), nox e co vêm da rede de reatores de emissoes_cineticas.resolver_ponto.
+    """
+    gas = mecanismo.obter_solucao(arquivo)
+    inicio = time.perf_counter()
+    atrasos, rede = [], []
+    for T3_K, P3_Pa, far, phi in envelope:
+        atrasos += [ignicao(gas, T_K, P3_Pa, phi_ignicao, combustivel, ar)
+                    for phi_ignicao in _razoes_ignicao(phi) for T_K in temperaturas_iniciais_K]
+        rede.append(emissoes_cineticas.resolver_ponto(T3_K, P3_Pa, far, combustivel, ar, arquivo))
+    rede = np.array(rede)
+    colunas = emissoes_cineticas.resultados_ponto
+    valores = {'ignicao': np.array(atrasos), 'temperatura': rede[:, colunas.index('T_psr_K')],
+               'nox': rede[:, colunas.index('EI_NOx_g_kg')], 'co': rede[:, colunas.index('EI_CO_g_kg')]}
+    return valores, time.perf_counter() - inicio
+
+def erros_relativos(valores, referencia):
+    """Maior erro relativo de cada grandeza em relação à referência (inf se o mecanismo não ignita ou não converge)."""
+    erros = {}
+    for nome in grandezas:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            erro = np.abs(valores[nome] - referencia[nome]) / np.abs(referencia[nome])
+        validos = np.isfinite(referencia[nome])
+        erros[nome] = float(np.max(np.where(np.isfinite(erro), erro, np.inf)[validos], initial=0.0))
+    return erros
+
+def reduzir_mecanismo(envelope, combustivel, ar, tolerancias, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Menor esqueleto (em ordem de importância DRGEP) dentro das tolerâncias.
+
+    tolerancias é um dicionário {grandeza: erro relativo máximo} (grandezas ausentes não são verificadas).
+    Retorna (caminho do YAML, erros, referência, avaliação do esqueleto, tempos (completo, esqueleto)).
+    """
+    gas = mecanismo.obter_solucao(arquivo_cti)
+    referencia, tempo_completo = avaliar_mecanismo(arquivo_cti, envelope, combustivel, ar)
+    print(f"Mecanismo completo: {gas.n_species} espécies, {gas.n_reactions} reações, {tempo_completo:.1f} s no envelope")
+
+    inicio = time.perf_counter()
+    estados = amostrar_estados(envelope, combustivel, ar, arquivo_cti)
+    importancia = importancia_especies(gas, estados, list(combustivel) + especies_alvo)
+    obrigatorias = set(especies_mantidas) | set(combustivel) | set(ar)
+    importancia[[gas.species_index(nome) for nome in obrigatorias]] = np.inf
+    ordem = [gas.species_names[i] for i in np.argsort(-importancia, kind='stable')]
+    print(f"Importância DRGEP de {len(estados)} estados em {time.perf_counter() - inicio:.1f} s")
+
+    def candidato(n):
+        # A ordem original do mecanismo é mantida no esqueleto
+        especies = [nome for nome in gas.species_names if nome in set(ordem[:n])]
+        caminho = os.path.join(mecanismo.cache_dir, f"esqueleto_{hash_arquivo(arquivo_cti)[:8]}_{n}.yaml")
+        n_especies, n_reacoes = gravar_esqueleto(gas, especies, caminho)
+        mecanismo._solucoes.pop(caminho, None)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            valores, tempo = avaliar_mecanismo(caminho, envelope, combustivel, ar)
+        erros = erros_relativos(valores, referencia)
+        aceito = all(erros[nome] <= limite for nome, limite in tolerancias.items())
+        print(f"  {n_especies:3d} espécies, {n_reacoes:4d} reações: " +
+              ", ".join(f"{nome} {100 * erro:.2f}%" for nome, erro in erros.items()) +
+              f" -> {'aceito' if aceito else 'rejeitado'}")
+        return aceito, (caminho, erros, valores, tempo)
+
+    # Busca binária: o maior n rejeitado e o menor n aceito
+    rejeitado, aceito_n, melhor = len(obrigatorias) - 1, gas.n_species, None
+    while aceito_n - rejeitado > 1:
+        n = (rejeitado + aceito_n) // 2
+        aceito, resultado = candidato(n)
+        if aceito:
+            aceito_n, melhor = n, resultado
+        else:
+            rejeitado = n
+    if melhor is None:
+        melhor = candidato(gas.n_species)[1]
+    caminho, erros, valores, tempo = melhor
+    return caminho, erros, referencia, valores, (tempo_completo, tempo)
+
+def comparar_mecanismos(arquivo, envelope, combustivel, ar, arquivo_cti=mecanismo.arquivo_mecanismo):
+    """Erros relativos e tempos de um mecanismo (ex.: um esqueleto) em relação ao completo no envelope."""
+    referencia, tempo_completo = avaliar_mecanismo(arquivo_cti, envelope, combustivel, ar)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        valores, tempo = avaliar_mecanismo(arquivo, envelope, combustivel, ar)
+    return erros_relativos(valores, referencia), (tempo_completo, tempo)
+
+def _imprimir_comparacao(gas, erros, tempos):
+    print(f"Esqueleto: {gas.n_species} espécies, {gas.n_reactions} reações")
+    print("  erro máximo no envelope: " + ", ".join(f"{nome} {100 * erro:.2f}%" for nome, erro in erros.items()) +
+          " (co apenas informativo)")
+    print(f"  tempo no envelope: completo {tempos[0]:.1f} s, esqueleto {tempos[1]:.1f} s "
+          f"(aceleração de {tempos[0] / tempos[1]:.1f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera um mecanismo esqueleto (DRGEP) válido no envelope de operação das missões.')
+    parser.add_argument('configuracoes', nargs='*', default=list(files),
+                        help=f"Configurações que definem o envelope (padrão: {', '.join(files)}).".replace('%', '%%'))
+    parser.add_argument('--pontos', type=int, default=pontos_envelope,
+                        help=f'Número de pontos do envelope (padrão: {pontos_envelope}).')
+    parser.add_argument('--tolerancia-ignicao', type=float, default=tolerancia_ignicao,
+                        help=f'Erro relativo máximo no atraso de ignição (padrão: {tolerancia_ignicao}).')
+    parser.add_argument('--tolerancia-temperatura', type=float, default=tolerancia_temperatura,
+                        help=f'Erro relativo máximo na temperatura da chama/PSR (padrão: {tolerancia_temperatura}).')
+    parser.add_argument('--tolerancia-nox', type=float, default=tolerancia_nox,
+                        help=f'Erro relativo máximo no EI de NOx (padrão: {tolerancia_nox}).')
+    parser.add_argument('--saida', default='A2highT_esqueleto.yaml', help='Arquivo YAML do esqueleto (padrão: A2highT_esqueleto.yaml).')
+    parser.add_argument('--comparar', metavar='ARQ',
+                        help='Apenas compara um mecanismo já reduzido com o completo no envelope, sem gerar outro.')
+    args = parser.parse_args()
+
+    from analise_exergetica import fuel_comp_cantera, composicao_ar_seco_cantera
+    inicio = time.perf_counter()
+    envelope = envelope_missoes(args.configuracoes, fuel_comp_cantera, composicao_ar_seco_cantera, args.pontos)
+    print(f"Envelope: {len(envelope)} pontos, T3 {min(p[0] for p in envelope):.0f}-{max(p[0] for p in envelope):.0f} K, "
+          f"P3 {min(p[1] for p in envelope) / 1e5:.1f}-{max(p[1] for p in envelope) / 1e5:.1f} bar, "
+          f"phi {min(p[3] for p in envelope):.2f}-{max(p[3] for p in envelope):.2f}")
+
+    if args.comparar:
+        erros, tempos = comparar_mecanismos(args.comparar, envelope, fuel_comp_cantera, composicao_ar_seco_cantera)
+        _imprimir_comparacao(mecanismo.obter_solucao(args.comparar), erros, tempos)
+    else:
+        tolerancias = {'ignicao': args.tolerancia_ignicao, 'temperatura': args.tolerancia_temperatura,
+                       'nox': args.tolerancia_nox}
+        caminho, erros, _, _, tempos = reduzir_mecanismo(envelope, fuel_comp_cantera, composicao_ar_seco_cantera, tolerancias)
+        shutil.copyfile(caminho, args.saida)
+        _imprimir_comparacao(mecanismo.obter_solucao(caminho), erros, tempos)
+        print(f"Esqueleto salvo em {args.saida}; use-o com: python emissoes_cineticas.py --mecanismo {args.saida}")
+    print(f"Concluído em {time.perf_counter() - inicio:.1f} s")
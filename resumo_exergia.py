@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# --- RESUMO DA EXERGIA DESTRUÍDA POR COMPONENTE, SEGMENTO E CONFIGURAÇÃO ---
+# Integra no tempo (regra do trapézio) as taxas de destruição/perda de exergia
+# dos resultados da análise exergética, por segmento da missão, e monta uma
+# tabela compacta em MJ com a participação de cada componente e a eficiência
+# exergética de cada segmento e da missão.
+
+# Taxas de destruição e perdas de exergia (kW) integradas no resumo
+componentes_destruicao = [
+    'B_Perda_Dest_Engine_kW', 'B_Perda_Dest_Gearbox_kW', 'B_Perda_Dest_Prop_SysTermico_kW',
+    'B_Dest_Bat_kW', 'B_Bat_Heat_kW', 'B_Dest_Inverter_kW', 'B_Inverter_Heat_kW',
+    'B_Dest_Motor_MTRB_kW', 'B_Motor_MTRB_Heat_kW', 'B_Dest_Motor_WTP_kW', 'B_Motor_WTP_Heat_kW',
+    'B_Perda_Dest_WTP_kW',
+]
+
+# Parcelas da eficiência exergética (mesma definição de eta_ex_total)
+parcelas_util = ['B_Thrust_Total_kW', 'W_Mec_Hydraulic_kW', 'W_Electric_kW_aux_engine', 'B_Bleed_kW']
+parcelas_entrada = ['B_Fuel_kW', 'B_Air_kW', 'B_Quim_Bat_kW']
+
+def _mj(coluna):
+    return coluna[:-len('_kW')] + '_MJ'
+
+def integrar_por_segmento(df_exergia, linha_anterior=None):
+    """Integra as taxas de exergia por segmento em uma única passagem vetorizada.
+
+    Cada intervalo entre duas linhas consecutivas é atribuído ao segmento da linha final, de modo
+    que a soma dos segmentos é a integral da missão inteira. Para resultados processados em blocos,
+    passe a última linha do bloco anterior em linha_anterior; as integrais dos blocos podem ser
+    somadas com somar_integrais.
+    """
+    if linha_anterior is not None:
+        df_exergia = pd.concat([linha_anterior, df_exergia], ignore_index=True)
+    colunas = componentes_destruicao + parcelas_util + parcelas_entrada
+    valores = df_exergia[colunas].to_numpy(dtype=float)
+    dt = np.diff(df_exergia['time'].to_numpy(dtype=float))
+    contribuicoes = 0.5 * (valores[1:] + valores[:-1]) * dt[:, None] / 1000
+    integrais = pd.DataFrame(contribuicoes, columns=[_mj(c) for c in colunas])
+    integrais['segment'] = df_exergia['segment'].to_numpy()[1:]
+    return integrais.groupby('segment', sort=False).sum()
+
+def somar_integrais(lista_integrais):
+    """Soma integrais por segmento de vários blocos, preservando a ordem dos segmentos."""
+    return pd.concat(lista_integrais).groupby(level=0, sort=False).sum()
+
+def montar_resumo(integrais, hybrid_degree):
+    """Monta a tabela final: uma linha por segmento e uma linha 'missao' com o total."""
+    integrais = integrais.copy()
+    integrais.loc['missao'] = integrais.sum()
+    colunas_destruicao = [_mj(c) for c in componentes_destruicao]
+    resumo = integrais[colunas_destruicao].copy()
+    resumo['B_Dest_Total_MJ'] = resumo[colunas_destruicao].sum(axis=1)
+    total = resumo['B_Dest_Total_MJ'].replace(0, np.nan)
+    for coluna in colunas_destruicao:
+        resumo[f'participacao_{coluna[:-len("_MJ")]}_%'] = (100 * resumo[coluna] / total).fillna(0)
+    util = integrais[[_mj(c) for c in parcelas_util]].sum(axis=1)
+    entrada = integrais[[_mj(c) for c in parcelas_entrada]].sum(axis=1)
+    resumo['B_Util_MJ'] = util
+    resumo['B_Entrada_MJ'] = entrada
+    resumo['eta_ex'] = (util / entrada.replace(0, np.nan)).fillna(0)
+    resumo.index.name = 'segment'
+    resumo = resumo.reset_index()
+    resumo.insert(0, 'configuracao', hybrid_degree)
+    return resumo
+
+def resumir_destruicao(df_exergia, hybrid_degree):
+    """Resumo da exergia destruída (MJ) por componente e segmento de uma configuração."""
+    return montar_resumo(integrar_por_segmento(df_exergia), hybrid_degree)
+
+def resumir_configuracoes(resumos, output_filename='resumo_exergia.csv'):
+    """Concatena os resumos das configurações e salva a tabela (separador ';' e decimal ',')."""
+    tabela = pd.concat(list(resumos.values()), ignore_index=True)
+    if output_filename:
+        tabela.to_csv(output_filename, sep=";", decimal=",", index=False)
+        print(f"Resumo da exergia destruída por segmento salvo em {output_filename}")
+    return tabela
@@ -0,0 +1,158 @@
+import os
+import logging
+import argparse
+from functools import lru_cache
+import numpy as np
+
+# --- SUAVIZAÇÃO SAVITZKY-GOLAY (EM LOTE E CAUSAL, POR BLOCOS) ---
+# Substitui o scipy.signal.savgol_filter (cuja importação custa mais de 1 s) por
+# coeficientes de convolução calculados uma única vez por (janela, ordem,
+# posição) e memorizados: o valor suavizado é o produto escalar dos
+# coeficientes com a janela de amostras, que é o polinômio de grau ordem
+# ajustado por mínimos quadrados à janela e avaliado na posição.
+#   suavizar         filtro centrado sobre a série inteira; nas pontas, o
+#                    polinômio da primeira/última janela completa é avaliado nas
+#                    posições das pontas (mesmo resultado de savgol_filter com
+#                    mode='interp'). Séries mais curtas que a janela usam a maior
+#                    janela ímpar que cabe nelas, em vez dos dados originais.
+#   SuavizadorCausal filtro causal: cada amostra é suavizada apenas com ela e as
+#                    janela-1 anteriores (polinômio avaliado na amostra mais
+#                    recente). Processa a série bloco a bloco, guardando entre os
+#                    blocos as últimas amostras, de modo que o resultado não depende
+#                    da divisão em blocos (uso em fluxo contínuo e em modo ao vivo).
+#                    Até completar a primeira janela, usa todas as amostras já vistas.
+# suavizar_colunas aplica qualquer dos dois às colunas de uma tabela de
+# resultados (energia ou exergia); em graficos.py, a chave 'suavizacao' de uma
+# especificação é (janela, ordem) ou (janela, ordem, 'causal').
+
+janela_padrao = 51
+ordem_padrao = 3
+
+@lru_cache(maxsize=None)
+def coeficientes_savgol(janela, ordem, posicao=None):
+    """Coeficientes (janela,) do valor do polinômio ajustado à janela na posição (padrão: centro).
+
+    O array retornado é compartilhado entre as chamadas e, por isso, somente leitura.
+    """
+    if posicao is None:
+        posicao = janela // 2
+    if not 0 <= ordem < janela:
+        raise ValueError(f"A ordem do polinômio ({ordem}) deve ser menor que a janela ({janela}).")
+    A = np.vander(np.arange(janela) - posicao, ordem + 1, increasing=True)
+    coeficientes = np.linalg.pinv(A)[0]
+    coeficientes.flags.writeable = False
+    return coeficientes
+
+@lru_cache(maxsize=None)
+def _coeficientes_pontas(janela, ordem):
+    # Linhas (janela//2, janela) das primeiras e das últimas posições da série
+    metade = janela // 2
+    inicio = np.array([coeficientes_savgol(janela, ordem, p) for p in range(metade)]).reshape(metade, janela)
+    fim = np.array([coeficientes_savgol(janela, ordem, p) for p in range(janela - metade, janela)]).reshape(metade, janela)
+    return inicio, fim
+
+def janela_efetiva(n_pontos, janela, ordem):
+    """Maior janela ímpar até janela que cabe em n_pontos; None se ela não comportar o polinômio."""
+    janela = min(janela, n_pontos if n_pontos % 2 else n_pontos - 1)
+    return janela if janela > ordem else None
+
+def suavizar(valores, janela=janela_padrao, ordem=ordem_padrao):
+    """Filtro Savitzky-Golay centrado sobre a série inteira (pontas como savgol_filter(mode='interp'))."""
+    if janela % 2 == 0:
+        raise ValueError(f"A janela do filtro centrado deve ser ímpar (recebida: {janela}).")
+    valores = np.asarray(valores, dtype=float)
+    janela_usada = janela_efetiva(len(valores), janela, ordem)
+    if janela_usada is None:
+        logging.warning(f"Série com {len(valores)} pontos: curta demais para o filtro Savitzky-Golay de ordem {ordem}. "
+                        f"Usando dados originais.")
+        return valores.copy()
+    if janela_usada < janela:
+        logging.info(f"Série com {len(valores)} pontos: filtro Savitzky-Golay com janela {janela_usada} em vez de {janela}.")
+    janelas = np.lib.stride_tricks.sliding_window_view(valores, janela_usada)
+    inicio, fim = _coeficientes_pontas(janela_usada, ordem)
+    return np.concatenate((inicio @ valores[:janela_usada],
+                           janelas @ coeficientes_savgol(janela_usada, ordem),
+                           fim @ valores[-janela_usada:]))
+
+class SuavizadorCausal:
+    """Filtro Savitzky-Golay causal aplicado bloco a bloco, com estado entre os blocos.
+
+    >>> suavizador = SuavizadorCausal(51, 3)
+    >>> for bloco in blocos:
+    ...     suavizados = suavizador.processar(bloco)
+    """
+    def __init__(self, janela=janela_padrao, ordem=ordem_padrao):
+        if not 0 <= ordem < janela:
+            raise ValueError(f"A ordem do polinômio ({ordem}) deve ser menor que a janela ({janela}).")
+        self.janela, self.ordem = janela, ordem
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta o histórico (a próxima amostra volta a ser a primeira da série)."""
+        self.historico = np.empty(0)
+        self.vistos = 0
+
+    def processar(self, bloco):
+        """Valores suavizados das amostras do bloco, usando também as últimas janela-1 amostras anteriores."""
+        bloco = np.asarray(bloco, dtype=float).ravel()
+        dados = np.concatenate((self.historico, bloco))
+        saida = np.empty(len(bloco))
+        inicio_bloco = len(self.historico)
+        # Amostras anteriores à primeira janela completa: ajuste com todas as amostras vistas até elas
+        n_parciais = min(max(self.janela - 1 - self.vistos, 0), len(bloco))
+        for k in range(n_parciais):
+            n = self.vistos + k + 1
+            saida[k] = coeficientes_savgol(n, min(self.ordem, n - 1), n - 1) @ dados[inicio_bloco + k + 1 - n:inicio_bloco + k + 1]
+        if n_parciais < len(bloco):
+            primeira = inicio_bloco + n_parciais - self.janela + 1
+            janelas = np.lib.stride_tricks.sliding_window_view(dados[primeira:], self.janela)
+            saida[n_parciais:] = janelas @ coeficientes_savgol(self.janela, self.ordem, self.janela - 1)
+        self.historico = dados[-(self.janela - 1):] if self.janela > 1 else np.empty(0)
+        self.vistos += len(bloco)
+        return saida
+
+def suavizar_causal(valores, janela=janela_padrao, ordem=ordem_padrao):
+    """Filtro causal sobre uma série inteira (mesmo resultado de SuavizadorCausal bloco a bloco)."""
+    return SuavizadorCausal(janela, ordem).processar(valores)
+
+def suavizar_colunas(df, colunas, janela=janela_padrao, ordem=ordem_padrao, causal=False):
+    """Cópia de df com as colunas suavizadas (colunas ausentes são ignoradas)."""
+    filtro = suavizar_causal if causal else suavizar
+    df = df.copy()
+    for coluna in colunas:
+        if coluna in df.columns:
+            df[coluna] = filtro(df[coluna].to_numpy(dtype=float), janela, ordem)
+    return df
+
+
+if __name__ == '__main__':
+    from arquivos_resultados import ler_resultados, gravar_resultados, opcoes_csv_energia, opcoes_csv_exergia
+    parser = argparse.ArgumentParser(description='Suaviza colunas dos resultados das análises energética ou exergética '
+                                                 'com o filtro Savitzky-Golay.')
+    parser.add_argument('arquivos', nargs='+', help='Arquivos de resultados (energy_analysis_results_* ou resultados_exergia_*).')
+    parser.add_argument('--colunas', nargs='+', required=True, help='Colunas suavizadas.')
+    parser.add_argument('--janela', type=int, default=janela_padrao, help=f'Janela do filtro (padrão: {janela_padrao}).')
+    parser.add_argument('--ordem', type=int, default=ordem_padrao, help=f'Ordem do polinômio (padrão: {ordem_padrao}).')
+    parser.add_argument('--causal', action='store_true', help='Filtro causal (apenas amostras atuais e anteriores).')
+    parser.add_argument('--blocos', type=int, default=None,
+                        help='Com --causal, processa cada arquivo em blocos com este número de linhas.')
+    args = parser.parse_args()
+    if args.janela % 2 == 0 and not args.causal:
+        parser.error('--janela deve ser ímpar no filtro centrado.')
+    if args.ordem >= args.janela:
+        parser.error('--ordem deve ser menor que --janela.')
+
+    for arquivo in args.arquivos:
+        base, extensao = os.path.splitext(arquivo)
+        opcoes_csv = opcoes_csv_energia if os.path.basename(base).startswith('energy_') else opcoes_csv_exergia
+        df = ler_resultados(arquivo, opcoes_csv=opcoes_csv)
+        if args.causal and args.blocos:
+            for coluna in [coluna for coluna in args.colunas if coluna in df.columns]:
+                suavizador = SuavizadorCausal(args.janela, args.ordem)
+                valores = df[coluna].to_numpy(dtype=float)
+                df[coluna] = np.concatenate([suavizador.processar(valores[i:i + args.blocos])
+                                             for i in range(0, len(valores), args.blocos)])
+        else:
+            df = suavizar_colunas(df, args.colunas, args.janela, args.ordem, args.causal)
+        for gravado in gravar_resultados(df, f"{base}_suavizado", extensao.lstrip('.'), opcoes_csv):
+            print(f"Resultados suavizados salvos em {gravado}")
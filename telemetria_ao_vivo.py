@@ -0,0 +1,368 @@
+import os
+import sys
+import stat
+import time
+import asyncio
+import argparse
+from collections import deque
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dados_missao import colunas_exergia, numeric_columns, colunas_zeradas_convencional
+from analise_exergetica import calcular_exergia, preparar_deltas_bateria, base_resultados
+from arquivos_resultados import gravar_resultados
+from resumo_exergia import resumir_destruicao
+from suavizacao import SuavizadorCausal
+
+# --- TELEMETRIA AO VIVO (ANÁLISE EXERGÉTICA INCREMENTAL COM ASYNCIO) ---
+# Acompanha uma planilha no formato do SUAVE (separador ';' e decimal ',')
+# enquanto ela ainda está sendo escrita por uma simulação longa ou por um
+# ensaio em bancada, e atualiza os gráficos das eficiências exergéticas.
+# Fontes aceitas:
+#   ARQUIVO.csv            arquivo que cresce (lido do início e depois seguido,
+#                          como tail -f; se for truncado, a análise recomeça)
+#   -                      entrada padrão (pipe)
+#   FIFO                   pipe nomeado (mkfifo)
+#   tcp:HOST:PORTA         socket local: espera uma conexão do produtor e lê
+#   unix:CAMINHO           até ela ser fechada
+# Apenas as linhas novas são convertidas (só as colunas da análise exergética,
+# sem o pandas.read_csv) e os balanços de analise_exergetica.py são calculados
+# em cada lote, com o estado dos deltas da bateria (preparar_deltas_bateria)
+# mantido entre os lotes: o resultado é o mesmo da análise da planilha completa.
+# As figuras são redesenhadas em um processo separado, no máximo uma vez a cada
+# --intervalo-figuras segundos, para que a renderização não atrase a leitura.
+# Ao final (fim da fonte, --encerrar-sem-dados ou Ctrl+C) os resultados são
+# gravados em resultados_exergia_<config>_ao_vivo.csv e a latência por linha
+# (da leitura ao fim dos balanços) é resumida.
+
+# Colunas lidas das linhas novas: as da análise exergética e as usadas na normalização da convencional
+colunas_lidas = list(dict.fromkeys(colunas_exergia + ['etap', 'propeller_thrust']))
+
+# Colunas suavizadas com --suavizar (filtro causal, ver suavizacao.py)
+colunas_eficiencia = ['eta_ex_total', 'eta_ex_engine', 'eta_ex_gearbox', 'eta_ex_prop_SysTermico', 'eta_ex_bat',
+                      'eta_ex_inverter', 'eta_ex_motor_MTRB', 'eta_ex_motor_WTP', 'eta_ex_prop_WTP']
+
+prefixo_figuras = 'ao_vivo_'
+
+# Marcador de recomeço da fonte (arquivo truncado ou nova conexão): a próxima linha é um cabeçalho
+RECOMECO = None
+
+def _numero(texto):
+    try:
+        return float(texto.replace(',', '.'))
+    except ValueError:
+        return np.nan
+
+def converter_linhas(cabecalho, linhas, hybrid_degree):
+    """DataFrame de linhas da planilha, normalizado como em normalizar_missao, apenas com colunas_lidas.
+
+    Linhas com número de campos diferente do cabeçalho (incompletas) são descartadas.
+    """
+    campos = [linha.split(';') for linha in linhas]
+    campos = [linha for linha in campos if len(linha) == len(cabecalho)]
+    posicoes = {nome: i for i, nome in enumerate(cabecalho)}
+    zeradas = colunas_zeradas_convencional if hybrid_degree == 'Convencional' else ()
+    dados = {}
+    for coluna in colunas_lidas:
+        if coluna == 'segment' and coluna in posicoes:
+            dados[coluna] = [linha[posicoes[coluna]] for linha in campos]
+        elif coluna in zeradas or (coluna not in posicoes and coluna in numeric_columns):
+            dados[coluna] = np.zeros(len(campos))
+        elif coluna in posicoes:
+            valores = np.array([_numero(linha[posicoes[coluna]]) for linha in campos], dtype=float)
+            # Como em normalizar_missao, valores não numéricos das colunas numéricas viram 0
+            dados[coluna] = np.nan_to_num(valores, nan=0.0) if coluna in numeric_columns else valores
+    return pd.DataFrame(dados)
+
+class ProcessadorIncremental:
+    """Balanços exergéticos de uma configuração calculados lote a lote, com o estado entre os lotes."""
+    def __init__(self, hybrid_degree, suavizacao=None):
+        self.hybrid_degree, self.suavizacao = hybrid_degree, suavizacao
+        self.latencias_ms = deque(maxlen=100_000)
+        self.lotes = 0
+        self.reiniciar()
+
+    def aquecer(self):
+        """Executa os balanços uma vez em uma linha nula, para que as importações e tabelas carregadas na
+        primeira chamada (scipy.interpolate, grade de equilíbrio) não entrem na latência da primeira linha."""
+        df = pd.DataFrame({coluna: [0.0] for coluna in colunas_lidas if coluna in numeric_columns})
+        df['segment'] = ['']
+        calcular_exergia(preparar_deltas_bateria(df), self.hybrid_degree)
+
+    def reiniciar(self):
+        """Descarta os resultados e o estado (a fonte recomeçou a missão)."""
+        self.estado = {}
+        self.blocos, self.blocos_graficos = [], []
+        self.suavizadores = {coluna: SuavizadorCausal(*self.suavizacao) for coluna in colunas_eficiencia} \
+            if self.suavizacao else {}
+        self.linhas = 0
+        self.versao = 0
+
+    def processar(self, df, chegada):
+        """Calcula os balanços do lote df (lido no instante chegada, de time.perf_counter)."""
+        resultados = calcular_exergia(preparar_deltas_bateria(df, estado=self.estado), self.hybrid_degree)
+        self.blocos.append(resultados)
+        if self.suavizadores:
+            resultados = resultados.copy()
+            for coluna, suavizador in self.suavizadores.items():
+                resultados[coluna] = suavizador.processar(resultados[coluna].to_numpy(dtype=float))
+            self.blocos_graficos.append(resultados)
+        latencia = (time.perf_counter() - chegada) * 1000
+        self.latencias_ms.extend([latencia] * len(df))
+        self.linhas += len(df)
+        self.lotes += 1
+        self.versao += 1
+
+    def _juntar(self, blocos):
+        # Junta os lotes já recebidos em um único bloco, para que as próximas chamadas só concatenem os novos
+        if len(blocos) > 1:
+            blocos[:] = [pd.concat(blocos, ignore_index=True)]
+        return blocos[0] if blocos else pd.DataFrame()
+
+    def resultados(self):
+        return self._juntar(self.blocos)
+
+    def resultados_graficos(self):
+        """Resultados para as figuras: com --suavizar, as eficiências suavizadas pelo filtro causal."""
+        return self._juntar(self.blocos_graficos) if self.suavizadores else self.resultados()
+
+def _dividir_linhas(pendente, dados):
+    """Separa as linhas completas de pendente + dados (bytes); retorna (linhas não vazias, resto incompleto)."""
+    *linhas, resto = (pendente + dados).split(b'\n')
+    return [linha.decode('utf-8').rstrip('\r') for linha in linhas if linha.strip()], resto
+
+async def seguir_arquivo(caminho, intervalo=0.05):
+    """Lotes de linhas novas de um arquivo que cresce (gerador assíncrono); RECOMECO se ele for truncado."""
+    while not os.path.exists(caminho):
+        await asyncio.sleep(intervalo)
+    with open(caminho, 'rb') as f:
+        pendente = b''
+        while True:
+            dados = f.read()
+            if dados:
+                linhas, pendente = _dividir_linhas(pendente, dados)
+                if linhas:
+                    yield linhas
+                continue
+            if os.stat(caminho).st_size < f.tell():
+                f.seek(0)
+                pendente = b''
+                yield RECOMECO
+                continue
+            await asyncio.sleep(intervalo)
+
+async def ler_fluxo(leitor):
+    """Lotes de linhas de um asyncio.StreamReader (pipe ou socket) até o fim do fluxo."""
+    pendente = b''
+    while True:
+        dados = await leitor.read(1 << 16)
+        if not dados:
+            break
+        linhas, pendente = _dividir_linhas(pendente, dados)
+        if linhas:
+            yield linhas
+    if pendente.strip():
+        yield [pendente.decode('utf-8').rstrip('\r')]
+
+async def _abrir_pipe(arquivo):
+    leitor = asyncio.StreamReader()
+    await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(leitor), arquivo)
+    return leitor
+
+async def ler_socket(endereco):
+    """Lotes de linhas da primeira conexão recebida em tcp:HOST:PORTA ou unix:CAMINHO, até ela ser fechada."""
+    conexao = asyncio.get_running_loop().create_future()
+
+    def aceitar(leitor, escritor):
+        if not conexao.done():
+            conexao.set_result((leitor, escritor))
+        else:
+            escritor.close()
+
+    tipo, _, destino = endereco.partition(':')
+    if tipo == 'unix':
+        servidor = await asyncio.start_unix_server(aceitar, path=destino)
+    else:
+        host, _, porta = destino.rpartition(':')
+        servidor = await asyncio.start_server(aceitar, host or '127.0.0.1', int(porta))
+    print(f"Aguardando o produtor da telemetria em {endereco}...")
+    try:
+        leitor, escritor = await conexao
+        async for linhas in ler_fluxo(leitor):
+            yield linhas
+        escritor.close()
+    finally:
+        servidor.close()
+
+async def abrir_fonte(origem):
+    """Gerador assíncrono de lotes de linhas para a origem (arquivo, '-', FIFO, tcp:... ou unix:...)."""
+    if origem.startswith(('tcp:', 'unix:')):
+        return ler_socket(origem)
+    if origem == '-':
+        return ler_fluxo(await _abrir_pipe(sys.stdin))
+    if os.path.exists(origem) and stat.S_ISFIFO(os.stat(origem).st_mode):
+        return ler_fluxo(await _abrir_pipe(open(origem, 'rb', buffering=0)))
+    return seguir_arquivo(origem)
+
+def _renderizar_figuras(tarefas):
+    from graficos import renderizar_figura
+    return [renderizar_figura(spec, series) for spec, series in tarefas]
+
+class AtualizadorFiguras:
+    """Imprime o estado e redesenha as figuras das eficiências (em um processo separado), no máximo uma vez por intervalo."""
+    def __init__(self, processador, intervalo, figuras=True):
+        self.processador, self.intervalo = processador, intervalo
+        self.especificacoes, self.pool = [], None
+        if figuras:
+            from plota_exergia import especificacoes_padrao
+            self.especificacoes = [dict(spec, arquivo=prefixo_figuras + spec['arquivo']) for spec in especificacoes_padrao]
+            self.pool = ProcessPoolExecutor(max_workers=1)
+        self.versao_desenhada = 0
+        self.atualizacoes = 0
+
+    async def desenhar(self):
+        """Redesenha as figuras se houver linhas novas desde o último desenho."""
+        versao = self.processador.versao
+        if versao == self.versao_desenhada or not self.processador.linhas:
+            return
+        if self.pool:
+            from graficos import extrair_series
+            dfs = {self.processador.hybrid_degree: self.processador.resultados_graficos()}
+            tarefas = [(spec, extrair_series(spec, dfs)) for spec in self.especificacoes]
+            await asyncio.get_running_loop().run_in_executor(self.pool, _renderizar_figuras, tarefas)
+        self.versao_desenhada = versao
+        self.atualizacoes += 1
+        imprimir_estado(self.processador)
+
+    async def executar(self):
+        while True:
+            inicio = time.monotonic()
+            await self.desenhar()
+            await asyncio.sleep(max(self.intervalo - (time.monotonic() - inicio), 0))
+
+    def fechar(self):
+        if self.pool:
+            self.pool.shutdown()
+
+def imprimir_estado(processador):
+    resultados = processador.resultados()
+    ultima = resultados.iloc[-1]
+    recentes = list(processador.latencias_ms)[-1000:]
+    print(f"{processador.linhas} linhas | t = {ultima['time'] / 60:.1f} min ({ultima['segment']}) | "
+          f"eta_ex_total = {100 * ultima['eta_ex_total']:.2f}% | latência média {np.mean(recentes):.1f} ms/linha")
+
+async def monitorar(origem, hybrid_degree, intervalo_figuras=2.0, suavizacao=None, encerrar_sem_dados=None, figuras=True):
+    """Acompanha a origem até o fim dos dados e retorna o ProcessadorIncremental com os resultados."""
+    processador = ProcessadorIncremental(hybrid_degree, suavizacao)
+    processador.aquecer()
+    atualizador = AtualizadorFiguras(processador, intervalo_figuras, figuras)
+    tarefa_figuras = asyncio.create_task(atualizador.executar())
+    fonte = await abrir_fonte(origem)
+    cabecalho = None
+    try:
+        while True:
+            try:
+                lote = await asyncio.wait_for(anext(fonte), encerrar_sem_dados)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                print(f"Nenhuma linha nova em {encerrar_sem_dados:g} s: encerrando.")
+                break
+            except asyncio.CancelledError:
+                # Ctrl+C: encerra a leitura e devolve o que já foi processado
+                break
+            chegada = time.perf_counter()
+            if lote is RECOMECO:
+                print("A fonte recomeçou: descartando os resultados anteriores.")
+                processador.reiniciar()
+                cabecalho = None
+                continue
+            if cabecalho is None:
+                cabecalho = [nome.strip().lstrip('﻿') for nome in lote[0].split(';')]
+                lote = lote[1:]
+            if lote:
+                df = converter_linhas(cabecalho, lote, hybrid_degree)
+                if len(df):
+                    processador.processar(df, chegada)
+    finally:
+        await fonte.aclose()
+        tarefa_figuras.cancel()
+        try:
+            await tarefa_figuras
+        except asyncio.CancelledError:
+            pass
+        await atualizador.desenhar()
+        atualizador.fechar()
+    return processador
+
+async def reproduzir_planilha(planilha, destino, linhas_por_s, linhas_por_escrita=1):
+    """Reescreve a planilha em destino aos poucos, simulando uma execução em andamento (para testes)."""
+    with open(planilha, encoding='utf-8') as f:
+        cabecalho, *linhas = f.read().splitlines()
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write(cabecalho + '\n')
+        f.flush()
+        for i in range(0, len(linhas), linhas_por_escrita):
+            f.write(''.join(linha + '\n' for linha in linhas[i:i + linhas_por_escrita]))
+            f.flush()
+            await asyncio.sleep(linhas_por_escrita / linhas_por_s)
+
+def concluir(processador):
+    """Grava os resultados acumulados e imprime a latência e o resumo da exergia destruída."""
+    if not processador.linhas:
+        print("Nenhuma linha recebida.")
+        return
+    resultados = processador.resultados()
+    arquivo, = gravar_resultados(resultados, f"{base_resultados(processador.hybrid_degree)}_ao_vivo")
+    latencias = np.array(processador.latencias_ms)
+    print(f"{processador.linhas} linhas em {processador.lotes} lotes; resultados salvos em {arquivo}")
+    print(f"Latência por linha (leitura -> balanços): média {latencias.mean():.2f} ms, "
+          f"mediana {np.median(latencias):.2f} ms, p95 {np.percentile(latencias, 95):.2f} ms, máx. {latencias.max():.2f} ms")
+    resumo = resumir_destruicao(resultados, processador.hybrid_degree)
+    missao = resumo[resumo['segment'] == 'missao']
+    if not missao.empty:
+        print(f"Missão até aqui: exergia destruída {missao['B_Dest_Total_MJ'].iloc[0]:.1f} MJ, "
+              f"eta_ex {100 * missao['eta_ex'].iloc[0]:.2f}%")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Acompanha uma planilha do SUAVE em andamento (arquivo, pipe ou socket) '
+                                                 'e atualiza as eficiências exergéticas ao vivo.')
+    parser.add_argument('origem', help="Arquivo .csv que cresce, '-' (entrada padrão), FIFO, tcp:HOST:PORTA ou unix:CAMINHO.")
+    parser.add_argument('--configuracao', default='15%',
+                        help="Rótulo da configuração ('15%%', '20%%', '30%%', 'Convencional', ...; padrão: 15%%).")
+    parser.add_argument('--intervalo-figuras', type=float, default=2.0,
+                        help='Intervalo mínimo entre as atualizações das figuras, em segundos (padrão: 2).')
+    parser.add_argument('--sem-figuras', action='store_true', help='Apenas calcula e imprime o estado, sem figuras.')
+    parser.add_argument('--suavizar', type=int, nargs=2, default=None, metavar=('JANELA', 'ORDEM'),
+                        help='Suaviza as eficiências das figuras com o filtro Savitzky-Golay causal.')
+    parser.add_argument('--encerrar-sem-dados', type=float, default=None, metavar='S',
+                        help='Encerra após S segundos sem linhas novas (padrão: só ao fim da fonte ou com Ctrl+C).')
+    parser.add_argument('--reproduzir', default=None, metavar='PLANILHA',
+                        help='Teste: reescreve PLANILHA na origem (arquivo) aos poucos enquanto a acompanha.')
+    parser.add_argument('--taxa', type=float, default=20.0, help='Com --reproduzir, linhas por segundo (padrão: 20).')
+    args = parser.parse_args()
+    if args.suavizar and args.suavizar[1] >= args.suavizar[0]:
+        parser.error('--suavizar: a ordem deve ser menor que a janela.')
+    if args.reproduzir and (args.origem == '-' or args.origem.startswith(('tcp:', 'unix:'))):
+        parser.error('--reproduzir exige uma origem em arquivo.')
+
+    async def principal():
+        if args.reproduzir and os.path.exists(args.origem):
+            os.remove(args.origem)
+        reproducao = asyncio.create_task(reproduzir_planilha(args.reproduzir, args.origem, args.taxa)) \
+            if args.reproduzir else None
+        encerrar = args.encerrar_sem_dados or (1.0 if args.reproduzir else None)
+        try:
+            return await monitorar(args.origem, args.configuracao, args.intervalo_figuras, args.suavizar,
+                                   encerrar, figuras=not args.sem_figuras)
+        finally:
+            if reproducao:
+                reproducao.cancel()
+
+    try:
+        processador = asyncio.run(principal())
+    except KeyboardInterrupt:
+        processador = None
+    if processador is not None:
+        concluir(processador)
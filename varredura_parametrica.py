@@ -0,0 +1,100 @@
+import itertools
+import numpy as np
+import pandas as pd
+from analise_exergetica import calcular_balancos_exergeticos, parametros_modelo, preparar_deltas_bateria, nomes_opcoes
+from dados_missao import files, carregar_missao
+
+# --- VARREDURA PARAMÉTRICA DAS CONSTANTES DO MODELO EXERGÉTICO ---
+# Avalia todas as combinações de valores das constantes (eta_gearbox,
+# assumed_inverter_efficiency, b_fuel_kJ_kg, ...) em uma única passagem
+# vetorizada sobre a missão: cada conjunto de parâmetros vira uma linha de um
+# array (S, 1) que é combinado por broadcasting com as colunas (N,) da missão.
+
+# Colunas de resultado que apenas repetem a entrada e não dependem dos parâmetros
+colunas_entrada = ['segment', 'time', 'altitude_m', 'mach_number', 'velocity_m_s', 'pressure_Pa', 'temperature_C']
+
+def montar_conjuntos(grade, combinar=True):
+    """Monta a tabela de conjuntos de parâmetros (uma linha por conjunto).
+
+    grade é um dicionário {nome do parâmetro: valores}. Com combinar=True é feito o produto
+    cartesiano de todos os valores; com combinar=False os valores são pareados posição a posição
+    (todas as listas devem ter o mesmo tamanho).
+    """
+    nomes = list(grade)
+    valores = [np.atleast_1d(np.asarray(grade[nome], dtype=float)) for nome in nomes]
+    if combinar:
+        linhas = list(itertools.product(*valores))
+    else:
+        tamanhos = {len(v) for v in valores}
+        if len(tamanhos) > 1:
+            raise ValueError("Com combinar=False todos os parâmetros devem ter o mesmo número de valores.")
+        linhas = list(zip(*valores))
+    tabela = pd.DataFrame(linhas, columns=nomes)
+    tabela.index.name = 'conjunto'
+    return tabela
+
+def varrer_parametros(df_input, hybrid_degree, grade, combinar=True, metricas=None, tamanho_lote=2000):
+    """Avalia os balanços exergéticos da missão para todos os conjuntos de parâmetros de grade.
+
+    df_input deve ser a missão normalizada com os deltas da bateria (preparar_deltas_bateria).
+    Os conjuntos são avaliados em lotes de tamanho_lote para limitar a memória.
+
+    Retorna um dicionário com:
+      'parametros': DataFrame (S linhas) com os valores de cada conjunto, incluindo os não variados;
+      'time': array (N,) dos instantes da missão;
+      'metricas': lista (M) com os nomes das grandezas;
+      'valores': array (S, N, M) com os resultados.
+    """
+    opcoes = [nome for nome in grade if nome in nomes_opcoes]
+    if opcoes:
+        raise ValueError(f"Opções do modelo não podem ser varridas: {', '.join(opcoes)} (altere o valor em analise_exergetica.py).")
+    conjuntos = montar_conjuntos(grade, combinar)
+    padrao = parametros_modelo()
+    tabela = conjuntos.assign(**{nome: valor for nome, valor in padrao.items() if nome not in conjuntos})
+
+    valores = None
+    for inicio in range(0, len(conjuntos), tamanho_lote):
+        lote = conjuntos.iloc[inicio:inicio + tamanho_lote]
+        parametros = {nome: lote[nome].to_numpy()[:, None] for nome in lote.columns}
+        resultados = calcular_balancos_exergeticos(df_input, hybrid_degree, parametros)
+        if metricas is None:
+            metricas = [nome for nome in resultados if nome not in colunas_entrada]
+        if valores is None:
+            valores = np.empty((len(conjuntos), len(df_input), len(metricas)))
+        forma = (len(lote), len(df_input))
+        for j, nome in enumerate(metricas):
+            valores[inicio:inicio + len(lote), :, j] = np.broadcast_to(resultados[nome], forma)
+
+    return {
+        'parametros': tabela,
+        'time': df_input['time'].to_numpy(dtype=float),
+        'metricas': metricas,
+        'valores': valores,
+    }
+
+def varrer_configuracao(hybrid_degree, grade, file_path=None, **kwargs):
+    """Carrega a missão de uma configuração (padrão: a planilha de files) e executa varrer_parametros."""
+    file_path = file_path or files[hybrid_degree]
+    df_input = preparar_deltas_bateria(carregar_missao(file_path, hybrid_degree), file_path)
+    return varrer_parametros(df_input, hybrid_degree, grade, **kwargs)
+
+def em_formato_longo(resultado, metricas=None):
+    """Converte o resultado de varrer_parametros em um DataFrame longo (conjunto, time, metrica, valor)."""
+    nomes = resultado['metricas']
+    indices = [nomes.index(m) for m in (metricas or nomes)]
+    valores = resultado['valores'][:, :, indices]
+    S, N, M = valores.shape
+    return pd.DataFrame({
+        'conjunto': np.repeat(np.arange(S), N * M),
+        'time': np.tile(np.repeat(resultado['time'], M), S),
+        'metrica': np.tile(np.asarray(nomes, dtype=object)[indices], S * N),
+        'valor': valores.ravel(),
+    })
+
+def resumo_por_conjunto(resultado, metricas=('eta_ex_total',)):
+    """Média no tempo de cada métrica por conjunto de parâmetros, junto com os valores dos parâmetros."""
+    resumo = resultado['parametros'].copy()
+    for metrica in metricas:
+        j = resultado['metricas'].index(metrica)
+        resumo[f'{metrica}_medio'] = resultado['valores'][:, :, j].mean(axis=1)
+    return resumo